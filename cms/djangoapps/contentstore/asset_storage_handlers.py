@@ -20,6 +20,7 @@ from opaque_keys.edx.keys import AssetKey, CourseKey
 from pymongo import ASCENDING, DESCENDING
 
 from common.djangoapps.edxmako.shortcuts import render_to_response
+from common.djangoapps.static_replace import invalidate_course_static_urls
 from common.djangoapps.student.auth import has_course_author_access
 from common.djangoapps.util.date_utils import get_default_time_display
 from common.djangoapps.util.json_request import JsonResponse
@@ -219,7 +220,9 @@ def _assets_json(request, course_key):
         'current_page': current_page,
         'page_size': requested_page_size,
         'sort': sort_type_and_direction,
-        'filter_params': filter_parameters
+        'filter_params': filter_parameters,
+        # The nextCursor of the previous page, which locates the requested page without skipping assets.
+        'cursor': request_options['requested_cursor'] if current_page > 0 else None,
     }
 
     assets, total_count = _get_assets_for_page(course_key, query_options)
@@ -228,12 +231,18 @@ def _assets_json(request, course_key):
 
     if request_options['requested_page'] > 0 and first_asset_to_display_index >= total_count and total_count > 0:  # lint-amnesty, pylint: disable=chained-comparison
         _update_options_to_requery_final_page(query_options, total_count)
+        query_options['cursor'] = None
         current_page = query_options['current_page']
         first_asset_to_display_index = _get_first_asset_index(current_page, requested_page_size)
         assets, total_count = _get_assets_for_page(course_key, query_options)
 
     last_asset_to_display_index = first_asset_to_display_index + len(assets)
     assets_in_json_format = _get_assets_in_json_format(assets, course_key, assets_usage_locations_map)
+    next_cursor = None
+    if last_asset_to_display_index < total_count:
+        next_cursor = contentstore().get_next_content_cursor(
+            assets, sort_type_and_direction, first_asset_to_display_index, filter_parameters or None,
+        )
 
     response_payload = {
         'start': first_asset_to_display_index,
@@ -246,6 +255,7 @@ def _assets_json(request, course_key):
         'direction': request_options['requested_sort_direction'],
         'assetTypes': _get_requested_file_types_from_requested_filter(request_options['requested_asset_type']),
         'textSearch': request_options['requested_text_search'],
+        'nextCursor': next_cursor,
     }
 
     return JsonResponse(response_payload)
@@ -260,6 +270,7 @@ def _parse_request_to_dictionary(request):
         'requested_asset_type': _get_requested_attribute(request, 'asset_type'),
         'requested_text_search': _get_requested_attribute(request, 'text_search'),
         'requested_display_names': _get_requested_attribute_list(request, 'display_name'),
+        'requested_cursor': _get_requested_attribute(request, 'cursor'),
     }
 
 
@@ -433,7 +444,8 @@ def _get_assets_for_page(course_key, options):
     filter_params = options['filter_params'] if options['filter_params'] else None
     start = current_page * page_size
     return contentstore().get_all_content_for_course(
-        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params
+        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params,
+        cursor=options.get('cursor'),
     )
 
 
@@ -501,6 +513,7 @@ def update_course_run_asset(course_key, upload_file):
 
     contentstore().save(content)
     del_cached_content(content.location)
+    invalidate_course_static_urls(course_key)
 
     return content
 
@@ -665,6 +678,7 @@ def update_asset(request, course_key, asset_key):
         contentstore().set_attr(asset_key, 'locked', modified_asset['locked'])
         # delete the asset from the cache so we check the lock status the next time it is requested.
         del_cached_content(asset_key)
+        invalidate_course_static_urls(course_key)
         return JsonResponse(modified_asset, status=201)
 
 
@@ -682,6 +696,7 @@ def delete_asset(course_key, asset_key):
     _delete_thumbnail(content.thumbnail_location, course_key, asset_key)
     contentstore().delete(content.get_id())
     del_cached_content(content.location)
+    invalidate_course_static_urls(course_key)
 
 
 def _check_existence_and_get_asset_content(asset_key):  # lint-amnesty, pylint: disable=missing-function-docstring
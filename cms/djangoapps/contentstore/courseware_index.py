@@ -1,11 +1,15 @@
 """ Code to allow module store to interface with courseware index """
 
+import hashlib
+import json
 import logging
 import re
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import resolve
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
@@ -30,6 +34,15 @@ REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 # timed out for courseware indexing.
 INDEXING_REQUEST_TIMEOUT = 60
 
+# INDEXED_CONTENT_HASHES_TIMEOUT is the number of seconds for which the hashes of
+# the documents last sent to the index are cached, in order to only send the
+# documents that changed when the index is next updated.
+INDEXED_CONTENT_HASHES_TIMEOUT = 7 * 24 * 60 * 60
+
+# INDEXED_CONTENT_HASHES_CHUNK_SIZE is the number of document hashes cached under
+# each key, so that the hashes of large courses stay under the cache's item size limit.
+INDEXED_CONTENT_HASHES_CHUNK_SIZE = 1000
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -113,6 +126,54 @@ class SearchIndexerBase(metaclass=ABCMeta):
         result_ids = [result["data"]["id"] for result in response["results"]]
         searcher.remove(result_ids)
 
+    @classmethod
+    def _content_hashes_cache_key(cls, structure_key):
+        """ Key of the cached hashes of the documents last sent to the index for the structure """
+        return f'{cls.INDEX_NAME}.content_hashes.{structure_key}'
+
+    @classmethod
+    def _get_content_hashes(cls, structure_key):
+        """
+        Hashes of the documents last sent to the index for the structure, or an empty
+        dict if any of their chunks is no longer cached
+        """
+        manifest_key = cls._content_hashes_cache_key(structure_key)
+        manifest = cache.get(manifest_key)
+        if not isinstance(manifest, tuple):
+            return {}
+        version, num_chunks = manifest
+        chunk_keys = [f'{manifest_key}.{version}.{chunk}' for chunk in range(num_chunks)]
+        chunks = cache.get_many(chunk_keys)
+        if len(chunks) != num_chunks:
+            return {}
+        content_hashes = {}
+        for chunk_key in chunk_keys:
+            content_hashes.update(chunks[chunk_key])
+        return content_hashes
+
+    @classmethod
+    def _set_content_hashes(cls, structure_key, content_hashes):
+        """
+        Caches the hashes of the documents sent to the index for the structure, in
+        chunks of INDEXED_CONTENT_HASHES_CHUNK_SIZE hashes. The chunks are keyed by a
+        new version, so that readers never mix them with the chunks of an older update.
+        """
+        manifest_key = cls._content_hashes_cache_key(structure_key)
+        version = uuid4().hex
+        items = list(content_hashes.items())
+        chunks = {
+            f'{manifest_key}.{version}.{chunk}': dict(items[start:start + INDEXED_CONTENT_HASHES_CHUNK_SIZE])
+            for chunk, start in enumerate(range(0, len(items), INDEXED_CONTENT_HASHES_CHUNK_SIZE))
+        }
+        cache.set_many(chunks, INDEXED_CONTENT_HASHES_TIMEOUT)
+        cache.set(manifest_key, (version, len(chunks)), INDEXED_CONTENT_HASHES_TIMEOUT)
+
+    @staticmethod
+    def _content_hash(item_index):
+        """ Hash of the contents of an item's index document """
+        serialized_index = json.dumps(item_index, sort_keys=True, default=str)
+        return hashlib.blake2b(serialized_index.encode('utf-8'), digest_size=8).hexdigest()
+
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, timeout=INDEXING_REQUEST_TIMEOUT):  # lint-amnesty, pylint: disable=line-too-long, too-many-statements
         """
@@ -130,6 +191,11 @@ class SearchIndexerBase(metaclass=ABCMeta):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        The documents of an index update are only sent to the index if their
+        contents changed since they were last sent, so that publishing a small
+        change doesn't rewrite the documents of the whole structure. A full
+        reindex sends all the documents.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -256,8 +322,28 @@ class SearchIndexerBase(metaclass=ABCMeta):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(items_index, request_timeout=timeout)
+
+                # Only send the documents whose contents changed since the last update. The items
+                # skipped above keep their previous hashes, since their documents weren't rebuilt.
+                previous_hashes = {}
+                if triggered_at is not None:
+                    previous_hashes = cls._get_content_hashes(structure_key)
+                content_hashes = {item_id: previous_hashes.get(item_id) for item_id in indexed_items}
+                changed_items_index = []
+                for item_index in items_index:
+                    content_hash = cls._content_hash(item_index)
+                    if previous_hashes.get(item_index['id']) != content_hash:
+                        changed_items_index.append(item_index)
+                    content_hashes[item_index['id']] = content_hash
+
+                if changed_items_index:
+                    searcher.index(changed_items_index, request_timeout=timeout)
+                log.debug(
+                    "Sent %d changed documents of %d to the %s index for %s",
+                    len(changed_items_index), len(items_index), cls.INDEX_NAME, structure_key,
+                )
                 cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                cls._set_content_hashes(structure_key, content_hashes)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
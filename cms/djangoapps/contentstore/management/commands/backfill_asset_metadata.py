@@ -0,0 +1,54 @@
+"""
+Command to copy the attributes of the existing course assets to the asset metadata
+collection of the contentstore, which lists the assets of courses when
+CONTENTSTORE_USE_ASSET_METADATA_INDEX is enabled.
+
+The collection is kept up to date as assets are saved, changed and deleted, so this
+command only needs to be run once, before enabling CONTENTSTORE_USE_ASSET_METADATA_INDEX.
+Running it again is harmless.
+"""
+
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.contentstore.django import contentstore  # lint-amnesty, pylint: disable=wrong-import-order
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Backfill the asset metadata collection of the contentstore.
+
+    Example usage:
+        $ ./manage.py cms backfill_asset_metadata
+        $ ./manage.py cms backfill_asset_metadata course-v1:edX+DemoX+Demo_Course
+    """
+    help = 'Copy the attributes of the course assets to the asset metadata collection of the contentstore.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_keys',
+            nargs='*',
+            help='Keys of the courses whose assets to backfill. Backfills the assets of all courses by default.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_keys = [CourseKey.from_string(course_key) for course_key in options['course_keys']]
+        except InvalidKeyError as error:
+            raise CommandError(f'Invalid course key: {error}') from error
+
+        store = contentstore()
+        if not course_keys:
+            count = store.backfill_asset_metadata()
+            log.info('Backfilled the metadata of %d assets', count)
+            return
+
+        for course_key in course_keys:
+            count = store.backfill_asset_metadata(course_key)
+            log.info('Backfilled the metadata of %d assets of %s', count, course_key)
@@ -0,0 +1,154 @@
+"""
+Command to benchmark the export of large courses to OLX tarballs.
+"""
+
+
+import os
+import shutil
+import tarfile
+import time
+from tempfile import NamedTemporaryFile, mkdtemp
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+
+from xmodule.contentstore.content import StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.contentstore.django import contentstore  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore import ModuleStoreEnum  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.xml_exporter import (  # lint-amnesty, pylint: disable=wrong-import-order
+    export_course_to_tarball,
+    export_course_to_xml
+)
+
+# Number of children of each chapter, sequential and vertical of the synthetic courses.
+CHILDREN_PER_BLOCK = 10
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the export of a synthetic course to a tarball, comparing the
+    export staged in a temporary directory before being compressed with the
+    export streamed into the compressed tarball, and reporting the duration
+    and the size of the tarball of each.
+
+    The synthetic course is created in the modulestore and contentstore, and
+    deleted once the benchmark is done, unless --keep is given.
+
+    Example usage:
+        $ ./manage.py cms benchmark_course_export --num_blocks 5000 --num_assets 200 --asset_size_mb 10
+    """
+    help = 'Benchmarks the export of a synthetic course to a tarball.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            type=int,
+            default=5000,
+            help='Approximate number of blocks of the synthetic course.',
+        )
+        parser.add_argument(
+            '--num_assets',
+            dest='num_assets',
+            type=int,
+            default=200,
+            help='Number of static assets of the synthetic course.',
+        )
+        parser.add_argument(
+            '--asset_size_mb',
+            dest='asset_size_mb',
+            type=int,
+            default=10,
+            help='Size, in MB, of each static asset.',
+        )
+        parser.add_argument(
+            '--keep',
+            dest='keep',
+            action='store_true',
+            help='Keep the synthetic course after the benchmark.',
+        )
+
+    def handle(self, *args, **options):
+        store = modulestore()
+        course_key = self._create_course(store, options['num_blocks'])
+        self._create_assets(course_key, options['num_assets'], options['asset_size_mb'] * 1024 * 1024)
+        self.stdout.write(f'Created {course_key}')
+
+        try:
+            for export_name, export in (('staged', self._export_staged), ('streamed', self._export_streamed)):
+                with NamedTemporaryFile(suffix='.tar.gz') as export_file:
+                    start = time.perf_counter()
+                    export(store, course_key, export_file.name)
+                    duration = time.perf_counter() - start
+                    self.stdout.write('{}\t{:.1f}s\t{:.1f}MB'.format(
+                        export_name, duration, os.path.getsize(export_file.name) / 1024 / 1024,
+                    ))
+        finally:
+            if not options['keep']:
+                contentstore().delete_all_course_assets(course_key)
+                with store.bulk_operations(course_key):
+                    store.delete_course(course_key, ModuleStoreEnum.UserID.mgmt_command)
+
+    @staticmethod
+    def _export_staged(store, course_key, file_name):
+        """
+        Exports the course to a temporary directory, then compresses it.
+        """
+        root_dir = mkdtemp()
+        try:
+            export_course_to_xml(store, contentstore(), course_key, root_dir, 'course')
+            with tarfile.open(name=file_name, mode='w:gz') as tar_file:
+                tar_file.add(os.path.join(root_dir, 'course'), arcname='course')
+        finally:
+            shutil.rmtree(root_dir)
+
+    @staticmethod
+    def _export_streamed(store, course_key, file_name):
+        """
+        Exports the course straight into the compressed tarball.
+        """
+        with tarfile.open(name=file_name, mode='w:gz') as tar_file:
+            export_course_to_tarball(store, contentstore(), course_key, tar_file, 'course')
+
+    @staticmethod
+    def _create_course(store, num_blocks):
+        """
+        Creates a course of chapters, sequentials, verticals and html blocks,
+        with about the given number of blocks. Returns the course's key.
+        """
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        blocks_per_chapter = 1 + CHILDREN_PER_BLOCK * (1 + CHILDREN_PER_BLOCK * (1 + CHILDREN_PER_BLOCK))
+        num_chapters = max(1, round(num_blocks / blocks_per_chapter))
+
+        course = store.create_course('benchmark', uuid4().hex[:8], 'export', user_id)
+        with store.bulk_operations(course.id):
+            for chapter_index in range(num_chapters):
+                chapter = store.create_child(user_id, course.location, 'chapter', f'chapter_{chapter_index}')
+                for sequential_index in range(CHILDREN_PER_BLOCK):
+                    sequential = store.create_child(
+                        user_id, chapter.location, 'sequential', f'{chapter.location.block_id}_{sequential_index}',
+                    )
+                    for vertical_index in range(CHILDREN_PER_BLOCK):
+                        vertical = store.create_child(
+                            user_id, sequential.location, 'vertical',
+                            f'{sequential.location.block_id}_{vertical_index}',
+                        )
+                        for html_index in range(CHILDREN_PER_BLOCK):
+                            store.create_child(
+                                user_id, vertical.location, 'html', f'{vertical.location.block_id}_{html_index}',
+                                fields={'data': '<p>Benchmark content</p>' * 20},
+                            )
+            store.publish(course.location, user_id)
+        return course.id
+
+    @staticmethod
+    def _create_assets(course_key, num_assets, asset_size):
+        """
+        Saves the given number of incompressible assets of the given size.
+        """
+        store = contentstore()
+        for asset_index in range(num_assets):
+            name = f'asset_{asset_index}.bin'
+            asset_key = StaticContent.compute_location(course_key, name)
+            store.save(StaticContent(asset_key, name, 'application/octet-stream', os.urandom(asset_size)))
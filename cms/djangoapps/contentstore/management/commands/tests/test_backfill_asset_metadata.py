@@ -0,0 +1,49 @@
+"""
+Tests for the backfill_asset_metadata management command.
+"""
+
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test.utils import override_settings
+
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@override_settings(CONTENTSTORE_USE_ASSET_METADATA_INDEX=True)
+class BackfillAssetMetadataTest(ModuleStoreTestCase):
+    """
+    Tests the backfill of the asset metadata collection.
+    """
+    def setUp(self):
+        super().setUp()
+        self.content_store = contentstore()
+        self.course_keys = [CourseFactory.create().id, CourseFactory.create().id]
+        for course_key in self.course_keys:
+            for name in ('asset-1.txt', 'asset-2.txt'):
+                asset_key = StaticContent.compute_location(course_key, name)
+                self.content_store.save(StaticContent(asset_key, name, 'text/plain', b'content'))
+        self.content_store.asset_metadata.drop()
+
+    def assert_asset_counts(self, expected_counts):
+        """
+        Assert that the courses have the given numbers of listed assets.
+        """
+        counts = [self.content_store.get_all_content_for_course(course_key)[1] for course_key in self.course_keys]
+        assert counts == expected_counts
+
+    def test_backfill_course(self):
+        self.assert_asset_counts([0, 0])
+        call_command('backfill_asset_metadata', str(self.course_keys[0]))
+        self.assert_asset_counts([2, 0])
+
+    def test_backfill_all_courses(self):
+        call_command('backfill_asset_metadata')
+        self.assert_asset_counts([2, 2])
+
+    def test_invalid_course_key(self):
+        with pytest.raises(CommandError):
+            call_command('backfill_asset_metadata', 'not-a-course-key')
@@ -8,7 +8,7 @@ import os
 import shutil
 import tarfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 import olxcleaner
 import pkg_resources
@@ -71,8 +71,10 @@ from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT  # lint-amnesty, pylin
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import DuplicateCourseError, InvalidProctoringProvider
-from xmodule.modulestore.xml_exporter import export_library_to_xml  # lint-amnesty, pylint: disable=wrong-import-order
-from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_exporter import (  # lint-amnesty, pylint: disable=wrong-import-order
+    export_course_to_tarball,
+    export_library_to_tarball
+)
 from xmodule.modulestore.xml_importer import import_library_from_xml  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.xml_importer import CourseImportException, import_course_from_xml
 
@@ -357,20 +359,19 @@ def create_export_tarball(course_block, course_key, context, status=None):
     name = course_block.url_name
     export_file = NamedTemporaryFile(prefix=name + '.',
                                      suffix=".tar.gz")  # lint-amnesty, pylint: disable=consider-using-with
-    root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name)
-
-        if status:
-            status.set_state('Compressing')
-            status.increment_completed_steps()
+        # The blocks and assets are streamed into the compressed tarball as they are exported.
         LOGGER.debug('tar file being generated at %s', export_file.name)
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_tarball(modulestore(), contentstore(), course_key, tar_file, name)
+            else:
+                export_course_to_tarball(modulestore(), contentstore(), course_block.id, tar_file, name)
+
+            if status:
+                status.set_state('Compressing')
+                status.increment_completed_steps()
 
     except SerializationError as exc:
         LOGGER.exception('There was an error exporting %s', course_key, exc_info=True)
@@ -403,9 +404,6 @@ def create_export_tarball(course_block, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -678,6 +676,7 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.increment_completed_steps()
         LOGGER.info(f'{log_prefix}: Extracted file verified. Updating course started')
 
+        import_timings = {}
         courselike_items = import_func(
             modulestore(), user.id,
             settings.GITHUB_REPO_ROOT, [dirpath],
@@ -685,12 +684,14 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             static_content_store=contentstore(),
             target_id=courselike_key,
             verbose=True,
+            timings=import_timings,
         )
 
         new_location = courselike_items[0].location
         LOGGER.debug('new course at %s', new_location)
 
-        LOGGER.info(f'{log_prefix}: Course import successful')
+        report_import_timings(self.status, import_timings)
+        LOGGER.info(f'{log_prefix}: Course import successful, timings {import_timings}')
         set_custom_attribute('course_import_completed', True)
     except (CourseImportException, InvalidProctoringProvider, DuplicateCourseError) as known_exe:
         handle_course_import_exception(courselike_key, known_exe, self.status)
@@ -771,6 +772,17 @@ def update_outline_from_modulestore_task(course_key_str: str):
         raise  # Re-raise so that errors are noted in reporting.
 
 
+def report_import_timings(status, timings):
+    """
+    Report the duration, in seconds, of each phase of an import, both as
+    an artifact of the import task's status and as custom attributes.
+    """
+    timings = {phase: round(duration, 3) for phase, duration in timings.items()}
+    for phase, duration in timings.items():
+        set_custom_attribute(f'course_import_{phase}_seconds', duration)
+    UserTaskArtifact.objects.create(status=status, name='IMPORT_TIMINGS', text=json.dumps(timings))
+
+
 def validate_course_olx(courselike_key, course_dir, status):
     """
     Validates course olx and records the errors as an artifact.
@@ -2,6 +2,7 @@
 Testing indexing of the courseware as it is changed
 """
 import json
+import pickle
 import time
 from datetime import datetime
 from unittest import skip
@@ -10,6 +11,7 @@ from unittest.mock import patch, Mock
 import ddt
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from lazy.lazy import lazy
 from pytz import UTC
 from search.search_engine_base import SearchEngine
@@ -353,6 +355,37 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_index_only_changed_items(self, store):
+        """ Make sure that an update of the index only sends the documents whose contents changed """
+        self.publish_item(store, self.vertical.location)
+        self.reindex_course(store)
+
+        before_time = datetime.now(UTC)
+        self.html_unit.display_name = "Changed Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+        with patch('search.tests.mock_search_engine.MockSearchEngine.index', autospec=True) as mock_index:
+            indexed_count = self.index_recent_changes(store, before_time)
+        self.assertEqual(indexed_count, 4)
+        self.assertEqual(
+            [
+                [item["id"] for item in index_call[0][1]]
+                for index_call in mock_index.call_args_list if index_call[0][0].index_name == self.INDEX_NAME
+            ],
+            [[str(self.html_unit.location)]],
+        )
+
+        # A full reindex sends all the documents
+        with patch('search.tests.mock_search_engine.MockSearchEngine.index', autospec=True) as mock_index:
+            self.reindex_course(store)
+        self.assertEqual(
+            [
+                len(index_call[0][1])
+                for index_call in mock_index.call_args_list if index_call[0][0].index_name == self.INDEX_NAME
+            ],
+            [4],
+        )
+
     def _test_course_about_property_index(self, store):
         """
         Test that informational properties in the course object end up in the course_info index.
@@ -485,6 +518,28 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self):
         self._test_exception(self.store)
 
+    def test_index_only_changed_items(self):
+        self._test_index_only_changed_items(self.store)
+
+    def test_content_hashes_of_large_structure(self):
+        """ Make sure that the hashes of large courses are cached in values under the cache's item size limit """
+        # pylint: disable=protected-access
+        content_hashes = {
+            str(self.course.id.make_usage_key('html', f'block_{index:05}')): f'{index:016x}'
+            for index in range(10000)
+        }
+        with patch('cms.djangoapps.contentstore.courseware_index.cache', wraps=cache) as mock_cache:
+            CoursewareSearchIndexer._set_content_hashes(self.course.id, content_hashes)
+        cached_values = list(mock_cache.set_many.call_args[0][0].values())
+        self.assertEqual(len(cached_values), 10)
+        for cached_value in cached_values:
+            self.assertLess(len(pickle.dumps(cached_value)), 1024 * 1024 // 2)
+        self.assertEqual(CoursewareSearchIndexer._get_content_hashes(self.course.id), content_hashes)
+
+        # The hashes are no longer used once any of their chunks is evicted
+        cache.delete(next(iter(mock_cache.set_many.call_args[0][0])))
+        self.assertEqual(CoursewareSearchIndexer._get_content_hashes(self.course.id), {})
+
     def test_course_about_property_index(self):
         self._test_course_about_property_index(self.store)
 
@@ -219,6 +219,54 @@ class PaginationTestCase(AssetsTestCase):
         self.assert_correct_asset_response(
             self.url + "?page_size=1&page=5&asset_type=Images", 5, 0, 0)
 
+    @override_settings(CONTENTSTORE_USE_ASSET_METADATA_INDEX=True)
+    def test_json_responses_with_asset_metadata_index(self):
+        """
+        Test the ajax asset interfaces listing the assets from the asset metadata
+        """
+        self.upload_asset("asset-1")
+        self.upload_asset("Asset-2")
+        self.upload_asset("asset-3")
+        self.upload_asset("asset-4", "opendoc")
+
+        self.assert_correct_asset_response(self.url, 0, 4, 4)
+        self.assert_correct_asset_response(self.url + "?page_size=3&page=1", 3, 1, 4)
+        self.assert_correct_asset_response(self.url + '?display_name=asset-1.txt', 0, 1, 1)
+        self.assert_correct_sort_response(self.url, 'date_added', 'desc')
+        self.assert_correct_filter_response(self.url, 'asset_type', 'Documents')
+        self.assert_correct_text_search_response(self.url, 'AsSeT-2', 1)
+
+        for sort in ('date_added', 'display_name'):
+            for direction in ('asc', 'desc'):
+                all_assets = self.client.get(
+                    f'{self.url}?sort={sort}&direction={direction}', HTTP_ACCEPT='application/json',
+                ).json()['assets']
+                url = f'{self.url}?sort={sort}&direction={direction}&page_size=3'
+
+                first_page = self.client.get(url, HTTP_ACCEPT='application/json').json()
+                assert first_page['nextCursor'] is not None
+                second_page = self.client.get(
+                    url + '&page=1&cursor=' + first_page['nextCursor'], HTTP_ACCEPT='application/json',
+                ).json()
+                assert second_page['start'] == 3
+                assert second_page['nextCursor'] is None
+                assert first_page['assets'] + second_page['assets'] == all_assets
+
+        # Invalid cursors are ignored
+        self.assert_correct_asset_response(self.url + "?page_size=3&page=1&cursor=invalid", 3, 1, 4)
+
+        # Cursors of other pages, sorts or filters are ignored
+        url = f'{self.url}?sort=display_name&direction=asc&page_size=1'
+        cursor = self.client.get(url, HTTP_ACCEPT='application/json').json()['nextCursor']
+        for other_url in (
+            f'{self.url}?sort=display_name&direction=asc&page_size=1&page=2',
+            f'{self.url}?sort=date_added&direction=asc&page_size=1&page=1',
+            f'{self.url}?sort=display_name&direction=asc&page_size=1&page=1&asset_type=Documents',
+        ):
+            expected_assets = self.client.get(other_url, HTTP_ACCEPT='application/json').json()['assets']
+            assets = self.client.get(other_url + '&cursor=' + cursor, HTTP_ACCEPT='application/json').json()['assets']
+            assert assets == expected_assets
+
     @mock.patch('xmodule.contentstore.mongo.MongoContentStore.get_all_content_for_course')
     def test_mocked_filtered_response(self, mock_get_all_content_for_course):
         """
@@ -26,7 +26,7 @@ from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.locator import LibraryLocator
 from path import Path as path
 from storages.backends.s3boto3 import S3Boto3Storage
-from user_tasks.models import UserTaskStatus
+from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
 from cms.djangoapps.contentstore import errors as import_error
 from cms.djangoapps.contentstore.storage import course_import_export_storage
@@ -254,6 +254,18 @@ class ImportTestCase(CourseTestCase):
         response = self.import_tarfile_in_course(self.good_tar)
         self.assertEqual(response.status_code, 200)
 
+    def test_import_timings(self):
+        """
+        Check that the duration of each phase of the import is reported in the import task's status.
+        """
+        response = self.import_tarfile_in_course(self.good_tar)
+        self.assertEqual(response.status_code, 200)
+
+        artifact = UserTaskArtifact.objects.get(name='IMPORT_TIMINGS')
+        timings = json.loads(artifact.text)
+        self.assertEqual(set(timings), {'parse', 'assets', 'blocks', 'write'})
+        self.assertTrue(all(duration >= 0 for duration in timings.values()))
+
     def test_import_in_existing_course(self):
         """
         Check that course is imported successfully in existing course and users have their access roles
@@ -879,6 +879,9 @@ MIDDLEWARE = [
     'edx_django_utils.monitoring.DeploymentMonitoringMiddleware',
     'edx_django_utils.monitoring.MonitoringMemoryMiddleware',
 
+    # Monitoring of the MongoDB queries of each request, must be after RequestCacheMiddleware
+    'openedx.core.lib.request_utils.MongoQueryBudgetMiddleware',
+
     # Before anything that looks at cookies, especially the session middleware
     'openedx.core.djangoapps.cookie_metadata.middleware.CookieNameChange',
 
@@ -2279,6 +2282,20 @@ CACHES = {
     },
 }
 
+# Host-local tier of the split modulestore's course structure cache, shared by
+# all worker processes on a host. Set DIRECTORY (ideally on /dev/shm) to enable it.
+COURSE_STRUCTURE_SHARED_CACHE = {
+    'DIRECTORY': None,
+    'MAX_SIZE': 512 * 1024 * 1024,
+}
+
+# Format in which the split modulestore caches course structures. Switch VERSION
+# to 1 only once every process sharing the cache can read it.
+COURSE_STRUCTURE_CACHE_CODEC = {
+    'VERSION': 0,
+    'COMPRESSION': 'zlib',
+}
+
 ############################ OAUTH2 Provider ###################################
 
 
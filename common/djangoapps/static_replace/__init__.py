@@ -1,17 +1,25 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
+import hashlib
 import logging
 import re
+import time
+from functools import lru_cache
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.locator import AssetLocator
 
 from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
+STATIC_REPLACE_CACHE_NAMESPACE = 'static_replace'
 
 
 def _url_replace_regex(prefix):
@@ -29,6 +37,14 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+@lru_cache(maxsize=256)
+def _compiled_url_replace_regex(prefix):
+    """
+    Return the compiled _url_replace_regex of the given prefix.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +86,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # lint-amnes
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,7 +106,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -120,14 +136,10 @@ def process_static_urls(text, replacement_function, data_dir=None):
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -147,6 +159,146 @@ def make_static_urls_absolute(request, html):
     )
 
 
+def invalidate_course_static_urls(course_key):
+    """
+    Invalidate the cached static url replacements of the given course, e.g.
+    after one of its assets was uploaded, deleted, locked or unlocked.
+    """
+    cache.delete(_course_static_urls_version_key(course_key))
+    RequestCache(STATIC_REPLACE_CACHE_NAMESPACE).data.pop(str(course_key), None)
+
+
+def _static_replace_cache_timeout():
+    """
+    Return the timeout of the cached static url replacements, or 0 if they
+    aren't cached.
+    """
+    # .. setting_name: STATIC_REPLACE_CACHE_TIMEOUT
+    # .. setting_default: 0
+    # .. setting_description: Number of seconds the course asset urls resolved by replace_static_urls, and
+    #   the html fragments it rewrites, are cached in the default django cache. The cache of a course is
+    #   invalidated when its assets are changed in Studio; the timeout bounds how long the replacements of
+    #   the assets changed by other means, e.g. course imports, may be stale. Use 0 to disable the cache.
+    return getattr(settings, 'STATIC_REPLACE_CACHE_TIMEOUT', 0)
+
+
+def _static_replace_cache_key(kind, *parts):
+    """
+    Return the cache key of the given kind of static url replacement, hashing
+    the given parts so that the key fits any cache backend.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(str(part).encode('utf-8'))
+        hasher.update(b'\0')
+    return f'{STATIC_REPLACE_CACHE_NAMESPACE}.{kind}.{hasher.hexdigest()}'
+
+
+def _course_static_urls_version_key(course_key):
+    """
+    Return the cache key of the version of the static url replacements of the
+    given course.
+    """
+    return _static_replace_cache_key('version', course_key)
+
+
+def _course_static_urls_version(course_key):
+    """
+    Return the version of the cached static url replacements of the given
+    course, which is part of their cache keys so that they can be invalidated
+    all at once. The version is memoized for the duration of the request.
+    """
+    versions = RequestCache(STATIC_REPLACE_CACHE_NAMESPACE).data
+    version = versions.get(str(course_key))
+    if version is None:
+        version_key = _course_static_urls_version_key(course_key)
+        cache.add(version_key, uuid4().hex, None)
+        version = cache.get(version_key)
+        versions[str(course_key)] = version
+    return version
+
+
+def _contains_static_urls(text):
+    """
+    Return whether the text may contain static urls, without matching the
+    static url regex.
+    """
+    return '/static/' in text or str(settings.STATIC_URL) in text
+
+
+def _course_asset_url(course_id, rest):
+    """
+    Return the url of the given path of a course asset: the url of the file of
+    the static file pipeline at this path if it exists, else the url of the
+    course's asset in the contentstore.
+    """
+    # Import is placed here to avoid model import at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    base_url = AssetBaseUrlConfig.get_base_url()
+    excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+
+    cache_timeout = _static_replace_cache_timeout()
+    if cache_timeout:
+        # The urls of the static file pipeline change with each release.
+        cache_key = _static_replace_cache_key(
+            'asset_url', course_id, rest, base_url, excluded_exts, _course_static_urls_version(course_id),
+            settings.STATIC_URL, getattr(settings, 'EDX_PLATFORM_REVISION', None),
+        )
+        url = cache.get(cache_key)
+        if url is not None:
+            return url
+
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+    except Exception as err:  # lint-amnesty, pylint: disable=broad-except
+        log.warning("staticfiles_storage couldn't find path {}: {}".format(
+            rest, str(err)))
+
+    if exists_in_staticfiles_storage:
+        url = staticfiles_storage.url(rest)
+    else:
+        # if not, then assume it's courseware specific content and then look in the
+        # Mongo-backed database
+        url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+        if AssetLocator.CANONICAL_NAMESPACE in url:
+            url = url.replace('block@', 'block/', 1)
+
+    if cache_timeout:
+        cache.set(cache_key, url, cache_timeout)
+    return url
+
+
+def _replaced_static_urls_cache_key(text, data_directory, course_id, static_asset_path):
+    """
+    Return the cache key of the replacement of the static urls of the given
+    text, or None if it can't be cached.
+
+    The key covers everything the replacement depends on: the text, the course
+    and its asset version, the static asset directories, the base url of the
+    asset CDN and the static file pipeline of the deployed release.
+    """
+    if not _static_replace_cache_timeout():
+        return None
+
+    # Import is placed here to avoid model import at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    course_assets = ()
+    if not static_asset_path and course_id:
+        course_assets = (
+            AssetBaseUrlConfig.get_base_url(),
+            AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            _course_static_urls_version(course_id),
+        )
+    return _static_replace_cache_key(
+        'text', text, data_directory, course_id, static_asset_path, settings.STATIC_URL,
+        getattr(settings, 'EDX_PLATFORM_REVISION', None), *course_assets
+    )
+
+
 def replace_static_urls(
     text,
     data_directory=None,
@@ -162,6 +314,10 @@ def replace_static_urls(
     /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
     correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
 
+    The replacements are cached when STATIC_REPLACE_CACHE_TIMEOUT is set, unless
+    lookup_asset_url is given or DEBUG is on. The time spent replacing the urls is
+    reported to monitoring.
+
     text: The source text to do the substitution in
     data_directory: The directory in which course data is stored
     course_id: The course identifier used to distinguish static content for this course in studio
@@ -172,10 +328,34 @@ def replace_static_urls(
     xblock: xblock where the static assets are stored
     lookup_url_func: Lookup function which returns the correct path of the asset
     """
+    start_time = time.perf_counter()
+    try:
+        return _replace_static_urls(
+            text, data_directory, course_id, static_asset_path, static_paths_out, xblock, lookup_asset_url,
+        )
+    finally:
+        monitoring_utils.accumulate('static_replace_ms', (time.perf_counter() - start_time) * 1000)
+
 
+def _replace_static_urls(text, data_directory, course_id, static_asset_path, static_paths_out, xblock,
+                         lookup_asset_url):
+    """
+    Replace the static urls of the text, see replace_static_urls.
+    """
     if static_paths_out is None:
         static_paths_out = []
 
+    cache_key = None
+    if lookup_asset_url is None and not settings.DEBUG and _contains_static_urls(text):
+        cache_key = _replaced_static_urls_cache_key(text, data_directory, course_id, static_asset_path)
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            replaced_text, static_paths = cached
+            static_paths_out.extend(static_paths)
+            return replaced_text
+    static_paths_start = len(static_paths_out)
+
     def replace_static_url(original, prefix, quote, rest):
         """
         Replace a single matched url.
@@ -197,29 +377,7 @@ def replace_static_urls(
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # lint-amnesty, pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = _course_asset_url(course_id, rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -239,4 +397,7 @@ def replace_static_urls(
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    replaced_text = process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    if cache_key is not None:
+        cache.set(cache_key, (replaced_text, static_paths_out[static_paths_start:]), _static_replace_cache_timeout())
+    return replaced_text
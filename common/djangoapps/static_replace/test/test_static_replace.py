@@ -8,13 +8,16 @@ from urllib.parse import parse_qsl, quote, urlparse, urlunparse, urlencode
 
 import ddt
 import pytest
+from django.core.cache import cache
 from django.test import override_settings
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from web_fragments.fragment import Fragment
 
 from common.djangoapps.static_replace import (
     _url_replace_regex,
+    invalidate_course_static_urls,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
@@ -134,6 +137,48 @@ def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_m
     mock_static_content.get_canonicalized_asset_path.assert_called_once_with(COURSE_KEY, 'file.png', '', ['foobar'])
 
 
+@patch('common.djangoapps.static_replace.StaticContent', autospec=True)
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+@patch('common.djangoapps.static_replace.models.AssetBaseUrlConfig.get_base_url')
+@patch('common.djangoapps.static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions')
+@override_settings(STATIC_REPLACE_CACHE_TIMEOUT=60)
+def test_cached_replacements(mock_get_excluded_extensions, mock_get_base_url, mock_storage, mock_static_content):
+    """
+    Make sure that the replacements are cached until the course's assets change.
+    """
+    cache.clear()
+    RequestCache.clear_all_namespaces()
+    mock_get_base_url.return_value = ''
+    mock_get_excluded_extensions.return_value = []
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = '/asset-v1:org+course+run+type@asset+block@file.png'
+    text = f'<img src={STATIC_SOURCE}/><a href={STATIC_SOURCE}></a>'
+    expected_text = '<img src="/asset-v1:org+course+run+type@asset+block/file.png"/>' \
+        '<a href="/asset-v1:org+course+run+type@asset+block/file.png"></a>'
+
+    for __ in range(2):
+        static_paths = []
+        assert replace_static_urls(text, course_id=COURSE_KEY, static_paths_out=static_paths) == expected_text
+        assert static_paths == [('/static/file.png', '/asset-v1:org+course+run+type@asset+block/file.png')] * 2
+    # the url of the asset was resolved once, for the first url of the first replacement
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 1
+
+    # other fragments reuse the resolved asset urls
+    assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == \
+        '"/asset-v1:org+course+run+type@asset+block/file.png"'
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 1
+
+    # the asset urls are resolved again for another release
+    with override_settings(EDX_PLATFORM_REVISION='other'):
+        replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY)
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 2
+
+    invalidate_course_static_urls(COURSE_KEY)
+    mock_static_content.get_canonicalized_asset_path.return_value = '/static/file.png'
+    assert replace_static_urls(text, course_id=COURSE_KEY) == text
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 3
+
+
 @patch('common.djangoapps.static_replace.settings', autospec=True)
 @patch('xmodule.modulestore.django.modulestore', autospec=True)
 @patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
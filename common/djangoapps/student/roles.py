@@ -63,13 +63,26 @@ def strict_role_checking():
 class BulkRoleCache:  # lint-amnesty, pylint: disable=missing-class-docstring
     CACHE_NAMESPACE = "student.roles.BulkRoleCache"
     CACHE_KEY = 'roles_by_user'
+    ORG_CACHE_KEY = 'roles_by_org_and_user'
 
     @classmethod
-    def prefetch(cls, users):  # lint-amnesty, pylint: disable=missing-function-docstring
+    def prefetch(cls, users, org=None):
+        """
+        Load the CourseAccessRoles of the given users in a single query.
+
+        If an org is given, only the roles in that org, which include the roles
+        in its courses, are loaded; they answer the role checks of the users in
+        that org and its courses only.
+        """
         roles_by_user = defaultdict(set)
-        get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY] = roles_by_user
+        if org is None:
+            get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY] = roles_by_user
+            roles = CourseAccessRole.objects.filter(user__in=users)
+        else:
+            get_cache(cls.CACHE_NAMESPACE).setdefault(cls.ORG_CACHE_KEY, {})[org] = roles_by_user
+            roles = CourseAccessRole.objects.filter(user__in=users, org=org)
 
-        for role in CourseAccessRole.objects.filter(user__in=users).select_related('user'):
+        for role in roles.select_related('user'):
             roles_by_user[role.user.id].add(role)
 
         users_without_roles = [u for u in users if u.id not in roles_by_user]
@@ -80,12 +93,34 @@ class BulkRoleCache:  # lint-amnesty, pylint: disable=missing-class-docstring
     def get_user_roles(cls, user):
         return get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY][user.id]
 
+    @classmethod
+    def get_user_org_roles(cls, user, org):
+        """
+        Return the prefetched roles of the user in the given org, or None if
+        they weren't prefetched.
+        """
+        roles_by_user = get_cache(cls.CACHE_NAMESPACE).get(cls.ORG_CACHE_KEY, {}).get(org, {})
+        return roles_by_user.get(user.id)
+
+    @classmethod
+    def clear_user(cls, user):
+        """
+        Forget the prefetched roles of the user, e.g. once they're modified.
+        """
+        cache = get_cache(cls.CACHE_NAMESPACE)
+        cache.get(cls.CACHE_KEY, {}).pop(user.id, None)
+        for roles_by_user in cache.get(cls.ORG_CACHE_KEY, {}).values():
+            roles_by_user.pop(user.id, None)
+
 
 class RoleCache:
     """
     A cache of the CourseAccessRoles held by a particular user
     """
-    def __init__(self, user):
+    def __init__(self, user, roles=None):
+        if roles is not None:
+            self._roles = roles
+            return
         try:
             self._roles = BulkRoleCache.get_user_roles(user)
         except KeyError:
@@ -204,6 +239,11 @@ class RoleBase(AccessRole):
 
         # pylint: disable=protected-access
         if not hasattr(user, '_roles'):
+            # The roles prefetched for this role's org only answer checks in that org,
+            # so they aren't cached on the user.
+            org_roles = BulkRoleCache.get_user_org_roles(user, self.org)
+            if org_roles is not None:
+                return RoleCache(user, roles=org_roles).has_role(self._role_name, self.course_key, self.org)
             # Cache a list of tuples identifying the particular roles that a user has
             # Stored as tuples, rather than django models, to make it cheaper to construct objects for comparison
             user._roles = RoleCache(user)
@@ -224,6 +264,7 @@ class RoleBase(AccessRole):
                 )
                 if hasattr(user, '_roles'):
                     del user._roles
+                BulkRoleCache.clear_user(user)
 
     def remove_users(self, *users):
         """
@@ -236,6 +277,7 @@ class RoleBase(AccessRole):
         for user in users:
             if hasattr(user, '_roles'):
                 del user._roles
+            BulkRoleCache.clear_user(user)
 
     def users_with_role(self):
         """
@@ -4,10 +4,13 @@ Tests of student.roles
 
 
 import ddt
+from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.test import TestCase
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 
 from common.djangoapps.student.roles import (
+    BulkRoleCache,
     CourseBetaTesterRole,
     CourseInstructorRole,
     CourseRole,
@@ -157,6 +160,34 @@ class RolesTestCase(TestCase):
         role_second_org.add_users(self.student)
         assert len(role.get_orgs_for_user(self.student)) == 2
 
+    def test_org_role_prefetch(self):
+        """
+        Test that the roles prefetched for an org answer the role checks in that org without queries
+        """
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        CourseStaffRole(self.course_key).add_users(self.student)
+        org_instructor = UserFactory()
+        OrgInstructorRole(self.course_key.org).add_users(org_instructor)
+        users = {user.id: user for user in User.objects.filter(id__in=[self.student.id, org_instructor.id])}
+        student, instructor = users[self.student.id], users[org_instructor.id]
+
+        with self.assertNumQueries(1):
+            BulkRoleCache.prefetch(list(users.values()), org=self.course_key.org)
+        with self.assertNumQueries(0):
+            assert CourseStaffRole(self.course_key).has_user(student)
+            assert not CourseInstructorRole(self.course_key).has_user(student)
+            assert OrgInstructorRole(self.course_key.org).has_user(instructor)
+            assert not CourseStaffRole(self.course_key).has_user(instructor)
+        # Roles in other orgs weren't prefetched
+        with self.assertNumQueries(1):
+            assert not OrgStaffRole('otherorg').has_user(instructor)
+
+        # Modifying the roles of a user drops their prefetched roles
+        CourseInstructorRole(self.course_key).add_users(student)
+        assert CourseInstructorRole(self.course_key).has_user(student)
+        CourseStaffRole(self.course_key).remove_users(student)
+        assert not CourseStaffRole(self.course_key).has_user(student)
+
 
 @ddt.ddt
 class RoleCacheTestCase(TestCase):  # lint-amnesty, pylint: disable=missing-class-docstring
@@ -135,8 +135,7 @@ def get_blocks(
             block_type = blocks.get_xblock_field(block_key, 'category')
             if block_type not in block_types_filter:
                 block_keys_to_remove.append(block_key)
-        for block_key in block_keys_to_remove:
-            blocks.remove_block(block_key, keep_descendants=True)
+        blocks.remove_blocks(block_keys_to_remove, keep_descendants=True)
 
     # serialize
     serializer_context = {
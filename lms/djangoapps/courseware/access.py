@@ -14,8 +14,11 @@ Note: The access control logic in this file does NOT check for enrollment in
 
 import logging
 
+from crum import get_current_request
 from django.conf import settings  # pylint: disable=unused-import
 from django.contrib.auth.models import AnonymousUser
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from edx_django_utils.monitoring import function_trace
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from xblock.core import XBlock
@@ -40,7 +43,7 @@ from lms.djangoapps.courseware.masquerade import get_masquerade_role, is_masquer
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from lms.djangoapps.mobile_api.models import IgnoreMobileAvailableFlagConfig
-from lms.djangoapps.courseware.toggles import course_is_invitation_only
+from lms.djangoapps.courseware.toggles import ENABLE_ACCESS_DECISION_CACHE, course_is_invitation_only
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.features.course_duration_limits.access import check_course_expired
 from common.djangoapps.student import auth
@@ -67,6 +70,8 @@ from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPa
 
 log = logging.getLogger(__name__)
 
+ACCESS_DECISION_CACHE_NAMESPACE = 'courseware.access.decisions'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -127,6 +132,56 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    When ENABLE_ACCESS_DECISION_CACHE is on, the access decisions are memoized
+    for the duration of the request, see clear_access_decision_cache.
+    """
+    if not ENABLE_ACCESS_DECISION_CACHE.is_enabled() or get_current_request() is None:
+        return _has_access(user, action, obj, course_key)
+
+    decisions = RequestCache(ACCESS_DECISION_CACHE_NAMESPACE).data
+    decision_key = _access_decision_key(user, action, obj, course_key)
+    decision = decisions.get(decision_key)
+    if decision is not None:
+        monitoring_utils.increment('has_access.cache_hits')
+        return decision[-1]
+
+    monitoring_utils.increment('has_access.evaluations')
+    response = _has_access(user, action, obj, course_key)
+    # The user, the object and its field data are kept along with the response, so that their ids, which are part
+    # of the key, can't be reused by other objects for the duration of the request.
+    decisions[decision_key] = (user, obj, getattr(obj, '_bound_field_data', None), response)
+    return response
+
+
+def clear_access_decision_cache():
+    """
+    Clears the access decisions memoized by has_access for the current request.
+
+    It must be called whenever the access of the current request's user may
+    change during the request, e.g. when their masquerade is changed.
+    """
+    RequestCache(ACCESS_DECISION_CACHE_NAMESPACE).clear()
+
+
+def _access_decision_key(user, action, obj, course_key):
+    """
+    Returns the key of the memoized has_access decision of the given arguments.
+
+    The users and blocks are identified by the objects themselves rather than by
+    their ids and locations: the masquerade settings of a user are stored on the
+    user object, and the fields of a block depend on the user it's bound for.
+    """
+    if isinstance(obj, (str, CourseKey, UsageKey)):
+        obj_key = obj
+    else:
+        obj_key = (id(obj), id(getattr(obj, '_bound_field_data', None)))
+    return id(user) if user else None, action, obj_key, course_key
+
+
+def _has_access(user, action, obj, course_key=None):
+    """
+    Implements has_access, without memoizing the decisions.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
@@ -199,6 +199,9 @@ class MasqueradeView(View):
             user_name=found_user_name,
         )
         request.session[MASQUERADE_SETTINGS_KEY] = masquerade_settings
+        # Avoid circular imports.
+        from lms.djangoapps.courseware.access import clear_access_decision_cache
+        clear_access_decision_cache()
         return JsonResponse({'success': True})
 
 
@@ -241,6 +244,9 @@ def setup_masquerade(request, course_key, staff_access=False, reset_masquerade_d
             # be used in some places instead of request.user.
             masquerade_user.masquerade_settings = request.user.masquerade_settings
             masquerade_user.real_user = request.user
+    # The access of the users depends on their masquerade settings. Avoid circular imports.
+    from lms.djangoapps.courseware.access import clear_access_decision_cache
+    clear_access_decision_cache()
     return course_masquerade, masquerade_user or request.user
 
 
@@ -19,6 +19,9 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:class:`MultiUserFieldDataCache`: A prefetch cache of the data of many users for the same
+    blocks, which hands out a :class:`~FieldDataCache` for each of them.
 """
 
 
@@ -82,6 +85,39 @@ def _all_block_types(blocks, aside_types):
     return block_types
 
 
+def _get_block_descendents(block, depth=None, block_filter=lambda block: True):
+    """
+    Return a list of `block` and all its descendant blocks down to the
+    specified depth that match the block filter.
+
+    block: The parent to search inside
+    depth: The number of levels to descend, or None for infinite depth
+    block_filter(block): A function that returns True
+        if block should be included in the results
+    """
+
+    def get_child_blocks(block, depth, block_filter):
+        """
+        Return a list of all child blocks down to the specified depth
+        that match the block filter. Includes `block`
+        """
+        if block_filter(block):
+            blocks = [block]
+        else:
+            blocks = []
+
+        if depth is None or depth > 0:
+            new_depth = depth - 1 if depth is not None else depth
+
+            for child in block.get_children() + block.get_required_block_descriptors():
+                blocks.extend(get_child_blocks(child, new_depth, block_filter))
+
+        return blocks
+
+    with modulestore().bulk_operations(block.location.course_key):
+        return get_child_blocks(block, depth, block_filter)
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -167,7 +203,16 @@ class DjangoOrmFieldCache(metaclass=ABCMeta):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        self.add_field_objects(self._read_objects(fields, xblocks, aside_types))
+
+    def add_field_objects(self, field_objects):
+        """
+        Add already loaded ``field_objects`` to this cache.
+
+        Arguments:
+            field_objects (iterable): Django model instances that store the data for fields in this cache
+        """
+        for field_object in field_objects:
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
     def get(self, kvs_key):
@@ -350,11 +395,19 @@ class UserStateCache:
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        block_field_state = self._client.get_many(
+        self.add_user_states(self._client.get_many(
             self.user.username,
             _all_usage_keys(xblocks, aside_types),
-        )
-        for user_state in block_field_state:
+        ))
+
+    def add_user_states(self, user_states):
+        """
+        Add already loaded ``user_states`` of this cache's user to this cache.
+
+        Arguments:
+            user_states (iterable of :class:`~XBlockUserState`): The state of the user's blocks
+        """
+        for user_state in user_states:
             self._cache[user_state.block_key] = user_state.state
 
     def set(self, kvs_key, value):
@@ -730,34 +783,7 @@ class FieldDataCache:
             block_filter is a function that accepts a block and return whether the field data
                 should be cached
         """
-
-        def get_child_blocks(block, depth, block_filter):
-            """
-            Return a list of all child blocks down to the specified depth
-            that match the block filter. Includes `block`
-
-            block: The parent to search inside
-            depth: The number of levels to descend, or None for infinite depth
-            block_filter(block): A function that returns True
-                if block should be included in the results
-            """
-            if block_filter(block):
-                blocks = [block]
-            else:
-                blocks = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
-
-                for child in block.get_children() + block.get_required_block_descriptors():
-                    blocks.extend(get_child_blocks(child, new_depth, block_filter))
-
-            return blocks
-
-        with modulestore().bulk_operations(block.location.course_key):
-            blocks = get_child_blocks(block, depth, block_filter)
-
-        self.add_blocks_to_cache(blocks)
+        self.add_blocks_to_cache(_get_block_descendents(block, depth, block_filter))
 
     @classmethod
     def cache_for_block_descendents(cls, course_id, user, block, depth=None,
@@ -776,7 +802,8 @@ class FieldDataCache:
         cache.add_block_descendents(block, depth, block_filter)
         return cache
 
-    def _fields_to_cache(self, blocks):
+    @staticmethod
+    def _fields_to_cache(blocks):
         """
         Returns a map of scopes to fields in that scope that should be cached
         """
@@ -908,6 +935,122 @@ class FieldDataCache:
         return sum(len(cache) for cache in self.cache.values())
 
 
+class MultiUserFieldDataCache:
+    """
+    A cache of the field data of many users for the same blocks, used by code
+    that walks many learners, such as instructor tasks.
+
+    The data of all the users is loaded with a few queries, chunked on the
+    users, rather than with queries for each user, and a FieldDataCache
+    prefilled with the data of a single user is handed out by :meth:`for_user`.
+    """
+    def __init__(self, blocks, course_id, users, asides=None, chunk_size=500):
+        """
+        Arguments
+        blocks: A list of XBlocks.
+        course_id: The id of the current course
+        users: The users for which to cache data
+        asides: The list of aside types to load, or None to prefetch no asides.
+        chunk_size: The number of users whose data is loaded per query.
+        """
+        assert isinstance(course_id, LearningContextKey)
+        self.blocks = blocks
+        self.course_id = course_id
+        self.asides = [] if asides is None else asides
+        self.users = {user.id: user for user in users if user.is_authenticated}
+
+        self._user_states = defaultdict(list)
+        self._field_objects = {
+            Scope.user_info: defaultdict(list),
+            Scope.preferences: defaultdict(list),
+        }
+        self._user_state_summary_cache = UserStateSummaryCache(self.course_id)
+
+        if self.users:
+            for scope, fields in FieldDataCache._fields_to_cache(blocks).items():  # pylint: disable=protected-access
+                self._cache_fields(scope, fields, chunk_size)
+
+    @classmethod
+    def cache_for_block_descendents(cls, course_id, users, block, depth=None,
+                                    block_filter=lambda block: True, asides=None, chunk_size=500):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        users: the django users for whom to load modules.
+        block: An XBlock
+        depth is the number of levels of descendant blocks to load StudentModules for, in addition to
+            the supplied block. If depth is None, load all descendant StudentModules
+        block_filter is a function that accepts a block and return whether the field data
+            should be cached
+        """
+        return cls(
+            _get_block_descendents(block, depth, block_filter), course_id, users, asides=asides, chunk_size=chunk_size,
+        )
+
+    def _cache_fields(self, scope, fields, chunk_size):
+        """
+        Load the ``fields`` of the given ``scope`` for all the users.
+        """
+        user_ids = list(self.users)
+        field_names = {field.name for field in fields}
+
+        if scope == Scope.user_state:
+            user_states = DjangoXBlockUserStateClient().get_many_for_users(
+                list(self.users.values()),
+                _all_usage_keys(self.blocks, self.asides),
+                chunk_size=chunk_size,
+            )
+            usernames = {user.username: user_id for user_id, user in self.users.items()}
+            for user_state in user_states:
+                self._user_states[usernames[user_state.username]].append(user_state)
+
+        elif scope == Scope.preferences:
+            field_objects = XModuleStudentPrefsField.objects.chunked_filter(
+                'student_id__in',
+                user_ids,
+                module_type__in=_all_block_types(self.blocks, self.asides),
+                field_name__in=field_names,
+                chunk_size=chunk_size,
+            )
+            for field_object in field_objects:
+                self._field_objects[scope][field_object.student_id].append(field_object)
+
+        elif scope == Scope.user_info:
+            field_objects = XModuleStudentInfoField.objects.chunked_filter(
+                'student_id__in',
+                user_ids,
+                field_name__in=field_names,
+                chunk_size=chunk_size,
+            )
+            for field_object in field_objects:
+                self._field_objects[scope][field_object.student_id].append(field_object)
+
+        elif scope == Scope.user_state_summary:
+            # This data is shared by all the users.
+            self._user_state_summary_cache.cache_fields(fields, self.blocks, self.asides)
+
+    def for_user(self, user, read_only=False):
+        """
+        Return a FieldDataCache for ``user``, which must be one of the users of
+        this cache, prefilled with their data without any further queries.
+
+        The cached state of the user is copied, so that changes made through the
+        returned FieldDataCache don't affect the data later handed out by this cache.
+        """
+        field_data_cache = FieldDataCache([], self.course_id, user, asides=self.asides, read_only=read_only)
+        if user.id not in self.users:
+            field_data_cache.add_blocks_to_cache(self.blocks)
+            return field_data_cache
+
+        field_data_cache.scorable_locations.update(block.location for block in self.blocks if block.has_score)
+        field_data_cache.cache[Scope.user_state].add_user_states(
+            user_state._replace(state=dict(user_state.state)) for user_state in self._user_states[user.id]
+        )
+        for scope, field_objects in self._field_objects.items():
+            field_data_cache.cache[scope].add_field_objects(field_objects[user.id])
+        field_data_cache.cache[Scope.user_state_summary] = self._user_state_summary_cache
+        return field_data_cache
+
+
 class ScoresClient:
     """
     Basic client interface for retrieving Score information.
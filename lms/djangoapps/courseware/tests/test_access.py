@@ -358,6 +358,37 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
 
         self.assertRaises(ValueError, access._has_access_string, user, 'not_staff', 'global')
 
+    @override_settings(ENABLE_ACCESS_DECISION_CACHE=True)
+    def test_access_decision_cache(self):
+        """
+        Test that the access decisions are memoized for the duration of the request.
+        """
+        self.addCleanup(set_current_request, None)
+        self.addCleanup(access.clear_access_decision_cache)
+        set_current_request(RequestFactory().get('/'))
+
+        with patch.object(access, '_has_access_string', wraps=access._has_access_string) as mock_has_access_string:
+            for __ in range(2):
+                assert access.has_access(self.global_staff, 'staff', 'global')
+            assert mock_has_access_string.call_count == 1
+
+            assert not access.has_access(self.student, 'staff', 'global')
+            assert mock_has_access_string.call_count == 2
+
+            access.clear_access_decision_cache()
+            assert access.has_access(self.global_staff, 'staff', 'global')
+            assert mock_has_access_string.call_count == 3
+
+    @override_settings(ENABLE_ACCESS_DECISION_CACHE=True)
+    def test_access_decision_cache_outside_request(self):
+        """
+        Test that the access decisions aren't memoized outside of requests.
+        """
+        with patch.object(access, '_has_access_string', wraps=access._has_access_string) as mock_has_access_string:
+            for __ in range(2):
+                assert access.has_access(self.global_staff, 'staff', 'global')
+            assert mock_has_access_string.call_count == 2
+
     @ddt.data(
         ('load', False, True, True),
         ('staff', False, True, True),
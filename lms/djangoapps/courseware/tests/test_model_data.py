@@ -13,7 +13,12 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    MultiUserFieldDataCache
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -444,3 +449,53 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestMultiUserFieldDataCache(TestCase):
+    """Tests for loading the field data of many users at once"""
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.users = []
+        for index in range(3):
+            student_module = StudentModuleFactory(state=json.dumps({'a_field': f'value {index}'}))
+            StudentPrefsFactory(student=student_module.student)
+            self.users.append(student_module.student)
+        self.block = mock_block([
+            mock_field(Scope.user_state, 'a_field'),
+            mock_field(Scope.preferences, 'existing_field'),
+        ])
+
+    def test_for_user(self):
+        # One query for each user scope and chunk of users, regardless of the number of users
+        with self.assertNumQueries(4):
+            multi_user_field_data_cache = MultiUserFieldDataCache([self.block], COURSE_KEY, self.users, chunk_size=2)
+
+        for index, user in enumerate(self.users):
+            with self.assertNumQueries(0):
+                kvs = DjangoKeyValueStore(multi_user_field_data_cache.for_user(user))
+                user_state_key_for_user = DjangoKeyValueStore.Key(
+                    Scope.user_state, user.id, LOCATION('usage_id'), 'a_field'
+                )
+                assert kvs.get(user_state_key_for_user) == f'value {index}'
+                assert kvs.get(DjangoKeyValueStore.Key(Scope.preferences, user.id, 'mock_problem', 'existing_field')) \
+                    == 'old_value'
+
+    def test_changes_are_not_shared(self):
+        multi_user_field_data_cache = MultiUserFieldDataCache([self.block], COURSE_KEY, self.users)
+        user = self.users[0]
+        key = DjangoKeyValueStore.Key(Scope.user_state, user.id, LOCATION('usage_id'), 'a_field')
+
+        DjangoKeyValueStore(multi_user_field_data_cache.for_user(user, read_only=True)).set(key, 'new value')
+        DjangoKeyValueStore(multi_user_field_data_cache.for_user(user)).delete(key)
+
+        assert DjangoKeyValueStore(multi_user_field_data_cache.for_user(user)).get(key) == 'value 0'
+
+    def test_other_user(self):
+        multi_user_field_data_cache = MultiUserFieldDataCache([self.block], COURSE_KEY, self.users[1:])
+        user = self.users[0]
+        # The data of users that weren't prefetched is loaded as usual
+        with self.assertNumQueries(2):
+            kvs = DjangoKeyValueStore(multi_user_field_data_cache.for_user(user))
+        assert kvs.get(DjangoKeyValueStore.Key(Scope.user_state, user.id, LOCATION('usage_id'), 'a_field')) == 'value 0'
@@ -96,6 +96,19 @@ COURSEWARE_OPTIMIZED_RENDER_XBLOCK = CourseWaffleFlag(
     f'{WAFFLE_FLAG_NAMESPACE}.optimized_render_xblock', __name__
 )
 
+# .. toggle_name: ENABLE_ACCESS_DECISION_CACHE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set to True to memoize the decisions of courseware's has_access for the duration of each
+#   request, rather than evaluating them again for each check of the same user, action and object. The numbers of
+#   memoized and evaluated decisions are reported in the has_access.cache_hits and has_access.evaluations custom
+#   attributes.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_warning: The decisions memoized in a request don't reflect the role, enrollment or course changes made
+#   later in the same request.
+ENABLE_ACCESS_DECISION_CACHE = SettingToggle('ENABLE_ACCESS_DECISION_CACHE', default=False)
+
 # .. toggle_name: COURSES_INVITE_ONLY
 # .. toggle_implementation: SettingToggle
 # .. toggle_type: feature_flag
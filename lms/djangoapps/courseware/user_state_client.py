@@ -396,6 +396,57 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    def get_many_for_users(self, users, block_keys, scope=Scope.user_state, chunk_size=500):
+        """
+        Retrieve the stored XBlock state of many users for the specified XBlock usages,
+        with queries chunked on the users rather than with a query per user.
+
+        Arguments:
+            users (list of :class:`~User`): The users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            chunk_size (int): The number of users whose state is retrieved per query.
+
+        Yields:
+            XBlockUserState tuples for each user and each specified UsageKey with stored state.
+        """
+        if scope != Scope.user_state:
+            raise ValueError(f"Only Scope.user_state is supported, not {scope}")
+
+        self._nr_stat_increment('get_many_for_users', 'calls')
+        self._nr_stat_accumulate('get_many_for_users', 'users_requested', len(users))
+
+        usernames = {user.id: user.username for user in users}
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        for course_key, usage_keys in by_course:
+            query = StudentModule.objects.chunked_filter(
+                'student_id__in',
+                list(usernames),
+                module_state_key__in=list(usage_keys),
+                course_id=course_key,
+                chunk_size=chunk_size,
+            )
+
+            for module in query:
+                if module.state is None:
+                    continue
+
+                state = json.loads(module.state)
+
+                # If the state is the empty dict, then it has been deleted, and so
+                # conformant UserStateClients should treat it as if it doesn't exist.
+                if state == {}:
+                    continue
+
+                usage_key = module.module_state_key.map_into_course(module.course_id)
+                self._nr_block_stat_increment('get_many_for_users', usage_key.block_type, 'blocks_out')
+                yield XBlockUserState(usernames[module.student_id], usage_key, state, module.modified, scope)
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
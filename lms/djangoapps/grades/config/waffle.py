@@ -72,6 +72,21 @@ WRITABLE_GRADEBOOK = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.writable_gradebook',
 # .. toggle_tickets: https://github.com/openedx/edx-platform/pull/21389
 BULK_MANAGEMENT = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.bulk_management', __name__, LOG_PREFIX)
 
+# .. toggle_name: grades.coalesce_subsection_grade_recalculations
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the subsection grade recalculations triggered by score changes of the same
+#   learner in the same subsections are coalesced into a single recalculation. It runs
+#   RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS after the first of these score changes, and later changes do not
+#   extend that fixed window. Only the changes made with the same update options (only_if_higher, score_deleted and
+#   force_update_subsections) are coalesced together. This reduces the load on the grading workers when learners
+#   submit many problems in a short time, for example during exams, at the cost of delaying the grade updates.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+COALESCE_SUBSECTION_GRADE_RECALCULATIONS = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.coalesce_subsection_grade_recalculations', __name__, LOG_PREFIX
+)
+
 
 def is_writable_gradebook_enabled(course_key):
     """
@@ -2,6 +2,7 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 from openedx.core.djangoapps.signals.signals import (
@@ -11,7 +12,7 @@ from openedx.core.djangoapps.signals.signals import (
 )
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
 from .models_api import prefetch_grade_overrides_and_visible_blocks
 
 log = getLogger(__name__)
@@ -23,6 +24,10 @@ class CourseGradeFactory:
     """
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'error'])
 
+    # Number of users whose persisted grades are read together by iter, when
+    # reading in bulk.
+    BULK_READ_BATCH_SIZE = 100
+
     def read(
             self,
             user,
@@ -75,6 +80,7 @@ class CourseGradeFactory:
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            bulk_read=False,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -84,6 +90,13 @@ class CourseGradeFactory:
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If bulk_read is True (and force_update is False), the persisted course
+        and subsection grades of the students are read in batches of
+        BULK_READ_BATCH_SIZE students, and the grades that were persisted for
+        the current version of the course are read without loading the course
+        from the modulestore. Each grade should be used as it is yielded, since
+        its subsection grades are only read in bulk for the current batch.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -93,21 +106,77 @@ class CourseGradeFactory:
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
+        if bulk_read and not force_update:
+            yield from self._iter_bulk_read_results(users, course, course_data)
+            return
+
         for user in users:
             yield self._iter_grade_result(user, course_data, force_update)
 
     def _iter_grade_result(self, user, course_data, force_update):  # lint-amnesty, pylint: disable=missing-function-docstring
+        kwargs = {
+            'user': user,
+            'course': course_data.course,
+            'collected_block_structure': course_data.collected_structure,
+            'course_key': course_data.course_key,
+        }
+        if force_update:
+            kwargs['force_update_subsections'] = True
+
+        method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
+        return self._grade_result(user, course_data, method, **kwargs)
+
+    def _iter_bulk_read_results(self, users, course, course_data):
+        """
+        Yields a GradeResult for each of the given users, reading their
+        persisted grades in batches.
+
+        The persisted grades of each batch are prefetched in the RequestCache,
+        from which they are read by CourseGradeFactory.read and by the
+        SubsectionGradeFactory of each course grade.
+        """
+        course_key = course_data.course_key
+        collected_block_structure = course_data.collected_structure
+        course_version = course_data.version
+        course_version = str(course_version) if course_version else None
+
+        users = iter(users)
+        users_batch = list(islice(users, self.BULK_READ_BATCH_SIZE))
+        while users_batch:
+            PersistentCourseGrade.prefetch(course_key, users_batch)
+            PersistentSubsectionGrade.prefetch(course_key, users_batch)
+            try:
+                for user in users_batch:
+                    try:
+                        persistent_grade = PersistentCourseGrade.read(user.id, course_key)
+                    except PersistentCourseGrade.DoesNotExist:
+                        persistent_grade = None
+
+                    if persistent_grade and (not course_version or persistent_grade.course_version != course_version):
+                        # The grade was persisted for another version of the
+                        # course, so read it along with the current course.
+                        yield self._iter_grade_result(user, course_data, force_update=False)
+                    else:
+                        yield self._grade_result(
+                            user,
+                            course_data,
+                            CourseGradeFactory().read,
+                            user=user,
+                            course=course,
+                            collected_block_structure=collected_block_structure,
+                            course_key=course_key,
+                        )
+            finally:
+                PersistentCourseGrade.clear_prefetched_data(course_key)
+                PersistentSubsectionGrade.clear_prefetched_data(course_key)
+            users_batch = list(islice(users, self.BULK_READ_BATCH_SIZE))
+
+    def _grade_result(self, user, course_data, method, **kwargs):
+        """
+        Returns the GradeResult of calling the given CourseGradeFactory
+        method with the given kwargs.
+        """
         try:
-            kwargs = {
-                'user': user,
-                'course': course_data.course,
-                'collected_block_structure': course_data.collected_structure,
-                'course_key': course_data.course_key,
-            }
-            if force_update:
-                kwargs['force_update_subsections'] = True
-
-            method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
             course_grade = method(**kwargs)
             return self.GradeResult(user, course_grade, None)
         except Exception as exc:  # pylint: disable=broad-except
@@ -31,12 +31,12 @@ from common.djangoapps.track.event_transaction_utils import (
 )
 from common.djangoapps.util.date_utils import to_timestamp
 from lms.djangoapps.course_blocks.api import get_course_blocks
-from lms.djangoapps.grades.api import CourseGradeFactory, clear_prefetched_course_and_subsection_grades
+from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import constants as grades_constants
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import events as grades_events
 from lms.djangoapps.grades.api import gradebook_bulk_management_enabled
-from lms.djangoapps.grades.api import is_writable_gradebook_enabled, prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.api import is_writable_gradebook_enabled
 from lms.djangoapps.grades.course_data import CourseData
 from lms.djangoapps.grades.grade_utils import are_grades_frozen
 # TODO these imports break abstraction of the core Grades layer. This code needs
@@ -76,18 +76,14 @@ log = logging.getLogger(__name__)
 @contextmanager
 def bulk_gradebook_view_context(course_key, users):
     """
-    Prefetches all course and subsection grades in the given course for the given
-    list of users, also, fetch all the score relavant data,
-    storing the result in a RequestCache and deleting grades on context exit.
+    Prefetches all the score relevant data in the given course for the given
+    list of users, storing the result in a RequestCache. The course and
+    subsection grades themselves are read in bulk by CourseGradeFactory.iter.
     """
-    prefetch_course_and_subsection_grades(course_key, users)
     CourseEnrollment.bulk_fetch_enrollment_states(users, course_key)
     cohorts.bulk_cache_cohorts(course_key, users)
     BulkRoleCache.prefetch(users)
-    try:
-        yield
-    finally:
-        clear_prefetched_course_and_subsection_grades(course_key)
+    yield
 
 
 def verify_writable_gradebook_enabled(view_func):
@@ -661,7 +657,10 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
 
             with bulk_gradebook_view_context(course_key, users):
                 for user, course_grade, exc in CourseGradeFactory().iter(
-                    users, course_key=course_key, collected_block_structure=course_data.collected_structure
+                    users,
+                    course_key=course_key,
+                    collected_block_structure=course_data.collected_structure,
+                    bulk_read=True,
                 ):
                     if not exc:
                         entry = self._gradebook_entry(user, course, graded_subsections, course_grade)
@@ -1,12 +1,15 @@
 """
 This module contains tasks for asynchronous execution of grade updates.
 """
+import hashlib
+import json
 from logging import getLogger
 
 from celery import shared_task
 from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db.utils import DatabaseError
 from edx_django_utils.monitoring import (
@@ -24,6 +27,7 @@ from common.djangoapps.util.date_utils import from_timestamp
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.model_data import get_score
 from lms.djangoapps.grades.config.models import ComputeGradesSetting
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.course_overviews.models import \
     CourseOverview  # lint-amnesty, pylint: disable=unused-import
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -46,6 +50,7 @@ KNOWN_RETRY_ERRORS = (  # Errors we expect occasionally, should be resolved on r
     DatabaseNotReadyError,
 )
 RECALCULATE_GRADE_DELAY_SECONDS = 2  # to prevent excessive _has_db_updated failures. See TNL-6424.
+RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS = 10
 RETRY_DELAY_SECONDS = 40
 SUBSECTION_GRADE_TIMEOUT_SECONDS = 300
 
@@ -209,6 +214,11 @@ def _recalculate_subsection_grade(self, **kwargs):
             event at the root of the current event transaction.
         score_db_table (ScoreDatabaseTableEnum): database table that houses
             the changed score. Used in conjunction with expected_modified_time.
+        coalesce (boolean, OPTIONAL): indicating whether the recalculation
+            can be coalesced with the other recalculations of the same
+            subsections for the user. See _coalesce_subsection_recalculation.
+        coalescing_key (string, OPTIONAL): set on the single task that runs
+            the recalculations coalesced under this key.
     """
     try:
         course_key = CourseLocator.from_string(kwargs['course_id'])
@@ -229,14 +239,23 @@ def _recalculate_subsection_grade(self, **kwargs):
         set_event_transaction_id(kwargs.get('event_transaction_id'))
         set_event_transaction_type(kwargs.get('event_transaction_type'))
 
-        # Verify the database has been updated with the scores when the task was
-        # created. This race condition occurs if the transaction in the task
-        # creator's process hasn't committed before the task initiates in the worker
-        # process.
-        has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
+        coalescing_key = kwargs.get('coalescing_key')
+        if coalescing_key:
+            # The scores were verified by each of the tasks that were coalesced
+            # into this one, and may have changed since.
+            _start_coalesced_recalculation(coalescing_key)
+        else:
+            # Verify the database has been updated with the scores when the task was
+            # created. This race condition occurs if the transaction in the task
+            # creator's process hasn't committed before the task initiates in the worker
+            # process.
+            has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
 
-        if not has_database_updated:
-            raise DatabaseNotReadyError
+            if not has_database_updated:
+                raise DatabaseNotReadyError
+
+            if kwargs.get('coalesce') and _coalesce_subsection_recalculation(self, scored_block_usage_key, **kwargs):
+                return
 
         _update_subsection_grades(
             course_key,
@@ -256,6 +275,86 @@ def _recalculate_subsection_grade(self, **kwargs):
         raise self.retry(kwargs=kwargs, exc=exc)
 
 
+def _coalesce_subsection_recalculation(self, scored_block_usage_key, **kwargs):
+    """
+    Coalesces the recalculation of the subsection grades containing the
+    given scored block with the other pending recalculations of the same
+    subsections for the user.
+
+    The first task to reach this point for the given user and subsections
+    schedules a single recalculation to run after
+    RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS; the tasks that follow until
+    it starts have nothing left to do, since it reads all the scores that
+    were saved in the meantime. The window is fixed: later tasks do not
+    postpone the scheduled recalculation. The event transaction of the
+    latest task is used by the scheduled recalculation.
+
+    The scheduled recalculation runs with the kwargs of the first task.
+    Since the update options are part of the coalescing key, these are the
+    same for all the tasks coalesced into it; tasks with other options are
+    coalesced under another key. Its expected_modified_time is not used,
+    since each coalesced task already verified its own score.
+
+    Returns whether the recalculation was coalesced, and so must not be run
+    by the calling task.
+    """
+    collected_block_structure = get_block_structure_manager(scored_block_usage_key.course_key).get_collected()
+    subsections = collected_block_structure.get_transformer_block_field(
+        scored_block_usage_key,
+        GradesTransformer,
+        'subsections',
+        set(),
+    )
+    if not subsections:
+        return False
+
+    coalescing_key = _subsection_recalculation_coalescing_key(subsections, **kwargs)
+    # Expire the keys eventually in case the scheduled task is lost.
+    timeout = RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS + SUBSECTION_GRADE_TIMEOUT_SECONDS
+    cache.set(
+        f'{coalescing_key}.event_transaction',
+        (kwargs.get('event_transaction_id'), kwargs.get('event_transaction_type')),
+        timeout,
+    )
+    if cache.add(coalescing_key, self.request.id, timeout):
+        recalculate_subsection_grade_v3.apply_async(
+            kwargs=dict(kwargs, coalescing_key=coalescing_key),
+            countdown=RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS,
+        )
+    return True
+
+
+def _start_coalesced_recalculation(coalescing_key):
+    """
+    Marks the recalculation coalesced under the given key as started, so
+    that the scores changed from now on schedule another one, and sets the
+    event transaction of the latest coalesced task.
+    """
+    cache.delete(coalescing_key)
+    event_transaction = cache.get(f'{coalescing_key}.event_transaction')
+    if event_transaction:
+        event_transaction_id, event_transaction_type = event_transaction
+        set_event_transaction_id(event_transaction_id)
+        set_event_transaction_type(event_transaction_type)
+
+
+def _subsection_recalculation_coalescing_key(subsections, **kwargs):
+    """
+    Returns the cache key under which the recalculations of the given
+    subsections are coalesced, for the user and the update options in
+    the given task kwargs.
+    """
+    key_data = [
+        kwargs['user_id'],
+        sorted(str(subsection) for subsection in subsections),
+        kwargs['only_if_higher'],
+        kwargs['score_deleted'],
+        kwargs.get('force_update_subsections', False),
+    ]
+    key_hash = hashlib.sha1(json.dumps(key_data).encode('utf-8')).hexdigest()
+    return f'grades.recalculate_subsection_grade.{key_hash}'
+
+
 def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
     """
     Returns whether the database has been updated with the
@@ -9,10 +9,15 @@ from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
-from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.factories import (  # lint-amnesty, pylint: disable=wrong-import-order
+    CourseFactory,
+    check_mongo_calls
+)
 
+from ..course_data import CourseData
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentCourseGrade
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
@@ -158,6 +163,40 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    def test_iter_bulk_read(self):
+        with mock_get_score(1, 2):
+            self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
+        expected_grade = CourseGradeFactory().update(self.request.user, self.course)
+        collected_block_structure = CourseData(None, self.course).collected_structure
+
+        with check_mongo_calls(0):
+            for user, course_grade, error in CourseGradeFactory().iter(
+                [self.request.user],
+                collected_block_structure=collected_block_structure,
+                course_key=self.course.id,
+                bulk_read=True,
+            ):
+                assert user == self.request.user
+                assert error is None
+                assert course_grade.percent == expected_grade.percent
+                subsection_grade = course_grade.subsection_grades[self.sequence.location]
+                assert isinstance(subsection_grade, ReadSubsectionGrade)
+                assert subsection_grade.graded_total.earned == 1
+
+    @ddt.data(True, False)
+    def test_iter_bulk_read_other_course_version(self, other_version):
+        grade_factory = CourseGradeFactory()
+        grade_factory.update(self.request.user, self.course)
+        if other_version:
+            PersistentCourseGrade.objects.filter(course_id=self.course.id).update(course_version='other')
+
+        iter_grade_result = grade_factory._iter_grade_result  # pylint: disable=protected-access
+        with patch.object(CourseGradeFactory, '_iter_grade_result', wraps=iter_grade_result) as mock_iter_grade_result:
+            grade_results = list(grade_factory.iter([self.request.user], course_key=self.course.id, bulk_read=True))
+
+        assert grade_results[0].course_grade is not None
+        assert mock_iter_grade_result.called == other_version
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -23,11 +23,15 @@ from common.djangoapps.student.tests.factories import UserFactory
 from common.djangoapps.track.event_transaction_utils import create_new_event_transaction_id, get_event_transaction_id
 from common.djangoapps.util.date_utils import to_timestamp
 from lms.djangoapps.grades import tasks
-from lms.djangoapps.grades.config.waffle import ENFORCE_FREEZE_GRADE_AFTER_COURSE_END
+from lms.djangoapps.grades.config.waffle import (
+    COALESCE_SUBSECTION_GRADE_RECALCULATIONS,
+    ENFORCE_FREEZE_GRADE_AFTER_COURSE_END
+)
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
 from lms.djangoapps.grades.tasks import (
+    RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS,
     RECALCULATE_GRADE_DELAY_SECONDS,
     _course_task_args,
     compute_all_grades_for_course,
@@ -134,6 +138,16 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
             PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
             mock_task_apply.assert_called_once_with(countdown=RECALCULATE_GRADE_DELAY_SECONDS, kwargs=local_task_args)
 
+    @override_waffle_flag(COALESCE_SUBSECTION_GRADE_RECALCULATIONS, active=True)
+    def test_triggered_with_coalescing(self):
+        self.set_up_course()
+        with patch(
+            'lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async',
+            return_value=None
+        ) as mock_task_apply:
+            PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **self.problem_weighted_score_changed_kwargs)
+            assert mock_task_apply.call_args[1]['kwargs']['coalesce']
+
     @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
     def test_triggers_subsection_score_signal(self, mock_subsection_signal):
         """
@@ -335,6 +349,37 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         assert not mock_log.info.called
         self._assert_retry_called(mock_retry)
 
+    @patch('lms.djangoapps.grades.tasks._update_subsection_grades')
+    def test_coalesced_recalculations(self, mock_update):
+        self.set_up_course()
+        self.recalculate_subsection_grade_kwargs['coalesce'] = True
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async') as mock_task_apply:
+            self._apply_recalculate_subsection_grade()
+            self._apply_recalculate_subsection_grade()
+
+            # a single recalculation is scheduled, after the coalescing window
+            assert not mock_update.called
+            mock_task_apply.assert_called_once()
+            assert mock_task_apply.call_args[1]['countdown'] == RECALCULATE_GRADE_COALESCING_WINDOW_SECONDS
+            recalculate_subsection_grade_v3.apply(kwargs=mock_task_apply.call_args[1]['kwargs'])
+            assert mock_update.call_count == 1
+
+            # the scores changed once the recalculation started schedule another one
+            self._apply_recalculate_subsection_grade()
+            assert mock_task_apply.call_count == 2
+
+    @patch('lms.djangoapps.grades.tasks._update_subsection_grades')
+    @patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.retry')
+    def test_coalesced_recalculation_db_not_updated(self, mock_retry, mock_update):
+        self.set_up_course()
+        self.recalculate_subsection_grade_kwargs['coalesce'] = True
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async') as mock_task_apply:
+            self._apply_recalculate_subsection_grade(mock_score=None)
+
+        self._assert_retry_called(mock_retry)
+        assert not mock_task_apply.called
+        assert not mock_update.called
+
     def _apply_recalculate_subsection_grade(
             self,
             mock_score=MagicMock(
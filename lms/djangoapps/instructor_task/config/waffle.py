@@ -36,6 +36,22 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, split the enrolled learners into shards that
+#   are graded by parallel celery subtasks. Each completed shard is checkpointed to the report store, so a
+#   retried subtask or re-run task only grades the shards that are not complete yet, and the shards are
+#   merged into the final report once they are all complete.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-16
+# .. toggle_target_removal_date: 2027-04-16
+# .. toggle_warnings: Shards are checkpointed in the GRADES_DOWNLOAD report store, under a directory that is
+#   removed once the report is merged.
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
 
 def optimize_get_learners_switch_enabled():
     """
@@ -69,3 +85,11 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if course grade reports should be generated
+    in parallel shards by celery subtasks, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
@@ -16,3 +16,10 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+
+class IncompleteGradeReportError(Exception):
+    """
+    Error signaling that shards of a sharded grade report are missing,
+    so that the shards cannot be merged into the report.
+    """
@@ -209,7 +209,7 @@ class SubtaskStatus:
         return str(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, extra_subtask_info=None):
     """
     Store initial subtask information to InstructorTask object.
 
@@ -238,6 +238,9 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
     Monitoring code should assume that if an InstructorTask has subtask information, that it should
     rely on the status stored in the InstructorTask object, rather than status stored in the
     corresponding AsyncResult.
+
+    The optional `extra_subtask_info` dict is stored in the "subtasks" field along with the counters,
+    for tasks that need to recover the arguments of their subtasks (e.g. to re-queue them).
     """
     task_progress = {
         'action_name': action_name,
@@ -263,6 +266,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'failed': 0,
         'status': subtask_status
     }
+    if extra_subtask_info:
+        subtask_dict.update(extra_subtask_info)
     entry.subtasks = json.dumps(subtask_dict)
 
     # and save the entry immediately, before any subtasks actually start work:
@@ -21,17 +21,28 @@ of the query for traversing StudentModule objects.
 """
 
 import logging
+import traceback
 from functools import partial
 
 from celery import shared_task
+from celery.exceptions import Retry
+from celery.states import FAILURE, RETRY, SUCCESS
 from django.utils.translation import gettext_noop
 from edx_django_utils.monitoring import set_code_owner_attribute
 
 from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.exceptions import DuplicateTaskException, IncompleteGradeReportError
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    ShardedCourseGradeReport
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -53,6 +64,11 @@ from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Maximum number of retries, and delay in seconds before retrying, of the
+# subtasks of sharded course grade reports.
+GRADE_REPORT_SUBTASK_MAX_RETRIES = 3
+GRADE_REPORT_SUBTASK_RETRY_DELAY = 60
+
 
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
@@ -197,6 +213,100 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task(
+    bind=True,
+    default_retry_delay=GRADE_REPORT_SUBTASK_RETRY_DELAY,
+    max_retries=GRADE_REPORT_SUBTASK_MAX_RETRIES,
+)
+@set_code_owner_attribute
+def calculate_grades_csv_shard(self, entry_id, xblock_instance_args, shard_index, subtask_status_dict):
+    """
+    Grade a shard of the learners of a sharded course grade report, and queue
+    the merge of the report's shards once they are all done.
+    """
+    def grade_shard():
+        report = ShardedCourseGradeReport.for_subtask(xblock_instance_args, entry_id)
+        return report.grade_shard(shard_index)
+
+    try:
+        subtask_status = _run_grade_report_subtask(
+            self, entry_id, subtask_status_dict, grade_shard, (entry_id, xblock_instance_args, shard_index)
+        )
+    finally:
+        # Also merge after the shard failed, so that the report's failure is recorded.
+        ShardedCourseGradeReport.queue_merge_if_ready(entry_id, xblock_instance_args)
+    return subtask_status.to_dict()
+
+
+@shared_task(
+    bind=True,
+    default_retry_delay=GRADE_REPORT_SUBTASK_RETRY_DELAY,
+    max_retries=GRADE_REPORT_SUBTASK_MAX_RETRIES,
+)
+@set_code_owner_attribute
+def merge_grades_csv_shards(self, entry_id, xblock_instance_args, subtask_status_dict):
+    """
+    Merge the shards of a sharded course grade report and push the report
+    to an S3 bucket for download.
+    """
+    def merge_shards():
+        report = ShardedCourseGradeReport.for_subtask(xblock_instance_args, entry_id)
+        report.merge_shards()
+        return 0, 0
+
+    try:
+        # Incomplete shards stay incomplete, so the merge isn't retried when some are missing.
+        subtask_status = _run_grade_report_subtask(
+            self, entry_id, subtask_status_dict, merge_shards, (entry_id, xblock_instance_args),
+            no_retry_exceptions=(IncompleteGradeReportError,),
+        )
+    except (Retry, DuplicateTaskException):
+        raise
+    except Exception as exc:
+        # The report could not be generated, which is recorded as the failure of the whole task.
+        entry = InstructorTask.objects.get(pk=entry_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+        entry.save_now()
+        raise
+    return subtask_status.to_dict()
+
+
+def _run_grade_report_subtask(task, entry_id, subtask_status_dict, subtask_fcn, retry_args, no_retry_exceptions=()):
+    """
+    Runs `subtask_fcn`, which returns the numbers of succeeded and failed rows
+    of a subtask of a sharded course grade report, and records the subtask's
+    status in the InstructorTask.
+
+    The subtask is retried with `retry_args`, followed by its current status,
+    when `subtask_fcn` raises an exception, and its status is FAILURE once its
+    retries are exhausted or when the exception is one of `no_retry_exceptions`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        succeeded, failed = subtask_fcn()
+    except Exception as exc:
+        if task.request.retries < task.max_retries and not isinstance(exc, no_retry_exceptions):
+            TASK_LOG.warning(
+                "Subtask %s of instructor task %s failed, retrying", current_task_id, entry_id, exc_info=True
+            )
+            subtask_status.increment(retried_withmax=1, state=RETRY)
+            update_subtask_status(entry_id, current_task_id, subtask_status)
+            raise task.retry(args=(*retry_args, subtask_status.to_dict()), exc=exc)
+
+        TASK_LOG.exception("Subtask %s of instructor task %s failed", current_task_id, entry_id)
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
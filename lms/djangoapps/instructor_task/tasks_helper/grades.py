@@ -3,15 +3,19 @@ Functionality for generating grade reports.
 """
 
 import csv
+import io
+import json
 import logging
 import re
 from collections import OrderedDict, defaultdict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, islice
 from tempfile import TemporaryFile
 
 from time import time
+from uuid import uuid4
 
+from celery.states import READY_STATES
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from lazy import lazy
@@ -22,20 +26,24 @@ from six.moves import zip_longest
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.roles import BulkRoleCache
+from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import context as grades_context
-from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_grade_reporting,
 )
+from lms.djangoapps.instructor_task.exceptions import IncompleteGradeReportError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, initialize_subtask_info
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -272,7 +280,6 @@ class _CourseGradeBulkContext:  # lint-amnesty, pylint: disable=missing-class-do
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
-        prefetch_course_and_subsection_grades(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -443,27 +450,39 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_learners_filter_kwargs(self):
         """
-        Returns a generator of batches of users.
+        Returns the filter kwargs of the users included in this report.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return filter_kwargs
+
+    def _batch_users(self, first_user_id=None, last_user_id=None):
+        """
+        Returns a generator of batches of users, optionally limited to the
+        users whose ids are within the given (inclusive) range.
         """
         def grouper(iterable, chunk_size=100, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course(filter_kwargs):
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+            user_ids_query = get_user_model().objects.filter(**filter_kwargs)
+            if first_user_id is not None:
+                user_ids_query = user_ids_query.filter(id__gte=first_user_id)
+            if last_user_id is not None:
+                user_ids_query = user_ids_query.filter(id__lte=last_user_id)
 
-            user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            user_ids_list = user_ids_query.values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
@@ -477,10 +496,7 @@ class GradeReportBase:
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
-        )
+        return get_enrolled_learners_for_course(self._enrolled_learners_filter_kwargs())
 
     def log_additional_info_for_testing(self, message):
         """
@@ -496,11 +512,12 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, first_user_id=None, last_user_id=None):
         """
-        A generator of batches of (success_rows, error_rows) for this report.
+        A generator of batches of (success_rows, error_rows) for this report,
+        optionally limited to the users whose ids are within the given range.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(first_user_id, last_user_id):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -519,7 +536,10 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                entry = InstructorTask.objects.get(pk=_entry_id)
+                return ShardedCourseGradeReport(context, entry).queue_shards(_xblock_instance_args)
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryCourseGradeReport(context)._generate()  # pylint: disable=protected-access
@@ -570,6 +590,7 @@ class CourseGradeReport(GradeReportBase):
                 course=self.context.course,
                 collected_block_structure=self.context.course_structure,
                 course_key=self.context.course_id,
+                bulk_read=True,
             ):
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
@@ -706,6 +727,246 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course grade report whose learners are split into shards of contiguous
+    user ids, that are graded in parallel by celery subtasks and then merged
+    into the report.
+
+    Each shard's rows are checkpointed to the report store, under a directory
+    of the InstructorTask that is not listed in the instructor dashboard, so
+    that a retried shard subtask, or a re-run of the report's task, does not
+    grade the complete shards again. The shard subtask that completes last
+    queues the merge subtask, which streams the shards' rows into the report
+    and removes the shards.
+    """
+    # Number of learners graded by each shard subtask. Shards are the unit of
+    # progress that is kept when a subtask is retried.
+    USERS_PER_SHARD = 2000
+
+    # Directory of the report store in which shards are checkpointed.
+    SHARDS_DIR = 'grade_report_shards'
+
+    def __init__(self, context, entry):
+        super().__init__(context)
+        self.entry = entry
+        self.report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    @classmethod
+    def for_subtask(cls, xblock_instance_args, entry_id):
+        """
+        Returns the report of the given InstructorTask, for use by its subtasks.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        task_output = json.loads(entry.task_output)
+        context = _CourseGradeReportContext(
+            xblock_instance_args, entry_id, entry.course_id, json.loads(entry.task_input), task_output['action_name']
+        )
+        return cls(context, entry)
+
+    def queue_shards(self, xblock_instance_args):
+        """
+        Queues a subtask for each shard that is not complete yet, and returns
+        the progress of the report.
+
+        If the report's task is run again for the same InstructorTask (e.g.
+        when celery requeues it), the shards defined by the first run are
+        resumed instead of being defined again.
+        """
+        # Imported here, since the tasks module imports this one.
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+        if self.entry.subtasks:
+            self.context.update_status('ShardedCourseGradeReport - 1: Resuming grade report shards')
+            progress = json.loads(self.entry.task_output)
+        else:
+            self.context.update_status('ShardedCourseGradeReport - 1: Defining grade report shards')
+            shards = self._define_shards()
+            merge_task_id = str(uuid4())
+            with outer_atomic():
+                progress = initialize_subtask_info(
+                    self.entry,
+                    self.context.action_name,
+                    sum(shard['num_users'] for shard in shards),
+                    [shard['task_id'] for shard in shards] + [merge_task_id],
+                    extra_subtask_info={'shards': shards, 'merge_task_id': merge_task_id},
+                )
+
+        subtask_dict = json.loads(self.entry.subtasks)
+        num_queued = 0
+        for shard_index, shard in enumerate(subtask_dict['shards']):
+            subtask_status = SubtaskStatus.from_dict(subtask_dict['status'][shard['task_id']])
+            if subtask_status.state not in READY_STATES:
+                calculate_grades_csv_shard.apply_async(
+                    (self.entry.id, xblock_instance_args, shard_index, subtask_status.to_dict()),
+                    task_id=shard['task_id'],
+                )
+                num_queued += 1
+
+        if not num_queued:
+            # There are no shards (no learners are enrolled), or they are all
+            # complete, so nothing else would queue the merge.
+            self.queue_merge_if_ready(self.entry.id, xblock_instance_args)
+
+        self.context.update_status(f'ShardedCourseGradeReport - 2: Queued {num_queued} grade report shards')
+        return progress
+
+    @classmethod
+    def queue_merge_if_ready(cls, entry_id, xblock_instance_args):
+        """
+        Queues the merge subtask of the given InstructorTask once all of its
+        shard subtasks are done. Duplicates of the merge subtask are rejected
+        by the subtask itself.
+        """
+        # Imported here, since the tasks module imports this one.
+        from lms.djangoapps.instructor_task.tasks import merge_grades_csv_shards
+
+        subtask_dict = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+        subtask_status_info = subtask_dict['status']
+        if any(subtask_status_info[shard['task_id']]['state'] not in READY_STATES for shard in subtask_dict['shards']):
+            return
+
+        merge_task_id = subtask_dict['merge_task_id']
+        subtask_status = SubtaskStatus.from_dict(subtask_status_info[merge_task_id])
+        if subtask_status.state not in READY_STATES:
+            merge_grades_csv_shards.apply_async(
+                (entry_id, xblock_instance_args, subtask_status.to_dict()),
+                task_id=merge_task_id,
+            )
+
+    def grade_shard(self, shard_index):
+        """
+        Grades the learners of the given shard and checkpoints their rows to
+        the report store, unless the shard is already complete.
+
+        Returns the numbers of succeeded and failed rows of the shard.
+        """
+        shard = json.loads(self.entry.subtasks)['shards'][shard_index]
+        success_filename, error_filename = self._shard_filenames(shard_index)
+
+        if self.report_store.storage.exists(self._shard_path(success_filename)):
+            TASK_LOG.info('%s, Grade report shard %s is already complete', self.context.task_info_string, shard_index)
+            return self._count_shard_rows(success_filename), self._count_shard_rows(error_filename)
+
+        batched_rows = self._batched_rows(shard['first_user_id'], shard['last_user_id'])
+        with modulestore().bulk_operations(self.context.course_id):
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                self.iter_and_write_batched_rows(batched_rows, success_file, error_file)
+                # The success file is stored last, since it marks the shard as complete.
+                self._store_shard_file(error_filename, error_file)
+                self._store_shard_file(success_filename, success_file)
+
+        TASK_LOG.info(
+            '%s, Grade report shard %s completed: %s',
+            self.context.task_info_string, shard_index, self.context.task_progress.state,
+        )
+        return self.context.task_progress.succeeded, self.context.task_progress.failed
+
+    def merge_shards(self):
+        """
+        Merges the rows of all the shards into the report, uploads it and
+        removes the shards.
+
+        Raises IncompleteGradeReportError if any shard is not complete.
+        """
+        num_shards = len(json.loads(self.entry.subtasks)['shards'])
+        shard_filenames = [self._shard_filenames(shard_index) for shard_index in range(num_shards)]
+        missing_shards = [
+            shard_index for shard_index, (success_filename, _) in enumerate(shard_filenames)
+            if not self.report_store.storage.exists(self._shard_path(success_filename))
+        ]
+        if missing_shards:
+            raise IncompleteGradeReportError(f'Grade report shards {missing_shards} are not complete')
+
+        with modulestore().bulk_operations(self.context.course_id):
+            success_headers = self._success_headers()
+            error_headers = self._error_headers()
+
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            success_writer = csv.writer(success_file)
+            error_writer = csv.writer(error_file)
+            success_writer.writerow(success_headers)
+            error_writer.writerow(error_headers)
+
+            has_errors = False
+            for success_filename, error_filename in shard_filenames:
+                success_writer.writerows(self._iter_shard_rows(success_filename))
+                for error_row in self._iter_shard_rows(error_filename):
+                    error_writer.writerow(error_row)
+                    has_errors = True
+
+            self.upload_temp_files(success_file, error_file, has_errors)
+
+        for filename in chain.from_iterable(shard_filenames):
+            self.report_store.storage.delete(self._shard_path(filename))
+        TASK_LOG.info('%s, Merged %s grade report shards', self.context.task_info_string, num_shards)
+
+    def _define_shards(self):
+        """
+        Returns the list of shards of the learners included in this report,
+        each a dict of the subtask id, the range of user ids and the number of
+        users of the shard.
+        """
+        user_ids = iter(
+            get_user_model().objects.filter(
+                **self._enrolled_learners_filter_kwargs()
+            ).values_list('id', flat=True).order_by('id').iterator()
+        )
+        shards = []
+        shard_user_ids = list(islice(user_ids, self.USERS_PER_SHARD))
+        while shard_user_ids:
+            shards.append({
+                'task_id': str(uuid4()),
+                'first_user_id': shard_user_ids[0],
+                'last_user_id': shard_user_ids[-1],
+                'num_users': len(shard_user_ids),
+            })
+            shard_user_ids = list(islice(user_ids, self.USERS_PER_SHARD))
+        return shards
+
+    def _shard_filenames(self, shard_index):
+        """
+        Returns the filenames of the success and error rows of the given shard.
+        """
+        return f'shard_{shard_index:05d}.csv', f'shard_{shard_index:05d}_err.csv'
+
+    def _shard_path(self, filename):
+        """
+        Returns the path of the given shard file in the report store.
+        """
+        return self.report_store.path_to(self.context.course_id, filename, self._shards_dir)
+
+    @property
+    def _shards_dir(self):
+        return f'{self.SHARDS_DIR}/{self.entry.task_id}'
+
+    def _store_shard_file(self, filename, shard_file):
+        """
+        Stores the given shard file in the report store, replacing any partial
+        file left by a previous attempt.
+        """
+        path = self._shard_path(filename)
+        if self.report_store.storage.exists(path):
+            self.report_store.storage.delete(path)
+        shard_file.seek(0)
+        self.report_store.store(self.context.course_id, filename, shard_file, self._shards_dir)
+
+    def _iter_shard_rows(self, filename):
+        """
+        Yields the rows of the given shard file, without its header.
+        """
+        with self.report_store.storage.open(self._shard_path(filename)) as shard_file:
+            rows = csv.reader(io.TextIOWrapper(shard_file, encoding='utf-8', newline=''))
+            next(rows, None)
+            yield from rows
+
+    def _count_shard_rows(self, filename):
+        """
+        Returns the number of rows of the given shard file.
+        """
+        return sum(1 for _ in self._iter_shard_rows(filename))
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -755,6 +1016,7 @@ class ProblemGradeReport(GradeReportBase):
             course=self.context.course,
             collected_block_structure=self.context.course_structure,
             course_key=self.context.course_id,
+            bulk_read=True,
         ):
             if not course_grade:
                 err_msg = str(error)
@@ -8,7 +8,9 @@ import logging
 from time import time
 
 from django.utils.translation import gettext_noop
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import UsageKey
+from xblock.fields import Scope
 from xblock.scorable import Score
 
 from xmodule.capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
@@ -17,8 +19,8 @@ from common.djangoapps.track.event_transaction_utils import create_new_event_tra
 from common.djangoapps.track.views import task_track
 from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.courseware.courses import get_problems_in_section
-from lms.djangoapps.courseware.model_data import FieldDataCache
-from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.model_data import FieldDataCache, MultiUserFieldDataCache
+from lms.djangoapps.courseware.models import StudentModule, chunks
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
 from lms.djangoapps.grades.api import events as grades_events
 from openedx.core.lib.courses import get_course_by_id
@@ -30,6 +32,10 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Number of learners whose field data is loaded at once when updating module state.
+USER_CHUNK_SIZE = 500
+FIELD_DATA_CACHE_NAMESPACE = 'instructor_task.module_state.field_data'
+
 
 def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
     """
@@ -88,26 +94,88 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        block = problems[str(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(block, module_to_update, task_input)
-        if update_status == UPDATE_STATUS_SUCCEEDED:
-            # If the update_fcn returns true, then it performed some kind of work.
-            # Logging of failures is left to the update_fcn itself.
-            task_progress.succeeded += 1
-        elif update_status == UPDATE_STATUS_FAILED:
-            task_progress.failed += 1
-        elif update_status == UPDATE_STATUS_SKIPPED:
-            task_progress.skipped += 1
-        else:
-            raise UpdateProblemModuleStateError(f"Unexpected update_status returned: {update_status}")
+    try:
+        for modules_chunk in chunks(modules_to_update, USER_CHUNK_SIZE):
+            # The field data needed by the update_fcn is loaded for all the
+            # learners of the chunk at once.
+            _prefetch_field_data_for_users(module.student for module in modules_chunk)
+
+            for module_to_update in modules_chunk:
+                task_progress.attempted += 1
+                block = problems[str(module_to_update.module_state_key)]
+                # There is no try here:  if there's an error, we let it throw, and the task will
+                # be marked as FAILED, with a stack trace.
+                update_status = update_fcn(block, module_to_update, task_input)
+                _record_updated_module(module_to_update)
+                if update_status == UPDATE_STATUS_SUCCEEDED:
+                    # If the update_fcn returns true, then it performed some kind of work.
+                    # Logging of failures is left to the update_fcn itself.
+                    task_progress.succeeded += 1
+                elif update_status == UPDATE_STATUS_FAILED:
+                    task_progress.failed += 1
+                elif update_status == UPDATE_STATUS_SKIPPED:
+                    task_progress.skipped += 1
+                else:
+                    raise UpdateProblemModuleStateError(f"Unexpected update_status returned: {update_status}")
+    finally:
+        RequestCache(FIELD_DATA_CACHE_NAMESPACE).clear()
 
     return task_progress.update_task_state()
 
 
+def _prefetch_field_data_for_users(users):
+    """
+    Set the learners whose modules are being updated, so that the field data
+    needed to update their modules is loaded for all of them at once, on first use.
+    """
+    request_cache = RequestCache(FIELD_DATA_CACHE_NAMESPACE)
+    request_cache.clear()
+    request_cache.set('users', {user.id: user for user in users})
+
+
+def _record_updated_module(student_module):
+    """
+    Record that the state of `student_module` may have been written by the task,
+    so that its prefetched copy is no longer used.
+    """
+    updated_modules = RequestCache(FIELD_DATA_CACHE_NAMESPACE).data.setdefault('updated_modules', set())
+    updated_modules.add((student_module.student_id, student_module.module_state_key))
+
+
+def _get_field_data_cache(course_id, student, block):
+    """
+    Return the FieldDataCache of `student` for `block` and its descendants,
+    using the field data prefetched for all the learners being updated if
+    `student` is one of them.
+    """
+    request_cache = RequestCache(FIELD_DATA_CACHE_NAMESPACE)
+    users = request_cache.get_cached_response('users')
+    if not users.is_found or student.id not in users.value:
+        return FieldDataCache.cache_for_block_descendents(course_id, student, block)
+
+    cache_key = str(block.location)
+    cached_response = request_cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        multi_user_field_data_cache = cached_response.value
+    else:
+        multi_user_field_data_cache = MultiUserFieldDataCache.cache_for_block_descendents(
+            course_id, list(users.value.values()), block,
+        )
+        request_cache.set(cache_key, multi_user_field_data_cache)
+
+    # Only the state that the task itself updated since it was prefetched is
+    # reloaded, e.g. when a block is in the subtrees of several updated problems.
+    field_data_cache = multi_user_field_data_cache.for_user(student)
+    updated_modules = request_cache.data.get('updated_modules', ())
+    updated_blocks = [
+        cached_block for cached_block in multi_user_field_data_cache.blocks
+        if (student.id, cached_block.location) in updated_modules
+    ]
+    if updated_blocks:
+        field_data_cache.cache[Scope.user_state].cache_fields([], updated_blocks, [])
+    return field_data_cache
+
+
 @outer_atomic
 def rescore_problem_module_state(xblock_instance_args, block, student_module, task_input):
     '''
@@ -354,7 +422,7 @@ def _get_module_instance_for_task(course_id, student, block, xblock_instance_arg
         user=student,
         request=None,
         block=block,
-        field_data_cache=FieldDataCache.cache_for_block_descendents(course_id, student, block),
+        field_data_cache=_get_field_data_cache(course_id, student, block),
         course_key=course_id,
         track_function=make_track_function(),
         grade_bucket_type=grade_bucket_type,
@@ -421,7 +489,7 @@ def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn
     if student:
         module_query_params['student_id'] = student.id
 
-    student_modules = StudentModule.get_state_by_params(**module_query_params)
+    student_modules = StudentModule.get_state_by_params(**module_query_params).select_related('student')
     if filter_fcn is not None:
         student_modules = filter_fcn(student_modules)
 
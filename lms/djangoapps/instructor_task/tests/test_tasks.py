@@ -13,9 +13,13 @@ import pytest
 import ddt
 from celery.states import FAILURE, SUCCESS
 from django.utils.translation import gettext_noop
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from opaque_keys.edx.keys import i4xEncoder
+from xblock.fields import Scope
 
 from common.djangoapps.course_modes.models import CourseMode
+from lms.djangoapps.courseware.model_data import DjangoKeyValueStore
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
@@ -30,8 +34,10 @@ from lms.djangoapps.instructor_task.tasks import (
     rescore_problem,
     reset_problem_attempts
 )
+from lms.djangoapps.instructor_task.tasks_helper import module_state
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
+from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 
 PROBLEM_URL_NAME = "test_urlname"
@@ -489,6 +495,45 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    @ddt.data(1, 10)
+    def test_field_data_queries(self, num_students):
+        """
+        Tests that the field data of the learners being rescored is loaded once for all
+        of them, and that only the state updated by the task itself is reloaded.
+        """
+        # pylint: disable=protected-access
+        students = self._create_students_with_state(num_students, json.dumps({'attempts': 1}))
+        problem = modulestore().get_item(self.location)
+        module_state._prefetch_field_data_for_users(students)
+
+        def get_attempts(student):
+            """
+            Returns the attempts of the student in the field data handed out for the problem.
+            """
+            field_data_cache = module_state._get_field_data_cache(self.course.id, student, problem)
+            attempts_key = DjangoKeyValueStore.Key(Scope.user_state, student.id, self.location, 'attempts')
+            return field_data_cache.get(attempts_key)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_attempts(students[0]) == 1
+        # The state of all the learners is loaded with a single query
+        assert len([query for query in queries if 'courseware_studentmodule' in query['sql']]) == 1
+        with self.assertNumQueries(0):
+            for student in students:
+                assert get_attempts(student) == 1
+
+        StudentModule.objects.filter(student=students[0], module_state_key=self.location).update(
+            state=json.dumps({'attempts': 2})
+        )
+        module_state._record_updated_module(
+            StudentModule.objects.get(student=students[0], module_state_key=self.location)
+        )
+        with self.assertNumQueries(1):
+            assert get_attempts(students[0]) == 2
+        if num_students > 1:
+            with self.assertNumQueries(0):
+                assert get_attempts(students[1]) == 1
+
 
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
     """Tests instructor task that resets problem attempts."""
@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,6 +15,7 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
@@ -21,6 +23,7 @@ import unicodecsv
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
+from celery.states import FAILURE, SUCCESS
 from freezegun import freeze_time
 from pytz import UTC
 
@@ -46,6 +49,7 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -54,6 +58,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -82,6 +87,7 @@ _TEAMS_CONFIG = TeamsConfig({
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
 
 
 class InstructorGradeReportTestCase(TestReportMixin, InstructorTaskCourseTestCase):
@@ -433,6 +439,76 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
 
 
 @ddt.ddt
+@patch.object(ShardedCourseGradeReport, 'USERS_PER_SHARD', 2)
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+class TestShardedCourseGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that course grade reports can be generated in shards.
+    """
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{index}') for index in range(3)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_input=json.dumps({}),
+        )
+
+    def _generate(self):
+        """
+        Generates the report of the test entry in shards, and returns the refreshed entry.
+        """
+        with patch(USE_SHARDED_GRADE_REPORT, return_value=True):
+            CourseGradeReport.generate(None, self.entry.id, self.course.id, {}, 'graded')
+        self.entry.refresh_from_db()
+        return self.entry
+
+    def test_sharded_report(self):
+        entry = self._generate()
+
+        assert entry.task_state == SUCCESS
+        self.assertDictContainsSubset({'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+        assert json.loads(entry.subtasks)['succeeded'] == 3  # two shards and the merge
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        assert len(links) == 1
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            usernames = [row['Username'] for row in unicodecsv.DictReader(csv_file)]
+        assert usernames == [student.username for student in self.students]
+
+        # The shards are removed once merged.
+        shards_dir = report_store.path_to(self.course.id, parent_dir=f'grade_report_shards/{entry.task_id}')
+        assert not report_store.storage.listdir(shards_dir)[1]
+
+    def test_shard_checkpoint(self):
+        with patch('lms.djangoapps.instructor_task.tasks.calculate_grades_csv_shard.apply_async') as mock_apply:
+            with patch(USE_SHARDED_GRADE_REPORT, return_value=True):
+                CourseGradeReport.generate(None, self.entry.id, self.course.id, {}, 'graded')
+        assert mock_apply.call_count == 2
+
+        report = ShardedCourseGradeReport.for_subtask(None, self.entry.id)
+        assert report.grade_shard(0) == (2, 0)
+
+        # A retried shard is not graded again once it is complete.
+        with patch.object(ShardedCourseGradeReport, '_batched_rows') as mock_batched_rows:
+            report = ShardedCourseGradeReport.for_subtask(None, self.entry.id)
+            assert report.grade_shard(0) == (2, 0)
+        mock_batched_rows.assert_not_called()
+
+    def test_failed_shard(self):
+        with patch.object(ShardedCourseGradeReport, '_rows_for_users', side_effect=Exception('Cannot grade')):
+            with patch('lms.djangoapps.instructor_task.tasks.merge_grades_csv_shards.retry') as mock_merge_retry:
+                entry = self._generate()
+
+        # The merge fails without being retried, since the failed shards won't complete.
+        mock_merge_retry.assert_not_called()
+        assert entry.task_state == FAILURE
+        assert json.loads(entry.task_output)['exception'] == 'IncompleteGradeReportError'
+        assert not ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id)
+
+
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
 
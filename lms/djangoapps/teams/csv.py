@@ -9,6 +9,7 @@ from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imp
 from django.db.models import Prefetch
 
 from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.roles import BulkRoleCache
 from lms.djangoapps.program_enrollments.models import ProgramCourseEnrollment
 from lms.djangoapps.teams.api import (
     ORGANIZATION_PROTECTED_MODES,
@@ -195,8 +196,13 @@ class TeamMembershipImportManager:
         self.load_course_team_memberships()
         self.load_course_teams()
 
+        # Load the course roles of the users checked for staff privileges in one query
+        rows = list(csv_reader)
+        csv_users = User.objects.filter(username__in=[row['username'] for row in rows if row['username']])
+        BulkRoleCache.prefetch(list(csv_users), org=self.course.id.org)
+
         # process student rows:
-        for row in csv_reader:
+        for row in rows:
             if not self.validate_teams_have_matching_teamsets(row):
                 return False
             username = row['username']
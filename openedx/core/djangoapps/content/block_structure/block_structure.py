@@ -31,6 +31,11 @@ class _BlockRelations:
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
+
+    Block structures keep their relations in a _BlockGraph; this
+    structure is only used to exchange relations keyed by usage key,
+    as with BlockStructureFactory.create_new and the legacy storage
+    format.
     """
     def __init__(self):
 
@@ -43,6 +48,190 @@ class _BlockRelations:
         self.children = []
 
 
+class _BlockGraph:
+    """
+    Data structure for the existence of blocks and their relations.
+
+    Usage keys are interned as dense integer ids when their blocks are
+    added, and the parents and children of each block are kept as lists
+    of ids in arrays indexed by id.  Traversals and removals therefore
+    only hash and compare integers, and usage keys are only hashed when
+    crossing the public interface of the block structure.
+
+    The ids of removed blocks are not reused until the graph is
+    compacted (see BlockStructure._prune_unreachable); their slots keep
+    their usage key and empty relations.
+    """
+    __slots__ = ('keys', 'ids', 'parents', 'children')
+
+    def __init__(self):
+        # Usage key of each block, indexed by id.
+        # list [UsageKey]
+        self.keys = []
+
+        # Map of the usage key of each block in the graph to its id. The
+        # existence of a block is determined by its presence in this map.
+        # dict {UsageKey: int}
+        self.ids = {}
+
+        # Ids of the parents and children of each block, indexed by id.
+        # list [list [int]]
+        self.parents = []
+        self.children = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_relations(cls, block_relations):
+        """
+        Returns a new graph with the blocks and relations in the given
+        map of usage keys to _BlockRelations.
+        """
+        graph = cls()
+        keys, ids = graph.keys, graph.ids
+        keys.extend(block_relations)
+        for block_id, usage_key in enumerate(keys):
+            ids[usage_key] = block_id
+
+        def get_id(usage_key):
+            """
+            Returns the id of the given related block. Blocks that have no
+            entry of their own in the map are related without being part of
+            the graph, as they were in the map.
+            """
+            block_id = ids.get(usage_key)
+            if block_id is None:
+                block_id = ids[usage_key] = len(keys)
+                keys.append(usage_key)
+                missing_ids.append(block_id)
+            return block_id
+
+        missing_ids = []
+        graph.parents = [[get_id(key) for key in relations.parents] for relations in block_relations.values()]
+        graph.children = [[get_id(key) for key in relations.children] for relations in block_relations.values()]
+        for block_id in missing_ids:
+            del ids[keys[block_id]]
+            graph.parents.append([])
+            graph.children.append([])
+        return graph
+
+    def to_relations(self):
+        """
+        Returns a new map of the usage key of each block to its
+        _BlockRelations.
+        """
+        keys = self.keys
+        block_relations = {}
+        new_relations = _BlockRelations.__new__
+        for usage_key, block_id in self.ids.items():
+            relations = new_relations(_BlockRelations)
+            relations.parents = [keys[parent_id] for parent_id in self.parents[block_id]]
+            relations.children = [keys[child_id] for child_id in self.children[block_id]]
+            block_relations[usage_key] = relations
+        return block_relations
+
+    def copy(self):
+        """
+        Returns a copy of this graph, sharing its usage keys.
+        """
+        graph = _BlockGraph()
+        graph.keys = list(self.keys)
+        graph.ids = dict(self.ids)
+        graph.parents = [list(parent_ids) for parent_ids in self.parents]
+        graph.children = [list(child_ids) for child_ids in self.children]
+        return graph
+
+    def add_block(self, usage_key):
+        """
+        Adds the block with the given usage key, if it's not in the
+        graph yet, and returns its id.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            block_id = len(self.keys)
+            self.ids[usage_key] = block_id
+            self.keys.append(usage_key)
+            self.parents.append([])
+            self.children.append([])
+        return block_id
+
+    def add_relation(self, parent_id, child_id):
+        """
+        Adds a parent to child relationship between the given blocks.
+        """
+        self.parents[child_id].append(parent_id)
+        self.children[parent_id].append(child_id)
+
+    def remove_blocks(self, removed_ids, keep_descendants):
+        """
+        Removes the blocks with the given ids, updating the relations of
+        their parents and children in a single pass.
+
+        Arguments:
+            removed_ids (set(int)) - Ids of the blocks to remove.
+
+            keep_descendants (bool) - If True, the removed blocks are
+                replaced in the children of their parents by their own
+                children, recursively, and vice versa in the parents of
+                their children.
+        """
+        parents, children = self.parents, self.children
+        neighbor_ids = set()
+        for block_id in removed_ids:
+            neighbor_ids.update(parents[block_id])
+            neighbor_ids.update(children[block_id])
+        neighbor_ids.difference_update(removed_ids)
+
+        if keep_descendants:
+            expanded_children, expanded_parents = {}, {}
+            new_relations = [
+                (
+                    block_id,
+                    self._expand(parents[block_id], parents, removed_ids, expanded_parents),
+                    self._expand(children[block_id], children, removed_ids, expanded_children),
+                )
+                for block_id in neighbor_ids
+            ]
+        else:
+            new_relations = [
+                (
+                    block_id,
+                    [parent_id for parent_id in parents[block_id] if parent_id not in removed_ids],
+                    [child_id for child_id in children[block_id] if child_id not in removed_ids],
+                )
+                for block_id in neighbor_ids
+            ]
+
+        for block_id, parent_ids, child_ids in new_relations:
+            parents[block_id] = parent_ids
+            children[block_id] = child_ids
+
+        keys = self.keys
+        for block_id in removed_ids:
+            self.ids.pop(keys[block_id], None)
+            parents[block_id] = []
+            children[block_id] = []
+
+    @classmethod
+    def _expand(cls, block_ids, adjacency, removed_ids, expanded):
+        """
+        Returns the given block ids, with each removed block replaced by
+        its own expanded adjacent blocks, without duplicates.
+        """
+        if removed_ids.isdisjoint(block_ids):
+            return block_ids
+        expanded_ids = []
+        for block_id in block_ids:
+            if block_id not in removed_ids:
+                expanded_ids.append(block_id)
+                continue
+            if block_id not in expanded:
+                expanded[block_id] = cls._expand(adjacency[block_id], adjacency, removed_ids, expanded)
+            expanded_ids.extend(expanded[block_id])
+        return list(dict.fromkeys(expanded_ids))
+
+
 class BlockStructure:
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -59,14 +248,12 @@ class BlockStructure:
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
-        # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # Graph of the blocks in the structure and their relations.
+        # _BlockGraph
+        self._graph = _BlockGraph()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._graph.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -77,7 +264,22 @@ class BlockStructure:
         return self.get_block_keys()
 
     def __len__(self):
-        return len(self._block_relations)
+        return len(self._graph)
+
+    @property
+    def _block_relations(self):
+        """
+        Map of a block's usage key to its block relations, as of when
+        accessed. Changes to the returned map are not reflected in the
+        block structure.
+
+        dict {UsageKey: _BlockRelations}
+        """
+        return self._graph.to_relations()
+
+    @_block_relations.setter
+    def _block_relations(self, block_relations):
+        self._graph = _BlockGraph.from_relations(block_relations)
 
     #--- Block structure relation methods ---#
 
@@ -94,7 +296,12 @@ class BlockStructure:
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        graph = self._graph
+        block_id = graph.ids.get(usage_key)
+        if block_id is None:
+            return []
+        keys = graph.keys
+        return [keys[parent_id] for parent_id in graph.parents[block_id]]
 
     def get_children(self, usage_key):
         """
@@ -108,7 +315,12 @@ class BlockStructure:
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        graph = self._graph
+        block_id = graph.ids.get(usage_key)
+        if block_id is None:
+            return []
+        keys = graph.keys
+        return [keys[child_id] for child_id in graph.children[block_id]]
 
     def set_root_block(self, usage_key):
         """
@@ -123,7 +335,7 @@ class BlockStructure:
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._graph.parents[self._graph.ids[usage_key]] = []
 
     def __contains__(self, usage_key):
         """
@@ -138,7 +350,7 @@ class BlockStructure:
             bool - Whether or not a block with the given usage_key
                 is present in this block structure.
         """
-        return usage_key in self._block_relations
+        return usage_key in self._graph.ids
 
     def get_block_keys(self):
         """
@@ -148,7 +360,7 @@ class BlockStructure:
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
-        return iter(self._block_relations.keys())
+        return iter(self._graph.ids.keys())
 
     #--- Block structure traversal methods ---#
 
@@ -170,13 +382,17 @@ class BlockStructure:
             generator - A generator object created from the
                 traverse_topologically method.
         """
-        return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
-            get_parents=self.get_parents,
-            get_children=self.get_children,
-            filter_func=filter_func,
+        start_node = start_node or self.root_block_usage_key
+        graph = self._graph
+        if start_node not in graph.ids:
+            return self._traverse_missing_node(start_node, filter_func)
+        return self._keys_of(traverse_topologically(
+            start_node=graph.ids[start_node],
+            get_parents=graph.parents.__getitem__,
+            get_children=graph.children.__getitem__,
+            filter_func=self._id_filter(filter_func),
             yield_descendants_of_unyielded=yield_descendants_of_unyielded,
-        )
+        ))
 
     def post_order_traversal(
             self,
@@ -195,42 +411,75 @@ class BlockStructure:
             generator - A generator object created from the
                 traverse_post_order method.
         """
-        return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
-            get_children=self.get_children,
-            filter_func=filter_func,
-        )
+        start_node = start_node or self.root_block_usage_key
+        graph = self._graph
+        if start_node not in graph.ids:
+            return self._traverse_missing_node(start_node, filter_func)
+        return self._keys_of(traverse_post_order(
+            start_node=graph.ids[start_node],
+            get_children=graph.children.__getitem__,
+            filter_func=self._id_filter(filter_func),
+        ))
 
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
+    def _keys_of(self, block_ids):
+        """
+        Returns a generator of the usage keys of the given block ids.
+        """
+        keys = self._graph.keys
+        return (keys[block_id] for block_id in block_ids)
+
+    def _id_filter(self, filter_func):
+        """
+        Returns the given filter function on usage keys as a filter
+        function on block ids.
+        """
+        if filter_func is None:
+            return None
+        keys = self._graph.keys
+        return lambda block_id: filter_func(keys[block_id])
+
+    @staticmethod
+    def _traverse_missing_node(start_node, filter_func):
+        """
+        Traverses a start node that is not in the block structure, and
+        so has no children.
+        """
+        if filter_func is None or filter_func(start_node):
+            yield start_node
+
     def _prune_unreachable(self):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
+        # Create a new graph to store only those blocks that are still
+        # linked, with compacted ids.
+        pruned_graph = _BlockGraph()
+        old_graph = self._graph
+        root_id = old_graph.ids.get(self.root_block_usage_key)
 
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
+        if root_id is not None:
+            old_keys = old_graph.keys
+            old_children = old_graph.children
+            new_ids = {}
 
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
+            # Build the graph from the leaves up by doing a post-order
+            # traversal of the old graph, thereby encountering only
+            # reachable blocks.
+            for block_id in traverse_post_order(start_node=root_id, get_children=old_children.__getitem__):
+                new_id = pruned_graph.add_block(old_keys[block_id])
+                new_ids[block_id] = new_id
 
                 # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
+                # were also added to the new pruned graph.
+                for child_id in old_children[block_id]:
+                    if child_id in new_ids:
+                        pruned_graph.add_relation(new_id, new_ids[child_id])
 
-        # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        # Replace this structure's graph with the newly pruned one.
+        self._graph = pruned_graph
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -240,7 +489,9 @@ class BlockStructure:
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
+        graph = self._graph
+        parent_id = graph.add_block(parent_key)
+        graph.add_relation(parent_id, graph.add_block(child_key))
 
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
@@ -424,7 +675,7 @@ class BlockStructureBlockData(BlockStructure):
         from .factory import BlockStructureFactory
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
+            self._graph.copy(),
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
         )
@@ -620,26 +871,58 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
+        graph = self._graph
+        block_id = graph.ids[usage_key]
+        children = graph.children[block_id]
+        parents = graph.parents[block_id]
 
         # Remove block from its children.
         for child in children:
-            self._block_relations[child].parents.remove(usage_key)
+            graph.parents[child].remove(block_id)
 
         # Remove block from its parents.
         for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
+            graph.children[parent].remove(block_id)
 
         # Remove block.
-        self._block_relations.pop(usage_key, None)
+        del graph.ids[usage_key]
+        graph.parents[block_id] = []
+        graph.children[block_id] = []
         self._block_data_map.pop(usage_key, None)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
             for child in children:
                 for parent in parents:
-                    self._add_relation(parent, child)
+                    graph.add_relation(parent, child)
+
+    def remove_blocks(self, usage_keys, keep_descendants=False):
+        """
+        Removes the blocks identified by the given usage keys and all
+        of their related data from the block structure, updating the
+        relations of the remaining blocks in a single pass.
+
+        Unlike successive calls to remove_block, when descendants are
+        kept, the children of each removed block take its place among
+        the children of its parents, without duplicates.
+
+        Arguments:
+            usage_keys (iterable(UsageKey)) - Usage keys of the blocks
+                that are to be removed. Keys of blocks that are not in
+                the block structure are ignored.
+
+            keep_descendants (bool) - See the description in
+                remove_block.
+        """
+        ids = self._graph.ids
+        removed_ids = set()
+        for usage_key in usage_keys:
+            block_id = ids.get(usage_key)
+            if block_id is not None:
+                removed_ids.add(block_id)
+                self._block_data_map.pop(usage_key, None)
+        if removed_ids:
+            self._graph.remove_blocks(removed_ids, keep_descendants)
 
     def create_universal_filter(self):
         """
@@ -701,11 +984,27 @@ class BlockStructureBlockData(BlockStructure):
             keep_descendants (bool) - See the description in
                 remove_block.
         """
-        self.filter_topological_traversal(
-            filter_func=self.create_removal_filter(
-                removal_condition, keep_descendants
+        if keep_descendants:
+            self.filter_topological_traversal(
+                filter_func=self.create_removal_filter(
+                    removal_condition, keep_descendants
+                )
             )
-        )
+            return
+
+        # Without descendants to reconnect, the blocks can all be removed
+        # once the traversal is done: skipping the descendants of the
+        # blocks to remove has the same effect as removing them first.
+        removed_keys = []
+
+        def _retain_or_mark_removed(block_key):
+            if removal_condition(block_key):
+                removed_keys.append(block_key)
+                return False
+            return True
+
+        self.filter_topological_traversal(filter_func=_retain_or_mark_removed)
+        self.remove_blocks(removed_keys)
 
     def filter_topological_traversal(self, filter_func, **kwargs):
         """
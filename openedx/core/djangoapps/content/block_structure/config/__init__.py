@@ -31,6 +31,37 @@ STORAGE_BACKING_FOR_CACHE = WaffleSwitch(
     "block_structure.storage_backing_for_cache", __name__
 )
 
+# .. toggle_name: block_structure.columnar_serialization
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures are written to the cache and storage
+#   in the versioned columnar format (see block_structure/serialization.py) instead of a zpickled tuple.
+#   Both formats are always readable, so the switch can be flipped without clearing the cache.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-16
+# .. toggle_target_removal_date: 2027-04-16
+COLUMNAR_SERIALIZATION = WaffleSwitch(
+    "block_structure.columnar_serialization", __name__
+)
+
+# .. toggle_name: block_structure.incremental_collect
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, updating the collected block structure of a course after a publish
+#   re-collects only the blocks that changed since the stored version, their descendants and their
+#   ancestors, and merges them into the stored block structure. A full collect is still done whenever
+#   the stored version is unknown or any registered transformer does not support incremental collects.
+# .. toggle_warning: Depends on `block_structure.storage_backing_for_cache`, which records the version
+#   of the stored block structures, and only applies to courses in the split modulestore. All the
+#   transformers registered by edx-platform support incremental collects; a plugin transformer that does
+#   not makes every collect a full one.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-16
+# .. toggle_target_removal_date: 2027-04-16
+INCREMENTAL_COLLECT = WaffleSwitch(
+    "block_structure.incremental_collect", __name__
+)
+
 
 def enable_storage_backing_for_cache_in_request():
     """
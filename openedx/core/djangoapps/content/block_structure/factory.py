@@ -1,7 +1,7 @@
 """
 Module for factory class for BlockStructure objects.
 """
-from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData
+from .block_structure import BlockStructure, BlockStructureBlockData, BlockStructureModulestoreData, _BlockGraph
 
 
 class BlockStructureFactory:
@@ -57,6 +57,140 @@ class BlockStructureFactory:
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_partial_from_modulestore(cls, root_block_usage_key, modulestore, changed_block_ids, ancestor_block_ids):
+        """
+        Creates and returns a partial block structure from the modulestore
+        starting at the given root_block_usage_key, containing only the
+        changed blocks, all of their descendants and the given ancestors.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks within the block
+                structure starting at root_block_usage_key.
+
+            changed_block_ids (set((block_type, block_id))) - Identifiers
+                of the blocks whose subtrees are to be included.
+
+            ancestor_block_ids (set((block_type, block_id))) - Identifiers
+                of the blocks to include in order to reach the changed
+                blocks from the root.
+
+        Returns:
+            tuple (BlockStructureModulestoreData, dict) - The created
+                partial block structure, and a map of the usage key of
+                each included block to the (block_type, block_id)
+                identifiers of all of its children, whether included or
+                not.
+        """
+        block_structure = BlockStructureModulestoreData(root_block_usage_key)
+        children_ids = {}
+
+        def build_block_structure(xblock, in_changed_subtree):
+            """
+            Recursively update the partial block structure with the given
+            xBlock and its included descendants.
+            """
+            if xblock.location in children_ids:
+                return
+
+            block_structure._add_xblock(xblock.location, xblock)  # pylint: disable=protected-access
+
+            if in_changed_subtree:
+                # All descendants of a changed block are included.
+                children = xblock.get_children()
+                children_ids[xblock.location] = [_block_id(child.location) for child in children]
+            else:
+                # Only load the children that lead to changed blocks.
+                child_keys = getattr(xblock, 'children', None) or []
+                children_ids[xblock.location] = [_block_id(child_key) for child_key in child_keys]
+                children = [
+                    modulestore.get_item(child_key, depth=None if child_id in changed_block_ids else 0)
+                    for child_key, child_id in zip(child_keys, children_ids[xblock.location])
+                    if child_id in changed_block_ids or child_id in ancestor_block_ids
+                ]
+
+            for child in children:
+                block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
+                build_block_structure(
+                    child,
+                    in_changed_subtree or _block_id(child.location) in changed_block_ids,
+                )
+
+        root_id = _block_id(root_block_usage_key)
+        root_xblock = modulestore.get_item(root_block_usage_key, depth=None if root_id in changed_block_ids else 0)
+        build_block_structure(root_xblock, root_id in changed_block_ids)
+        return block_structure, children_ids
+
+    @classmethod
+    def create_merged(cls, previous_block_structure, partial_block_structure, children_ids):
+        """
+        Returns a new block structure merging a partial block structure,
+        collected for the changed blocks of a course, into the previously
+        collected block structure of the course.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure.
+
+            partial_block_structure (BlockStructureBlockData) - The
+                newly collected partial block structure, as created by
+                create_partial_from_modulestore.
+
+            children_ids (dict) - The map of children identifiers of the
+                blocks in the partial block structure, as returned by
+                create_partial_from_modulestore.
+
+        Raises:
+            KeyError if a child of a re-collected block is found in
+                neither block structure.
+        """
+        # pylint: disable=protected-access
+        key_by_id = {
+            _block_id(block_key): block_key
+            for block_structure in (previous_block_structure, partial_block_structure)
+            for block_key in block_structure
+        }
+        root_block_usage_key = partial_block_structure.root_block_usage_key
+        block_relations = {}
+        BlockStructure._add_block(block_relations, root_block_usage_key)
+
+        visited = set()
+
+        def build_relations(block_key):
+            """
+            Recursively rebuild the relations of the given block and its
+            descendants, in the same order as create_from_modulestore.
+            """
+            if block_key in visited:
+                return
+            visited.add(block_key)
+            if block_key in children_ids:
+                child_keys = [key_by_id[child_id] for child_id in children_ids[block_key]]
+            else:
+                child_keys = previous_block_structure.get_children(block_key)
+            for child_key in child_keys:
+                BlockStructure._add_to_relations(block_relations, block_key, child_key)
+                build_relations(child_key)
+
+        build_relations(root_block_usage_key)
+
+        block_data_map = {}
+        for block_key in block_relations:
+            source = partial_block_structure if block_key in children_ids else previous_block_structure
+            if block_key in source._block_data_map:
+                block_data_map[block_key] = source._block_data_map[block_key]
+
+        return cls.create_new(
+            root_block_usage_key,
+            block_relations,
+            partial_block_structure.transformer_data,
+            block_data_map,
+        )
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -89,9 +223,24 @@ class BlockStructureFactory:
     def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
         """
         Returns a new block structure for given the arguments.
+
+        The block relations are given either as a map of usage keys to
+        _BlockRelations, or as a _BlockGraph that is then owned by the
+        new block structure.
         """
         block_structure = BlockStructureBlockData(root_block_usage_key)
-        block_structure._block_relations = block_relations  # pylint: disable=protected-access
+        if isinstance(block_relations, _BlockGraph):
+            block_structure._graph = block_relations  # pylint: disable=protected-access
+        else:
+            block_structure._block_relations = block_relations  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
         block_structure._block_data_map = block_data_map  # pylint: disable=protected-access
         return block_structure
+
+
+def _block_id(usage_key):
+    """
+    Returns the (block_type, block_id) identifier of the given usage key,
+    which does not depend on the branch or version of its course key.
+    """
+    return usage_key.block_type, usage_key.block_id
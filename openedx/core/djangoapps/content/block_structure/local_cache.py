@@ -0,0 +1,187 @@
+"""
+Per-process in-memory cache of collected BlockStructures.
+
+Collected block structures are immutable for a given version of their
+stored data, so a worker that repeatedly serves the same course can skip
+the cache round-trip and deserialization by keeping recently used
+structures in memory.
+
+Entries are keyed on the root block usage key and the version data of the
+BlockStructureModel, so the cache is only usable when the storage backing
+for the cache is enabled.  Since transformers mutate the block structures
+they are given, every read returns a copy of the cached structure: the
+block relations, the per-block data containers and the transformer data
+containers are copied, while the collected field values themselves are
+shared and must be treated as read-only.
+"""
+
+
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+
+from django.conf import settings
+from edx_django_utils.monitoring import set_custom_attribute
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap
+from .factory import BlockStructureFactory
+
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+_local_cache = None
+
+
+def get_local_cache():
+    """
+    Returns the process-wide BlockStructureLocalCache, or None if the
+    local cache is disabled.
+    """
+    global _local_cache  # pylint: disable=global-statement
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['LOCAL_CACHE_MAX_SIZE']
+    # .. setting_default: 0
+    # .. setting_description: Maximum total size, in bytes of serialized data, of the collected block
+    #   structures kept in each process' in-memory cache. Use 0 to disable the in-memory cache.
+    # .. setting_warnings: Only used when `block_structure.storage_backing_for_cache` is enabled,
+    #   since entries are keyed on the version data of the stored block structures.
+    max_size = settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_MAX_SIZE', 0)
+    if not max_size:
+        return None
+    if _local_cache is None or _local_cache.max_size != max_size:
+        _local_cache = BlockStructureLocalCache(max_size)
+    return _local_cache
+
+
+class BlockStructureLocalCache:
+    """
+    Thread-safe LRU cache of collected block structures, bounded by the
+    total size of their serialized data.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int) - Maximum total size, in bytes of serialized
+                data, of the cached block structures.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Returns a copy of the block structure cached for the given key,
+        or None if not found.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        set_custom_attribute('block_structure.local_cache', 'hit' if entry else 'miss')
+        return copy_block_structure(entry[0]) if entry else None
+
+    def set(self, key, block_structure, size):
+        """
+        Caches the given block structure for the given key.
+
+        Arguments:
+            key (tuple) - The key returned by BlockStructureStore for the
+                stored version of the block structure.
+
+            block_structure (BlockStructureBlockData) - The collected
+                block structure. It must not be mutated by the caller
+                afterwards.
+
+            size (int) - The size of the block structure's serialized data.
+        """
+        if size > self.max_size:
+            logger.info("BlockStructure: Too large for the local cache; %s, size: %d", key[0], size)
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry:
+                self.size -= previous_entry[1]
+            self._entries[key] = (block_structure, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, root_block_usage_key):
+        """
+        Removes all versions of the block structure for the given root
+        block usage key.
+        """
+        root_key = str(root_block_usage_key)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == root_key]:
+                _, size = self._entries.pop(key)
+                self.size -= size
+
+    def clear(self):
+        """
+        Removes all entries and resets the metrics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns a dict of the cache's metrics.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_size': self.max_size,
+            }
+
+
+def copy_block_structure(block_structure):
+    """
+    Returns a copy of the given collected block structure that can be
+    freely mutated by transformers, without copying the collected values.
+    """
+    # pylint: disable=protected-access
+    block_data_map = {}
+    for usage_key, block_data in block_structure._block_data_map.items():
+        block_data_copy = BlockData.__new__(BlockData)
+        block_data_copy.__dict__.update(
+            fields=dict(block_data.fields),
+            location=block_data.location,
+            transformer_data=_copy_transformer_data_map(block_data.transformer_data),
+        )
+        block_data_map[usage_key] = block_data_copy
+
+    return BlockStructureFactory.create_new(
+        block_structure.root_block_usage_key,
+        block_structure._graph.copy(),
+        _copy_transformer_data_map(block_structure.transformer_data),
+        block_data_map,
+    )
+
+
+def _copy_transformer_data_map(transformer_data_map):
+    """
+    Returns a copy of the given TransformerDataMap with copies of its
+    TransformerData containers.
+    """
+    map_copy = TransformerDataMap()
+    for transformer_name, transformer_data in transformer_data_map.items():
+        transformer_data_copy = TransformerData()
+        transformer_data_copy.fields = dict(transformer_data.fields)
+        map_copy[transformer_name] = transformer_data_copy
+    return map_copy
@@ -0,0 +1,185 @@
+"""
+Command to compare the serialization formats of collected block structures.
+"""
+
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytz
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+# Number of children per block at each level below the course, from
+# chapters down to the leaf components.
+BRANCHING = (('chapter', 10), ('sequential', 5), ('vertical', 4))
+LEAF_BLOCK_TYPES = ('problem', 'html', 'video')
+
+# Representative collected transformers and their per-block fields.
+TRANSFORMER_FIELDS = {
+    'visibility': ('merged_visible_to_staff_only',),
+    'start_date': ('merged_start_date',),
+    'grades': ('max_score', 'weight'),
+    'user_partitions': ('merged_group_access',),
+}
+
+
+def create_block_structure(num_blocks):
+    """
+    Returns a synthetic collected block structure with approximately
+    num_blocks blocks shaped like a course outline.
+    """
+    course_key = CourseLocator('benchmark', f'blocks{num_blocks}', 'run')
+    root_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureBlockData(root_key)
+    _set_block_data(block_structure, root_key, 0)
+
+    parents = [root_key]
+    for block_type, branching in BRANCHING:
+        children = []
+        for parent in parents:
+            for _ in range(branching):
+                children.append(_add_block(block_structure, parent, block_type))
+        parents = children
+
+    leaves_per_unit = max(1, (num_blocks - len(block_structure)) // len(parents))
+    for parent in parents:
+        for leaf_number in range(leaves_per_unit):
+            _add_block(block_structure, parent, LEAF_BLOCK_TYPES[leaf_number % len(LEAF_BLOCK_TYPES)])
+
+    for transformer_name in TRANSFORMER_FIELDS:
+        block_structure.set_transformer_data(transformer_name, '_version', 1)
+    return block_structure
+
+
+def _add_block(block_structure, parent_key, block_type):
+    """
+    Adds a new block of the given type under the given parent.
+    """
+    block_number = len(block_structure)
+    block_key = parent_key.course_key.make_usage_key(block_type, f'{block_type}{block_number:08x}')
+    block_structure._add_relation(parent_key, block_key)  # pylint: disable=protected-access
+    _set_block_data(block_structure, block_key, block_number)
+    return block_key
+
+
+def _set_block_data(block_structure, block_key, block_number):
+    """
+    Sets typical collected xBlock and transformer fields on the given block.
+    """
+    start = datetime(2020, 1, 1, tzinfo=pytz.UTC) + timedelta(days=block_number % 365)
+    xblock_fields = {
+        'display_name': f'{block_key.block_type.title()} {block_number}',
+        'category': block_key.block_type,
+        'start': start,
+        'due': start + timedelta(days=14) if block_number % 3 == 0 else None,
+        'graded': block_key.block_type == 'problem',
+        'format': 'Homework' if block_number % 5 == 0 else None,
+        'visible_to_staff_only': False,
+        'group_access': {},
+    }
+    for field_name, value in xblock_fields.items():
+        block_structure.override_xblock_field(block_key, field_name, value)
+
+    transformer_values = {
+        'merged_visible_to_staff_only': False,
+        'merged_start_date': start,
+        'max_score': 1.0 if block_key.block_type == 'problem' else None,
+        'weight': 1.0,
+        'merged_group_access': {},
+    }
+    for transformer_name, field_names in TRANSFORMER_FIELDS.items():
+        for field_name in field_names:
+            block_structure.set_transformer_block_field(
+                block_key, transformer_name, field_name, transformer_values[field_name],
+            )
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks serialization of synthetic collected block structures in the
+    legacy zpickle format and the columnar format, reporting the serialized
+    size, the best deserialize time and the peak memory used while
+    deserializing.
+
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 5000 20000
+    """
+    help = 'Benchmarks the zpickle and columnar block structure serialization formats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            nargs='+',
+            type=int,
+            default=[5000, 20000],
+            help='Sizes of the synthetic course block structures to benchmark.',
+        )
+        parser.add_argument(
+            '--repeat',
+            dest='repeat',
+            type=int,
+            default=5,
+            help='Number of deserializations to run for each format.',
+        )
+
+    def handle(self, *args, **options):
+        formats = (
+            ('zpickle', self._zpickle_serialize, self._zpickle_deserialize),
+            ('columnar', serialization.serialize, serialization.deserialize),
+        )
+        self.stdout.write('blocks\tformat\tsize_bytes\tserialize_ms\tdeserialize_ms\tpeak_memory_kb')
+        for num_blocks in options['num_blocks']:
+            block_structure = create_block_structure(num_blocks)
+            for format_name, serialize, deserialize in formats:
+                start = time.perf_counter()
+                serialized_data = serialize(block_structure)
+                serialize_time = time.perf_counter() - start
+
+                deserialize_times = []
+                for _ in range(options['repeat']):
+                    gc.collect()
+                    start = time.perf_counter()
+                    deserialize(serialized_data, block_structure.root_block_usage_key)
+                    deserialize_times.append(time.perf_counter() - start)
+
+                gc.collect()
+                tracemalloc.start()
+                deserialize(serialized_data, block_structure.root_block_usage_key)
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                self.stdout.write('{}\t{}\t{}\t{:.1f}\t{:.1f}\t{}'.format(
+                    len(block_structure),
+                    format_name,
+                    len(serialized_data),
+                    serialize_time * 1000,
+                    min(deserialize_times) * 1000,
+                    peak_memory // 1024,
+                ))
+
+    @staticmethod
+    def _zpickle_serialize(block_structure):
+        """
+        Serializes the given block structure in the legacy format.
+        """
+        # pylint: disable=protected-access
+        return zpickle((
+            block_structure._block_relations,
+            block_structure.transformer_data,
+            block_structure._block_data_map,
+        ))
+
+    @staticmethod
+    def _zpickle_deserialize(serialized_data, root_block_usage_key):  # pylint: disable=unused-argument
+        """
+        Deserializes the given data in the legacy format.
+        """
+        return zunpickle(serialized_data)
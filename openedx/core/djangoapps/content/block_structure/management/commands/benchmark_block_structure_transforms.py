@@ -0,0 +1,180 @@
+"""
+Command to benchmark the operations of the per-request transformer pipeline
+on collected block structures.
+"""
+
+
+import gc
+import time
+from datetime import datetime
+
+import pytz
+from django.core.management.base import BaseCommand
+
+from openedx.core.djangoapps.content.block_structure.local_cache import copy_block_structure
+from openedx.core.djangoapps.content.block_structure.transformer import combine_filters
+
+from .benchmark_block_structure_serialization import create_block_structure
+
+# Blocks of the synthetic structures that start after this date are
+# removed by the start date filter, about a tenth of them.
+START_DATE_CUTOFF = datetime(2020, 11, 24, tzinfo=pytz.UTC)
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the block structure operations run by transformers for each
+    request, on copies of synthetic collected block structures, reporting
+    the best and mean time of each operation.
+
+    The operations mirror the transformer pipeline: the collected structure
+    is copied, the filtering transformers are combined into a single
+    traversal, other transformers remove blocks through removal traversals
+    or one at a time, the Blocks API filters blocks by type while keeping
+    their descendants, and the unreachable blocks are finally pruned.
+
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_transforms --num_blocks 5000 20000
+    """
+    help = 'Benchmarks the block structure operations of the transformer pipeline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            nargs='+',
+            type=int,
+            default=[5000, 20000],
+            help='Sizes of the synthetic course block structures to benchmark.',
+        )
+        parser.add_argument(
+            '--repeat',
+            dest='repeat',
+            type=int,
+            default=10,
+            help='Number of runs of each operation.',
+        )
+
+    def handle(self, *args, **options):
+        operations = (
+            ('copy', self._copy),
+            ('topological_traversal', self._topological_traversal),
+            ('combined_filters', self._combined_filters),
+            ('remove_block_traversal', self._remove_block_traversal),
+            ('remove_block', self._remove_block),
+            ('remove_blocks_keep_descendants', self._remove_blocks_keep_descendants),
+            ('prune_unreachable', self._prune_unreachable),
+            ('pipeline', self._pipeline),
+        )
+        self.stdout.write('blocks\toperation\tbest_ms\tmean_ms')
+        for num_blocks in options['num_blocks']:
+            collected_block_structure = create_block_structure(num_blocks)
+            for operation_name, operation in operations:
+                times = []
+                for _ in range(options['repeat']):
+                    block_structure = copy_block_structure(collected_block_structure)
+                    gc.collect()
+                    start = time.perf_counter()
+                    operation(block_structure)
+                    times.append(time.perf_counter() - start)
+
+                self.stdout.write('{}\t{}\t{:.2f}\t{:.2f}'.format(
+                    len(collected_block_structure),
+                    operation_name,
+                    min(times) * 1000,
+                    sum(times) / len(times) * 1000,
+                ))
+
+    @staticmethod
+    def _copy(block_structure):
+        """
+        Copies the block structure, as done for each read of a cached
+        collected structure.
+        """
+        copy_block_structure(block_structure)
+
+    @staticmethod
+    def _topological_traversal(block_structure):
+        """
+        Traverses all the blocks, as done by most transformers.
+        """
+        for _ in block_structure.topological_traversal():
+            pass
+
+    @staticmethod
+    def _combined_filters(block_structure):
+        """
+        Removes blocks through the combined filters of the filtering
+        transformers, in a single traversal.
+        """
+        filters = [
+            block_structure.create_removal_filter(
+                lambda block_key: block_structure.get_transformer_block_field(
+                    block_key, 'start_date', 'merged_start_date',
+                ) > START_DATE_CUTOFF
+            ),
+            block_structure.create_removal_filter(
+                lambda block_key: block_structure.get_transformer_block_field(
+                    block_key, 'visibility', 'merged_visible_to_staff_only',
+                )
+            ),
+        ]
+        block_structure.filter_topological_traversal(combine_filters(block_structure, filters))
+
+    @staticmethod
+    def _remove_block_traversal(block_structure):
+        """
+        Removes the graded blocks through a removal traversal, as done by
+        the hidden content transformer.
+        """
+        root_block_usage_key = block_structure.root_block_usage_key
+        block_structure.remove_block_traversal(
+            lambda block_key: (
+                block_key != root_block_usage_key and
+                block_structure.get_xblock_field(block_key, 'format') == 'Homework'
+            )
+        )
+
+    @staticmethod
+    def _remove_block(block_structure):
+        """
+        Removes the html blocks one at a time, as done by the user
+        partitions transformer.
+        """
+        for block_key in list(block_structure.topological_traversal()):
+            if block_key.block_type == 'html':
+                block_structure.remove_block(block_key, keep_descendants=False)
+
+    @staticmethod
+    def _remove_blocks_keep_descendants(block_structure):
+        """
+        Removes all but the problem blocks while keeping their descendants,
+        as done by the Blocks API when filtering by block type.
+        """
+        block_structure.remove_blocks(
+            [
+                block_key for block_key in block_structure
+                if block_structure.get_xblock_field(block_key, 'category') not in ('course', 'problem')
+            ],
+            keep_descendants=True,
+        )
+
+    @staticmethod
+    def _prune_unreachable(block_structure):
+        """
+        Prunes the structure after removing a tenth of the blocks, as done
+        at the end of the pipeline.
+        """
+        block_structure.remove_blocks(list(block_structure)[1::10])
+        block_structure._prune_unreachable()  # pylint: disable=protected-access
+
+    def _pipeline(self, block_structure):
+        """
+        Runs the operations of a typical request: copying the collected
+        structure, filtering, removing blocks and pruning.
+        """
+        block_structure = copy_block_structure(block_structure)
+        self._combined_filters(block_structure)
+        self._remove_block_traversal(block_structure)
+        self._remove_block(block_structure)
+        block_structure._prune_unreachable()  # pylint: disable=protected-access
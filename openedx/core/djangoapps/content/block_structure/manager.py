@@ -5,12 +5,21 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from copy import deepcopy
+from logging import getLogger
 
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+from . import config
+from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
+from .transformer_registry import TransformerRegistry
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
 
 class BlockStructureManager:
     """
@@ -118,14 +127,118 @@ class BlockStructureManager:
         the modulestore.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
-            BlockStructureTransformers.collect(block_structure)
+            block_structure = None
+            if config.INCREMENTAL_COLLECT.is_enabled():
+                block_structure = self._collect_incrementally()
+
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
+                BlockStructureTransformers.collect(block_structure)
+
             self.store.add(block_structure)
             return block_structure
 
+    def _collect_incrementally(self):
+        """
+        Returns a collected block structure built by re-collecting only the
+        blocks that changed in the modulestore since the stored version,
+        along with their descendants and ancestors, and merging them into
+        the stored block structure.
+
+        Returns None if an incremental collect is not possible, in which
+        case a full collect is needed.
+        """
+        if not all(
+            transformer.SUPPORTS_INCREMENTAL_COLLECT
+            for transformer in TransformerRegistry.get_registered_transformers()
+        ):
+            return None
+
+        version_data = self.store.get_version_data(self.root_block_usage_key)
+        if (
+            not version_data or
+            not version_data['data_version'] or
+            version_data['transformers_schema_version'] != TransformerRegistry.get_write_version_hash() or
+            version_data['block_structure_schema_version'] != str(BlockStructureBlockData.VERSION)
+        ):
+            return None
+
+        try:
+            changed_block_keys = self.modulestore.get_changed_blocks(
+                self.root_block_usage_key.course_key,
+                version_data['data_version'],
+            )
+            previous_block_structure = self.store.get(self.root_block_usage_key)
+        except (AttributeError, NotImplementedError, ItemNotFoundError, BlockStructureNotFound):
+            return None
+
+        changed_block_ids = {(block_key.block_type, block_key.block_id) for block_key in changed_block_keys}
+        ancestor_block_ids = set()
+        for block_key in previous_block_structure:
+            if (block_key.block_type, block_key.block_id) in changed_block_ids:
+                ancestor_block_ids.update(
+                    (ancestor_key.block_type, ancestor_key.block_id)
+                    for ancestor_key in self._get_ancestors(previous_block_structure, block_key)
+                )
+
+        partial_block_structure, children_ids = BlockStructureFactory.create_partial_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore,
+            changed_block_ids,
+            ancestor_block_ids,
+        )
+
+        # Blocks with parents outside of the partial structure (in DAGs)
+        # would be collected without the data of those parents.
+        for block_key in partial_block_structure:
+            if any(
+                parent_key not in partial_block_structure
+                for parent_key in previous_block_structure.get_parents(block_key)
+            ):
+                return None
+
+        # The transformers' non-block-specific data of the partial structure
+        # replaces the stored one, so the transformers start from the stored
+        # data, for the blocks that are not re-collected.
+        partial_block_structure.transformer_data = deepcopy(previous_block_structure.transformer_data)
+        BlockStructureTransformers.collect(partial_block_structure)
+        try:
+            block_structure = BlockStructureFactory.create_merged(
+                previous_block_structure,
+                partial_block_structure,
+                children_ids,
+            )
+        except KeyError:
+            logger.exception("BlockStructure: Failed to merge incremental collect for %s", self.root_block_usage_key)
+            return None
+
+        logger.info(
+            "BlockStructure: Collected incrementally; %s, changed: %d, re-collected: %d, total: %d",
+            self.root_block_usage_key,
+            len(changed_block_ids),
+            len(partial_block_structure),
+            len(block_structure),
+        )
+        return block_structure
+
+    @staticmethod
+    def _get_ancestors(block_structure, block_key):
+        """
+        Returns the set of all ancestors of the given block in the given
+        block structure.
+        """
+        ancestors = set()
+        to_visit = list(block_structure.get_parents(block_key))
+        while to_visit:
+            ancestor_key = to_visit.pop()
+            if ancestor_key not in ancestors:
+                ancestors.add(ancestor_key)
+                to_visit.extend(block_structure.get_parents(ancestor_key))
+        return ancestors
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,379 @@
+"""
+Columnar serialization format for collected BlockStructures.
+
+The legacy format zpickles the whole tuple of
+(_block_relations, transformer_data, _block_data_map), which forces every
+cache hit to rebuild thousands of _BlockRelations and BlockData objects
+through the pickle machinery.
+
+The columnar format instead stores:
+    * an interned table of usage keys, encoded relative to the course key of
+      the root block whenever possible (block_type table + block_id list),
+    * the parent and child adjacency lists as integer-indexed CSR arrays,
+    * one value column per collected xBlock field and per transformer
+      block field, each holding only the blocks that have a value for it.
+
+The structural sections (header, key table, adjacency) are pickle-free.
+Field values can be of any picklable type, so each value column is
+encoded as a single pickled flat list.
+
+Layout:
+    MAGIC (3 bytes) | FORMAT_VERSION (1 byte) | header length (4 bytes,
+    little-endian) | JSON header | sections
+
+    The JSON header maps each section name to its (offset, length) within
+    the sections area. Each section is zlib-compressed on its own and is
+    only decompressed when it is first read, so a reader can access some
+    sections without paying for the others. deserialize builds the whole
+    block structure and therefore still reads every section once.
+"""
+
+
+import json
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+
+from opaque_keys.edx.keys import UsageKey
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockGraph
+
+# Prefix identifying data written in the columnar format. Data in the
+# legacy zpickle format always starts with a zlib header (0x78), so the
+# two formats can be told apart without any out-of-band information.
+MAGIC = b'BSC'
+
+# The latest version of the columnar format. Increment whenever the layout
+# changes in a way that older readers cannot handle.
+FORMAT_VERSION = 2
+
+# Encodings of the usage key table.
+KEYS_COURSE_RELATIVE = 'course_relative'
+KEYS_PICKLED = 'pickled'
+
+_HEADER_LENGTH = struct.Struct('<I')
+_INDEX_TYPECODE = 'I'
+_PICKLE_PROTOCOL = 4
+
+
+class ColumnarFormatError(Exception):
+    """
+    Raised when serialized data is not in a supported columnar format.
+    """
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data was written in the
+    columnar format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given collected block structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            to serialize.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    graph = block_structure._graph
+    block_data_map = block_structure._block_data_map
+
+    # Intern all usage keys. Keys that only appear in the block data map
+    # (without relations) are appended after the related blocks.
+    keys = list(graph.ids)
+    key_to_index = {key: index for index, key in enumerate(keys)}
+    index_by_id = {block_id: index for index, block_id in enumerate(graph.ids.values())}
+    for key in block_data_map:
+        if key not in key_to_index:
+            key_to_index[key] = len(keys)
+            keys.append(key)
+
+    sections = {}
+    header = {
+        'num_keys': len(keys),
+        'num_related_keys': len(graph),
+    }
+    header['keys'] = _encode_keys(keys, block_structure.root_block_usage_key, sections)
+
+    block_ids = list(graph.ids.values())
+    _encode_adjacency('children', [graph.children[block_id] for block_id in block_ids], index_by_id, sections)
+    _encode_adjacency('parents', [graph.parents[block_id] for block_id in block_ids], index_by_id, sections)
+
+    sections['block_data'] = _encode_indices(key_to_index[key] for key in block_data_map)
+
+    xblock_columns = {}
+    transformer_presence = {}
+    transformer_columns = {}
+    for key, block_data in block_data_map.items():
+        index = key_to_index[key]
+        for field_name, value in block_data.fields.items():
+            _append_to_column(xblock_columns, field_name, index, value)
+        for transformer_name, transformer_block_data in block_data.transformer_data.items():
+            transformer_presence.setdefault(transformer_name, []).append(index)
+            for field_name, value in transformer_block_data.fields.items():
+                _append_to_column(
+                    transformer_columns.setdefault(transformer_name, {}), field_name, index, value,
+                )
+
+    header['xblock_fields'] = _encode_columns('xblock', xblock_columns, sections)
+    header['transformer_block_fields'] = {}
+    for transformer_name, indices in transformer_presence.items():
+        prefix = f'transformer.{transformer_name}'
+        sections[f'{prefix}.blocks'] = _encode_indices(indices)
+        header['transformer_block_fields'][transformer_name] = _encode_columns(
+            prefix, transformer_columns.get(transformer_name, {}), sections,
+        )
+
+    sections['transformer_data'] = pickle.dumps(
+        {name: data.fields for name, data in block_structure.transformer_data.items()},
+        _PICKLE_PROTOCOL,
+    )
+
+    return MAGIC + bytes([FORMAT_VERSION]) + _pack(header, sections)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given columnar data into the arguments expected by
+    BlockStructureFactory.create_new.
+
+    Arguments:
+        serialized_data (bytes) - Data previously returned by serialize.
+
+        root_block_usage_key (UsageKey) - The usage key of the root block
+            of the serialized structure.
+
+    Returns:
+        tuple (block_graph, transformer_data, block_data_map)
+
+    Raises:
+        ColumnarFormatError if the data is not in a supported format.
+    """
+    reader = _ColumnarReader(serialized_data)
+    keys = reader.keys(root_block_usage_key)
+    num_related_keys = reader.header['num_related_keys']
+
+    # Related blocks are stored first, so their indices are used as the
+    # ids of the graph.
+    graph = _BlockGraph()
+    graph.keys = keys[:num_related_keys]
+    graph.ids = {key: index for index, key in enumerate(graph.keys)}
+    graph.children = reader.adjacency('children')
+    graph.parents = reader.adjacency('parents')
+
+    # BlockData and TransformerData are populated through their __dict__
+    # since their __setattr__ redirects to the fields dict.
+    block_data_map = {}
+    block_data_by_index = {}
+    new_block_data = BlockData.__new__
+    for index in reader.indices('block_data'):
+        block_data = new_block_data(BlockData)
+        block_data.__dict__.update(fields={}, location=keys[index], transformer_data=TransformerDataMap())
+        block_data_map[keys[index]] = block_data
+        block_data_by_index[index] = block_data
+
+    for field_name, section in reader.header['xblock_fields'].items():
+        for index, value in reader.column(section):
+            block_data_by_index[index].fields[field_name] = value
+
+    new_transformer_data = TransformerData.__new__
+    for transformer_name, columns in reader.header['transformer_block_fields'].items():
+        transformer_data_by_index = {}
+        for index in reader.indices(f'transformer.{transformer_name}.blocks'):
+            transformer_block_data = new_transformer_data(TransformerData)
+            transformer_block_data.__dict__['fields'] = {}
+            block_data_by_index[index].transformer_data[transformer_name] = transformer_block_data
+            transformer_data_by_index[index] = transformer_block_data
+        for field_name, section in columns.items():
+            for index, value in reader.column(section):
+                transformer_data_by_index[index].fields[field_name] = value
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in reader.unpickle('transformer_data').items():
+        structure_transformer_data = TransformerData()
+        structure_transformer_data.fields = fields
+        transformer_data[transformer_name] = structure_transformer_data
+
+    return graph, transformer_data, block_data_map
+
+
+class _ColumnarReader:
+    """
+    Provides random access to the sections of columnar serialized data.
+    """
+    def __init__(self, serialized_data):
+        if not is_columnar(serialized_data):
+            raise ColumnarFormatError('Data is not in the columnar block structure format.')
+        version = serialized_data[len(MAGIC)]
+        if version != FORMAT_VERSION:
+            raise ColumnarFormatError(f'Unsupported columnar block structure format version {version}.')
+
+        payload = memoryview(serialized_data)[len(MAGIC) + 1:]
+        (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+        header_end = _HEADER_LENGTH.size + header_length
+        self.header = json.loads(bytes(payload[_HEADER_LENGTH.size:header_end]))
+        self._sections = payload[header_end:]
+        self._decompressed = {}
+
+    def section(self, name):
+        """
+        Returns the raw bytes of the named section, decompressing it on
+        first access.
+        """
+        data = self._decompressed.get(name)
+        if data is None:
+            offset, length = self.header['sections'][name]
+            data = self._decompressed[name] = zlib.decompress(self._sections[offset:offset + length])
+        return data
+
+    def indices(self, name):
+        """
+        Returns the named section decoded as an array of indices.
+        """
+        indices = array(_INDEX_TYPECODE)
+        indices.frombytes(self.section(name))
+        if sys.byteorder != 'little':
+            indices.byteswap()
+        return indices
+
+    def unpickle(self, name):
+        """
+        Returns the named section decoded as a pickled value.
+        """
+        return pickle.loads(self.section(name), encoding='latin1')
+
+    def column(self, section):
+        """
+        Returns an iterator of (index, value) pairs for the given value column.
+        """
+        return zip(self.indices(f'{section}.indices'), self.unpickle(f'{section}.values'))
+
+    def keys(self, root_block_usage_key):
+        """
+        Returns the list of interned usage keys.
+        """
+        encoding = self.header['keys']
+        if encoding['type'] == KEYS_PICKLED:
+            return self.unpickle('keys')
+
+        course_key = root_block_usage_key.course_key
+        make_usage_key = course_key.make_usage_key
+        block_types = encoding['block_types']
+        block_ids = str(self.section('keys.block_ids'), 'utf-8').split('\n') if self.header['num_keys'] else []
+        return [
+            make_usage_key(block_types[type_index], block_id)
+            for type_index, block_id in zip(self.indices('keys.block_types'), block_ids)
+        ]
+
+    def adjacency(self, name):
+        """
+        Returns the named adjacency lists, as lists of block indices,
+        ordered by block index.
+        """
+        offsets = self.indices(f'{name}.offsets')
+        targets = self.indices(name).tolist()
+        return [targets[offsets[index]:offsets[index + 1]] for index in range(len(offsets) - 1)]
+
+
+def _encode_keys(keys, root_block_usage_key, sections):
+    """
+    Adds the usage key table to the given sections and returns its
+    header entry.
+
+    Keys are stored relative to the root's course key when they can all be
+    recreated from it; otherwise the key list is pickled.
+    """
+    course_key = getattr(root_block_usage_key, 'course_key', None)
+    if isinstance(root_block_usage_key, UsageKey) and course_key is not None:
+        block_types = {}
+        type_indices = []
+        block_ids = []
+        for key in keys:
+            if not isinstance(key, UsageKey) or course_key.make_usage_key(key.block_type, key.block_id) != key:
+                break
+            type_indices.append(block_types.setdefault(key.block_type, len(block_types)))
+            block_ids.append(key.block_id)
+        else:
+            sections['keys.block_types'] = _encode_indices(type_indices)
+            sections['keys.block_ids'] = '\n'.join(block_ids).encode('utf-8')
+            return {'type': KEYS_COURSE_RELATIVE, 'block_types': list(block_types)}
+
+    sections['keys'] = pickle.dumps(keys, _PICKLE_PROTOCOL)
+    return {'type': KEYS_PICKLED}
+
+
+def _encode_adjacency(name, adjacency_lists, index_by_id, sections):
+    """
+    Adds the given adjacency lists of block ids to the given sections as a
+    pair of CSR (offsets, targets) index arrays.
+    """
+    offsets = [0]
+    targets = []
+    for adjacent_ids in adjacency_lists:
+        targets.extend(index_by_id[block_id] for block_id in adjacent_ids)
+        offsets.append(len(targets))
+    sections[f'{name}.offsets'] = _encode_indices(offsets)
+    sections[name] = _encode_indices(targets)
+
+
+def _append_to_column(columns, field_name, index, value):
+    """
+    Appends the given block's value to the named column.
+    """
+    column = columns.get(field_name)
+    if column is None:
+        column = columns[field_name] = ([], [])
+    column[0].append(index)
+    column[1].append(value)
+
+
+def _encode_columns(prefix, columns, sections):
+    """
+    Adds the given value columns to the given sections and returns a map
+    of each field name to its section name.
+    """
+    column_sections = {}
+    for column_number, (field_name, (indices, values)) in enumerate(columns.items()):
+        section = f'{prefix}.{column_number}'
+        sections[f'{section}.indices'] = _encode_indices(indices)
+        sections[f'{section}.values'] = pickle.dumps(values, _PICKLE_PROTOCOL)
+        column_sections[field_name] = section
+    return column_sections
+
+
+def _encode_indices(indices):
+    """
+    Returns the given integers encoded as little-endian unsigned ints.
+    """
+    encoded = array(_INDEX_TYPECODE, indices)
+    if sys.byteorder != 'little':
+        encoded.byteswap()
+    return encoded.tobytes()
+
+
+def _pack(header, sections):
+    """
+    Returns the header and the separately compressed sections, packed
+    after the format prefix.
+    """
+    offset = 0
+    section_offsets = {}
+    compressed_sections = []
+    for name, data in sections.items():
+        compressed = zlib.compress(data)
+        section_offsets[name] = (offset, len(compressed))
+        compressed_sections.append(compressed)
+        offset += len(compressed)
+    header['sections'] = section_offsets
+
+    encoded_header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return b''.join([_HEADER_LENGTH.pack(len(encoded_header)), encoded_header, *compressed_sections])
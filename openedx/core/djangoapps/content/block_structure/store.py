@@ -9,10 +9,11 @@ from logging import getLogger
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .local_cache import get_local_cache
 from .models import BlockStructureModel
 from .transformer_registry import TransformerRegistry
 
@@ -70,6 +71,10 @@ class BlockStructureStore:
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
 
+        local_cache = get_local_cache()
+        if local_cache:
+            local_cache.invalidate(block_structure.root_block_usage_key)
+
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
@@ -93,13 +98,25 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
 
+        local_cache = get_local_cache()
+        local_cache_key = self._encode_local_cache_key(bs_model) if local_cache else None
+        if local_cache_key:
+            block_structure = local_cache.get(local_cache_key)
+            if block_structure:
+                return block_structure
+
         try:
             serialized_data = self._get_from_cache(bs_model)
         except BlockStructureNotFound:
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+        if local_cache_key:
+            # The caller may transform the returned structure, so the
+            # local cache keeps its own copy.
+            local_cache.set(local_cache_key, block_structure.copy(), len(serialized_data))
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -113,6 +130,10 @@ class BlockStructureStore:
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
         bs_model.delete()
+
+        local_cache = get_local_cache()
+        if local_cache:
+            local_cache.invalidate(root_block_usage_key)
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
     def is_up_to_date(self, root_block_usage_key, modulestore):
@@ -130,6 +151,19 @@ class BlockStructureStore:
 
         return False
 
+    def get_version_data(self, root_block_usage_key):
+        """
+        Returns the version-relevant data of the block structure stored
+        for the given key, or None if it is unknown because no block
+        structure is stored or the storage backing is disabled.
+        """
+        if config.STORAGE_BACKING_FOR_CACHE.is_enabled():
+            try:
+                return self._version_data_of_model(self._get_model(root_block_usage_key))
+            except BlockStructureNotFound:
+                pass
+        return None
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -195,6 +229,9 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
+        if config.COLUMNAR_SERIALIZATION.is_enabled():
+            return serialization.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -205,10 +242,16 @@ class BlockStructureStore:
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the columnar or the legacy zpickle format is accepted.
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            if serialization.is_columnar(serialized_data):
+                block_relations, transformer_data, block_data_map = serialization.deserialize(
+                    serialized_data, root_block_usage_key,
+                )
+            else:
+                block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
@@ -235,6 +278,20 @@ class BlockStructureStore:
             root_usage_key=str(bs_model.data_usage_key),
         )
 
+    @classmethod
+    def _encode_local_cache_key(cls, bs_model):
+        """
+        Returns the key to use in the local in-memory cache for the given
+        BlockStructureModel, or None if the model's version is unknown
+        because the storage backing is disabled.
+        """
+        if not config.STORAGE_BACKING_FOR_CACHE.is_enabled():
+            return None
+        version_data = cls._version_data_of_model(bs_model)
+        return (str(bs_model.data_usage_key),) + tuple(
+            str(version_data[field_name]) for field_name in BlockStructureModel.VERSION_FIELDS
+        )
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
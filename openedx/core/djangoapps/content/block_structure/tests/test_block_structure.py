@@ -14,7 +14,7 @@ import ddt
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockStructure, BlockStructureBlockData, BlockStructureModulestoreData
 from ..exceptions import TransformerException
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
@@ -248,6 +248,55 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
+    @ddt.data(True, False)
+    def test_remove_blocks(self, keep_descendants):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_blocks([1, 2, 7], keep_descendants)
+
+        if keep_descendants:
+            # the children of the removed blocks take their place, once
+            self.assert_block_structure(
+                block_structure, [[3, 4], [], [], [5, 6], [], [], []], missing_blocks=[1, 2],
+            )
+            assert block_structure.get_children(0) == [3, 4]
+        else:
+            self.assert_block_structure(
+                block_structure, [[], [], [], [5, 6], [], [], []], missing_blocks=[1, 2],
+            )
+
+    def test_remove_blocks_matches_remove_block(self):
+        removed_blocks = [2, 3]
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_blocks(removed_blocks)
+
+        expected_block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        for block in removed_blocks:
+            expected_block_structure.remove_block(block, keep_descendants=False)
+
+        for block in range(len(ChildrenMapTestMixin.DAG_CHILDREN_MAP)):
+            assert (block in block_structure) == (block in expected_block_structure)
+            if block in block_structure:
+                assert block_structure.get_children(block) == expected_block_structure.get_children(block)
+                assert block_structure.get_parents(block) == expected_block_structure.get_parents(block)
+
+    def test_remove_block_traversal_dag(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_block_traversal(lambda block: block == 3)
+        self.assert_block_structure(
+            block_structure, [[1, 2], [], [4], [], [], [], []], missing_blocks=[3],
+        )
+        assert list(block_structure.topological_traversal()) == [0, 1, 2, 4]
+
+    def test_block_relations(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_relations = block_structure._block_relations
+        assert block_relations[1].parents == [0]
+        assert block_relations[1].children == [3, 4]
+
+        new_block_structure = BlockStructureBlockData(root_block_usage_key=0)
+        new_block_structure._block_relations = block_relations
+        self.assert_block_structure(new_block_structure, ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+
     def test_copy(self):
         def _set_value(structure, value):
             """
@@ -0,0 +1,79 @@
+"""
+Tests for block_structure/local_cache.py
+"""
+# pylint: disable=protected-access
+
+
+from unittest import TestCase
+
+from ..local_cache import BlockStructureLocalCache, copy_block_structure
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+class TestBlockStructureLocalCache(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureLocalCache
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        self.block_structure._add_transformer(MockTransformer)
+        self.block_structure.override_xblock_field(1, 'display_name', 'Block 1')
+        self.block_structure.set_transformer_block_field(1, MockTransformer, 'test', 'value')
+        self.cache = BlockStructureLocalCache(max_size=100)
+
+    def test_miss_and_hit(self):
+        assert self.cache.get(('root', 'v1')) is None
+        self.cache.set(('root', 'v1'), self.block_structure, 10)
+        cached = self.cache.get(('root', 'v1'))
+        self.assert_block_structure(cached, self.SIMPLE_CHILDREN_MAP)
+        assert cached.get_xblock_field(1, 'display_name') == 'Block 1'
+        assert self.cache.stats() == {
+            'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'size': 10, 'max_size': 100,
+        }
+
+    def test_reads_are_isolated(self):
+        self.cache.set(('root', 'v1'), self.block_structure, 10)
+        first = self.cache.get(('root', 'v1'))
+        first.remove_block(1, keep_descendants=False)
+        first.override_xblock_field(2, 'display_name', 'Changed')
+        first.set_transformer_block_field(1, MockTransformer, 'test', 'changed')
+
+        second = self.cache.get(('root', 'v1'))
+        self.assert_block_structure(second, self.SIMPLE_CHILDREN_MAP)
+        assert second.get_xblock_field(2, 'display_name') is None
+        assert second.get_transformer_block_field(1, MockTransformer, 'test') == 'value'
+
+    def test_eviction(self):
+        self.cache.set(('root', 'v1'), self.block_structure, 40)
+        self.cache.set(('other', 'v1'), self.block_structure, 40)
+        self.cache.get(('root', 'v1'))
+        self.cache.set(('third', 'v1'), self.block_structure, 40)
+
+        assert self.cache.get(('other', 'v1')) is None
+        assert self.cache.get(('root', 'v1')) is not None
+        assert self.cache.stats()['evictions'] == 1
+        assert self.cache.stats()['size'] == 80
+
+    def test_too_large(self):
+        self.cache.set(('root', 'v1'), self.block_structure, 101)
+        assert self.cache.get(('root', 'v1')) is None
+
+    def test_invalidate(self):
+        self.cache.set(('root', 'v1'), self.block_structure, 10)
+        self.cache.set(('root', 'v2'), self.block_structure, 10)
+        self.cache.set(('other', 'v1'), self.block_structure, 10)
+        self.cache.invalidate('root')
+        assert self.cache.get(('root', 'v1')) is None
+        assert self.cache.get(('root', 'v2')) is None
+        assert self.cache.get(('other', 'v1')) is not None
+        assert self.cache.stats()['size'] == 10
+
+    def test_copy_block_structure(self):
+        copied = copy_block_structure(self.block_structure)
+        self.assert_block_structure(copied, self.SIMPLE_CHILDREN_MAP)
+        assert copied._get_transformer_data_version(MockTransformer) == MockTransformer.WRITE_VERSION
+        assert copied[1] is not self.block_structure[1]
+        assert copied.get_transformer_block_data(1, MockTransformer) is not \
+            self.block_structure.get_transformer_block_data(1, MockTransformer)
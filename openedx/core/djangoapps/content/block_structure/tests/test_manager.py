@@ -2,15 +2,21 @@
 Tests for manager.py
 """
 
+from unittest.mock import patch
+
 import pytest
 import ddt
 from django.test import TestCase
 from edx_toggles.toggles.testutils import override_waffle_switch
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory
 
+from ..api import get_block_structure_manager
 from ..block_structure import BlockStructureBlockData
-from ..config import STORAGE_BACKING_FOR_CACHE
+from ..config import INCREMENTAL_COLLECT, STORAGE_BACKING_FOR_CACHE
 from ..exceptions import UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
+from ..transformer_registry import TransformerRegistry
 from ..transformers import BlockStructureTransformers
 from .helpers import (
     ChildrenMapTestMixin,
@@ -94,6 +100,20 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + str(block_key)
 
 
+class IncrementalTestTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collects and records
+    the blocks it collected.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collected_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        super().collect(block_structure)
+        cls.collected_block_keys = list(block_structure)
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -220,3 +240,109 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         assert TestTransformer1.collect_call_count == 2
+
+    def _update_incrementally(self, changed_blocks, data_version='previous'):
+        """
+        Re-collects the block structure with the incremental collect
+        enabled, with the given blocks reported as changed since the
+        stored version.
+        """
+        self.modulestore.get_changed_blocks = lambda course_key, version: [
+            self.block_key_factory(block) for block in changed_blocks
+        ]
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            with mock_registered_transformers([IncrementalTestTransformer]):
+                version_data = {
+                    'data_version': data_version,
+                    'data_edit_timestamp': None,
+                    'transformers_schema_version': TransformerRegistry.get_write_version_hash(),
+                    'block_structure_schema_version': str(BlockStructureBlockData.VERSION),
+                }
+                with patch.object(self.bs_manager.store, 'get_version_data', return_value=version_data):
+                    return self.bs_manager._update_collected()  # pylint: disable=protected-access
+
+    def test_incremental_collect(self):
+        with mock_registered_transformers([IncrementalTestTransformer]):
+            self.bs_manager.get_collected()
+
+        # Add a new child to block 1.
+        self.children_map = [[1, 2], [3, 4, 5], [], [], [], []]
+        self.modulestore = MockModulestoreFactory.create(self.children_map, self.block_key_factory)
+        self.bs_manager.modulestore = self.modulestore
+
+        block_structure = self._update_incrementally(changed_blocks=[1, 5])
+        self.assert_block_structure(block_structure, self.children_map)
+        IncrementalTestTransformer.assert_collected(block_structure)
+        assert set(IncrementalTestTransformer.collected_block_keys) == {
+            self.block_key_factory(block) for block in [0, 1, 3, 4, 5]
+        }
+
+        with mock_registered_transformers([IncrementalTestTransformer]):
+            stored_block_structure = self.bs_manager.get_collected()
+        self.assert_block_structure(stored_block_structure, self.children_map)
+
+    def test_incremental_collect_unknown_version(self):
+        with mock_registered_transformers([IncrementalTestTransformer]):
+            self.bs_manager.get_collected()
+
+        block_structure = self._update_incrementally(changed_blocks=[3], data_version=None)
+        self.assert_block_structure(block_structure, self.children_map)
+        assert len(IncrementalTestTransformer.collected_block_keys) == len(self.children_map)
+
+    def test_incremental_collect_unsupported_transformer(self):
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+        self.modulestore.get_changed_blocks = lambda course_key, version: [self.block_key_factory(3)]
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            with mock_registered_transformers(self.registered_transformers):
+                with patch.object(self.bs_manager.store, 'get_version_data') as mock_get_version_data:
+                    self.bs_manager._update_collected()  # pylint: disable=protected-access
+        assert not mock_get_version_data.called
+        assert TestTransformer1.collect_call_count == 2
+
+
+class TestBlockStructureManagerIncrementalCollect(ModuleStoreTestCase):
+    """
+    Tests the incremental collect of the block structures of courses in the
+    split modulestore.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.chapter = BlockFactory.create(parent=self.course, category='chapter')
+        self.sequential = BlockFactory.create(parent=self.chapter, category='sequential')
+        self.other_chapter = BlockFactory.create(parent=self.course, category='chapter')
+        IncrementalTestTransformer.collected_block_keys = []
+
+    @override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=True)
+    @override_waffle_switch(INCREMENTAL_COLLECT, active=True)
+    def test_incremental_collect(self):
+        with mock_registered_transformers([IncrementalTestTransformer]):
+            bs_manager = get_block_structure_manager(self.course.id)
+            bs_manager.get_collected()
+            assert len(IncrementalTestTransformer.collected_block_keys) == 4
+
+            self.sequential.display_name = 'Updated'
+            self.store.update_item(self.sequential, self.user.id)
+            self.store.publish(self.sequential.location, self.user.id)
+
+            # The stored version's structure is loaded from the database, not the structure cache.
+            with patch(
+                'xmodule.modulestore.split_mongo.mongo_connection.CourseStructureCache.get', return_value=None,
+            ):
+                bs_manager.update_collected_if_needed()
+
+            collected_block_ids = {
+                (block_key.block_type, block_key.block_id)
+                for block_key in IncrementalTestTransformer.collected_block_keys
+            }
+            assert (self.sequential.location.block_type, self.sequential.location.block_id) in collected_block_ids
+            assert (
+                self.other_chapter.location.block_type, self.other_chapter.location.block_id
+            ) not in collected_block_ids
+
+            block_structure = bs_manager.get_collected()
+            assert len(list(block_structure)) == 4
+            IncrementalTestTransformer.assert_collected(block_structure)
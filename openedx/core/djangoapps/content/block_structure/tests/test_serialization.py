@@ -0,0 +1,108 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+
+
+from datetime import datetime
+from unittest import TestCase
+
+import ddt
+import pytest
+import pytz
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import serialization
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestColumnarSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar BlockStructure serialization format.
+    """
+
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with
+        xBlock fields, transformer block fields and transformer data.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_id}')
+            if block_id % 2:
+                block_structure.override_xblock_field(block_key, 'start', datetime(2020, 1, block_id, tzinfo=pytz.UTC))
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', {'id': block_id})
+        return block_structure
+
+    def deserialize(self, serialized_data):
+        """
+        Returns the block structure for the given columnar data.
+        """
+        root_block_usage_key = self.block_key_factory(0)
+        return BlockStructureFactory.create_new(
+            root_block_usage_key,
+            *serialization.deserialize(serialized_data, root_block_usage_key)
+        )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized_data = serialization.serialize(block_structure)
+        assert serialization.is_columnar(serialized_data)
+
+        deserialized = self.deserialize(serialized_data)
+        self.assert_block_structure(deserialized, children_map)
+        assert list(deserialized.get_block_keys()) == list(block_structure.get_block_keys())
+        assert deserialized._get_transformer_data_version(MockTransformer) == MockTransformer.WRITE_VERSION
+        for block_key, block_data in block_structure.iteritems():
+            assert deserialized[block_key].location == block_key
+            assert deserialized[block_key].fields == block_data.fields
+            assert deserialized.get_transformer_block_field(block_key, MockTransformer, 'test') == \
+                block_structure.get_transformer_block_field(block_key, MockTransformer, 'test')
+
+    def test_non_course_keys(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure._add_relation(self.block_key_factory(4), 'detached')
+        deserialized = self.deserialize(serialization.serialize(block_structure))
+        assert deserialized.get_children(self.block_key_factory(4)) == ['detached']
+
+    def test_legacy_data_is_not_columnar(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        legacy_data = zpickle(
+            (block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map)
+        )
+        assert not serialization.is_columnar(legacy_data)
+        with pytest.raises(serialization.ColumnarFormatError):
+            serialization.deserialize(legacy_data, self.block_key_factory(0))
+
+    def test_unsupported_version(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        serialized_data = bytearray(serialization.serialize(block_structure))
+        serialized_data[len(serialization.MAGIC)] = serialization.FORMAT_VERSION + 1
+        with pytest.raises(serialization.ColumnarFormatError):
+            serialization.deserialize(bytes(serialized_data), self.block_key_factory(0))
+
+    def test_sections_decompressed_on_first_access(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        reader = serialization._ColumnarReader(serialization.serialize(block_structure))
+        assert not reader._decompressed
+
+        assert reader.adjacency('children') == self.SIMPLE_CHILDREN_MAP
+        assert set(reader._decompressed) == {'children', 'children.offsets'}
+
+        section = reader.header['xblock_fields']['display_name']
+        assert sorted(value for _, value in reader.column(section)) == sorted(
+            f'Block {block_id}' for block_id in range(len(self.SIMPLE_CHILDREN_MAP))
+        )
+        assert set(reader._decompressed) == {
+            'children', 'children.offsets', f'{section}.indices', f'{section}.values',
+        }
@@ -4,13 +4,15 @@ Tests for block_structure/cache.py
 
 import pytest
 import ddt
+from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..local_cache import get_local_cache
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -60,6 +62,17 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             assert stored_value is not None
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_columnar_serialization(self, with_storage_backing):
+        with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with override_waffle_switch(COLUMNAR_SERIALIZATION, active=True):
+                self.store.add(self.block_structure)
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            assert stored_value.get_transformer_block_field(
+                self.block_key_factory(0), MockTransformer, 'test'
+            ) == f'{MockTransformer.name()} val'
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -91,3 +104,26 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert self.mock_cache.timeout_from_last_call == 0
         self.store.add(self.block_structure)
         assert self.mock_cache.timeout_from_last_call == timeout
+
+    @override_settings(BLOCK_STRUCTURES_SETTINGS={'LOCAL_CACHE_MAX_SIZE': 10 ** 6})
+    def test_local_cache(self):
+        get_local_cache().clear()
+        with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=True):
+            self.store.add(self.block_structure)
+            first = self.store.get(self.block_structure.root_block_usage_key)
+            first.remove_block(self.block_key_factory(1), keep_descendants=False)
+
+            self.mock_cache.map.clear()
+            second = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(second, self.children_map)
+            assert get_local_cache().stats()['hits'] == 1
+
+            self.store.delete(self.block_structure.root_block_usage_key)
+            assert get_local_cache().stats()['entries'] == 0
+
+    @override_settings(BLOCK_STRUCTURES_SETTINGS={'LOCAL_CACHE_MAX_SIZE': 10 ** 6})
+    def test_local_cache_without_storage(self):
+        get_local_cache().clear()
+        self.store.add(self.block_structure)
+        self.store.get(self.block_structure.root_block_usage_key)
+        assert get_local_cache().stats()['entries'] == 0
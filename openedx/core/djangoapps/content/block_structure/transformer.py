@@ -58,6 +58,22 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method supports being called on a
+    # partial block structure during an incremental re-collection, which
+    # contains only the changed blocks of a course, their descendants and
+    # all their ancestors.
+    #
+    # This holds when the data collected for each block depends only on
+    # the block itself and on its ancestors (for example, values that are
+    # percolated down the hierarchy). The partial block structure starts
+    # with the transformer's non-block-specific data collected for the
+    # whole course, which its collect method must update rather than
+    # recompute from the re-collected blocks alone. Transformers that
+    # aggregate data from descendants must keep the default value;
+    # incremental re-collection is only used when all registered
+    # transformers support it.
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -1,6 +1,11 @@
 """
 Helper functions for caching course assets.
 """
+import os
+import re
+import tempfile
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
@@ -14,6 +19,9 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# The digests of the contents, which name the files of the disk cache.
+CONTENT_DIGEST_RE = re.compile(r'^[0-9a-f]{32}$')
+
 
 def set_cached_content(content):
     """
@@ -48,3 +56,49 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+def get_disk_cache_relative_path(content_digest):
+    """
+    Returns the path of the file of the content with the given digest, relative to the disk cache directory.
+    """
+    return os.path.join(content_digest[:2], content_digest)
+
+
+def get_disk_cached_content_path(content):
+    """
+    Returns the path of the file holding the given content in the local disk cache, writing the
+    content's stream to the file if it isn't cached yet.
+
+    Returns None if the disk cache is disabled, or if the content has no digest to key it on.
+
+    The files are named after the md5 digest of their content, so they never need to be
+    invalidated: updated assets have a new digest, and are cached in new files.
+    """
+    # .. setting_name: COURSE_ASSETS_DISK_CACHE_DIR
+    # .. setting_default: None
+    # .. setting_description: Directory in which the contentserver caches the course assets too large for
+    #   the django cache, so that they are served from the local disk rather than from the contentstore.
+    #   The files aren't evicted by the contentserver: old files must be pruned externally, e.g. by access
+    #   time. Use None to disable the disk cache.
+    cache_dir = getattr(settings, 'COURSE_ASSETS_DISK_CACHE_DIR', None)
+    content_digest = getattr(content, 'content_digest', None)
+    if not cache_dir or not content_digest or not CONTENT_DIGEST_RE.match(content_digest):
+        return None
+
+    file_path = os.path.join(cache_dir, get_disk_cache_relative_path(content_digest))
+    if os.path.exists(file_path):
+        return file_path
+
+    # Write the content to a temporary file first, so that concurrent requests never read a partial file.
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return file_path
@@ -5,28 +5,44 @@ Middleware to serve assets.
 
 import datetime
 import logging
+import os
+from functools import partial
+from uuid import uuid4
 
+from django.conf import settings
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_etags, quote_etag
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 
 from openedx.core.djangoapps.header_control import force_header_for_response
 from common.djangoapps.student.models import CourseEnrollment
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.contentstore.content import (  # lint-amnesty, pylint: disable=wrong-import-order
+    XASSET_LOCATION_TAG,
+    StaticContent,
+    StaticContentStream
+)
 from xmodule.exceptions import NotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore import InvalidLocationError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    get_cached_content,
+    get_disk_cache_relative_path,
+    get_disk_cached_content_path,
+    set_cached_content
+)
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 log = logging.getLogger(__name__)
@@ -41,6 +57,13 @@ except ImportError:
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Size of the chunks in which byte ranges of disk cached assets are read.
+DISK_CACHE_READ_CHUNK_SIZE = 64 * 1024
+
+# Maximum number of byte ranges sent in a multipart/byteranges response. The full content is sent
+# to requests for more ranges.
+MAX_BYTE_RANGES = 50
+
 
 class StaticContentServer(MiddlewareMixin):
     """
@@ -81,7 +104,8 @@ class StaticContentServer(MiddlewareMixin):
             # if we're able to load it.
             actual_digest = None
             try:
-                content = self.load_asset_from_location(loc)
+                # HEAD requests don't read the asset's data, so they don't fill the cache.
+                content = self.load_asset_from_location(loc, fill_cache=request.method != 'HEAD')
                 actual_digest = getattr(content, "content_digest", None)
             except (ItemNotFoundError, NotFoundError):
                 return HttpResponseNotFound()
@@ -117,13 +141,36 @@ class StaticContentServer(MiddlewareMixin):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
+            # if this asset has changed since then. If-None-Match takes precedence over
+            # If-Modified-Since.
+            etag = get_etag(content)
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag is not None and etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            # Assets too large for the django cache are served from the local disk cache, if enabled,
+            # rather than streamed from the contentstore through Python.
+            file_path = None
+            if isinstance(content, StaticContentStream) and request.method != 'HEAD':
+                file_path = get_disk_cached_content_path(content)
+                if newrelic:
+                    newrelic.agent.add_custom_attribute('contentserver.disk_cached', file_path is not None)
+
+            # .. setting_name: COURSE_ASSETS_DISK_CACHE_X_ACCEL_REDIRECT_PREFIX
+            # .. setting_default: None
+            # .. setting_description: URL prefix of an internal nginx location serving the files of
+            #   COURSE_ASSETS_DISK_CACHE_DIR. If set, disk cached assets are sent by nginx, which also
+            #   handles the byte ranges, through an X-Accel-Redirect response. Use None to send the files
+            #   from Django.
+            x_accel_redirect_prefix = getattr(settings, 'COURSE_ASSETS_DISK_CACHE_X_ACCEL_REDIRECT_PREFIX', None)
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
@@ -131,9 +178,19 @@ class StaticContentServer(MiddlewareMixin):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
-            if request.META.get('HTTP_RANGE'):
+            content_type = content.content_type
+            if request.method == 'HEAD':
+                # Only the headers are sent, so the asset's data is never read.
+                response = HttpResponse()
+                response['Content-Length'] = content.length
+            elif file_path is not None and x_accel_redirect_prefix:
+                response = HttpResponse()
+                response['X-Accel-Redirect'] = x_accel_redirect_prefix.rstrip('/') + '/' + get_disk_cache_relative_path(
+                    content.content_digest
+                )
+            elif request.META.get('HTTP_RANGE'):
                 # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
+                if isinstance(content, StaticContent) and file_path is None:
                     content = AssetManager.find(loc, as_stream=True)
 
                 header_value = request.META['HTTP_RANGE']
@@ -149,19 +206,46 @@ class StaticContentServer(MiddlewareMixin):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
-                        )
                     else:
-                        first, last = ranges[0]
+                        # The unsatisfiable ranges are ignored, and the overlapping ones are coalesced.
+                        ranges = coalesce_ranges([
+                            (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                        ])
+                        if file_path is not None:
+                            read_range = partial(read_file_range, file_path)
+                        else:
+                            read_range = content.stream_data_in_range
+
+                        if not ranges:
+                            log.warning(
+                                "Cannot satisfy ranges in Range header: %s for content: %s",
+                                header_value, str(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        elif len(ranges) > MAX_BYTE_RANGES:
+                            log.warning(
+                                "More than %d ranges in Range header: %s for content: %s",
+                                MAX_BYTE_RANGES, header_value, str(loc)
+                            )
+                        elif len(ranges) > 1:
+                            # Multiple ranges are sent as a multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            boundary = uuid4().hex
+                            body_length, body = multipart_byteranges(
+                                ranges, content.content_type, content.length, read_range, boundary
+                            )
+                            response = StreamingHttpResponse(body, status=206)  # Partial Content
+                            response['Content-Length'] = str(body_length)
+                            content_type = f'multipart/byteranges; boundary={boundary}'
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            if newrelic:
+                                newrelic.agent.add_custom_attribute('contentserver.ranged', True)
+                        else:
+                            first, last = ranges[0]
+                            if file_path is not None:
+                                response = StreamingHttpResponse(read_range(first, last))
+                            else:
+                                response = HttpResponse(read_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -170,16 +254,16 @@ class StaticContentServer(MiddlewareMixin):
 
                             if newrelic:
                                 newrelic.agent.add_custom_attribute('contentserver.ranged', True)
-                        else:
-                            log.warning(
-                                "Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, str(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if file_path is not None:
+                    # The file is sent with the server's wsgi.file_wrapper, e.g. with sendfile under gunicorn.
+                    response = FileResponse(open(file_path, 'rb'))  # pylint: disable=consider-using-with
+                    # Don't send the name of the cached file.
+                    del response['Content-Disposition']
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -188,7 +272,7 @@ class StaticContentServer(MiddlewareMixin):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -225,6 +309,9 @@ class StaticContentServer(MiddlewareMixin):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        etag = get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -278,10 +365,13 @@ class StaticContentServer(MiddlewareMixin):
 
         return True
 
-    def load_asset_from_location(self, location):
+    def load_asset_from_location(self, location, fill_cache=True):
         """
         Loads an asset based on its location, either retrieving it from a cache
         or loading it directly from the contentstore.
+
+        If fill_cache is False, an asset loaded from the contentstore is not
+        read into memory nor cached.
         """
 
         # See if we can load this item from cache.
@@ -296,13 +386,99 @@ class StaticContentServer(MiddlewareMixin):
             # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
             # because it's the default for memcached and also we don't want to do too much
             # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            if fill_cache and content.length is not None and content.length < 1048576:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
 
         return content
 
 
+def get_etag(content):
+    """
+    Returns the ETag of the given content, based on its md5 digest, or None if it has no digest.
+    """
+    content_digest = getattr(content, 'content_digest', None)
+    return quote_etag(content_digest) if content_digest else None
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Returns whether the value of an If-None-Match header matches the given ETag.
+    """
+    etags = parse_etags(if_none_match)
+    return etags == ['*'] or etag in etags
+
+
+def coalesce_ranges(ranges):
+    """
+    Returns the given (first, last) byte ranges, sorted, with the overlapping and adjacent ranges merged.
+    """
+    coalesced = []
+    for first, last in sorted(ranges):
+        if coalesced and first <= coalesced[-1][1] + 1:
+            coalesced[-1] = (coalesced[-1][0], max(last, coalesced[-1][1]))
+        else:
+            coalesced.append((first, last))
+    return coalesced
+
+
+def multipart_byteranges(ranges, content_type, content_length, read_range, boundary):
+    """
+    Returns the length and an iterator over the chunks of a multipart/byteranges body holding the given
+    byte ranges of a content.
+
+    Arguments:
+        ranges (list): The (first, last) byte ranges of the content.
+        content_type (str): The content type of the content.
+        content_length (int): The length of the content.
+        read_range (function): Returns an iterator over the chunks of the bytes of the content from
+            first to last included, given first and last.
+        boundary (str): The boundary between the parts of the body.
+    """
+    parts = [
+        (
+            (
+                f'--{boundary}\r\n'
+                f'Content-Type: {content_type}\r\n'
+                f'Content-Range: bytes {first}-{last}/{content_length}\r\n\r\n'
+            ).encode('utf-8'),
+            first,
+            last,
+        )
+        for first, last in ranges
+    ]
+    trailer = f'--{boundary}--\r\n'.encode('utf-8')
+    body_length = sum(len(headers) + last - first + 1 + 2 for headers, first, last in parts) + len(trailer)
+
+    def body():
+        for headers, first, last in parts:
+            yield headers
+            yield from read_range(first, last)
+            yield b'\r\n'
+        yield trailer
+
+    return body_length, body()
+
+
+def read_file_range(file_path, first_byte, last_byte):
+    """
+    Yields the bytes of the file from first_byte to last_byte included, in chunks.
+
+    The chunks are read with os.pread, at their offset in the file, without seeking.
+    """
+    file_descriptor = os.open(file_path, os.O_RDONLY)
+    try:
+        position = first_byte
+        while position <= last_byte:
+            chunk = os.pread(file_descriptor, min(DISK_CACHE_READ_CHUNK_SIZE, last_byte + 1 - position), position)
+            if not chunk:
+                break
+            yield chunk
+            position += len(chunk)
+    finally:
+        os.close(file_descriptor)
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -7,6 +7,9 @@ import copy
 
 import datetime
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 from uuid import uuid4
@@ -28,7 +31,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import UserFactory, AdminFactory
 
-from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from ..middleware import coalesce_ranges, parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
 
@@ -103,6 +106,15 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         cls.url_unlocked_versioned_old_style = get_old_style_versioned_asset_url(cls.url_unlocked)
         cls.length_unlocked = cls.contentstore.get_attr(cls.unlocked_asset, 'length')
 
+        # An asset too large for the django cache
+        cls.large_asset = cls.course_key.make_asset_key('asset', 'large_asset.bin')
+        cls.url_large = '/' + str(cls.large_asset)
+        cls.large_data = bytes(range(256)) * 8192
+        cls.contentstore.save(
+            StaticContent(cls.large_asset, 'large_asset.bin', 'application/octet-stream', cls.large_data)
+        )
+        cls.large_digest = cls.contentstore.get_attr(cls.large_asset, 'md5')
+
     def setUp(self):
         """
         Create user and login.
@@ -255,6 +267,84 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert 'Content-Range' not in resp
         assert resp['Content-Length'] == str(self.length_unlocked)
 
+    def test_multipart_range_request(self):
+        """
+        Test that multiple ranges are sent as a multipart/byteranges response.
+        """
+        resp = self.client.get(self.url_large, HTTP_RANGE='bytes=0-9, 1000-1099, -10')
+        assert resp.status_code == 206
+        assert 'Content-Range' not in resp
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        assert content_type == 'multipart/byteranges'
+
+        body = b''.join(resp.streaming_content)
+        assert resp['Content-Length'] == str(len(body))
+        parts = body.split(f'--{boundary}'.encode('utf-8'))
+        assert parts[0] == b'' and parts[-1] == b'--\r\n'
+        length = len(self.large_data)
+        for part, (first, last) in zip(parts[1:-1], [(0, 9), (1000, 1099), (length - 10, length - 1)]):
+            headers, data = part.split(b'\r\n\r\n', 1)
+            assert f'Content-Range: bytes {first}-{last}/{length}'.encode('utf-8') in headers
+            assert b'Content-Type: application/octet-stream' in headers
+            assert data == self.large_data[first:last + 1] + b'\r\n'
+
+    def test_multipart_range_request_overlapping_ranges(self):
+        """
+        Test that overlapping ranges are coalesced, and that unsatisfiable ranges are ignored.
+        """
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_RANGE='bytes=0-9, 5-14, {first}-'.format(first=self.length_unlocked),
+        )
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 0-14/{self.length_unlocked}'
+        assert resp['Content-Length'] == '15'
+
+    def test_etag(self):
+        """
+        Test that assets are sent with an ETag based on their digest, and that requests
+        matching the ETag get a 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        etag = resp['ETag']
+        last_modified = resp['Last-Modified']
+        assert etag == '"{}"'.format(self.contentstore.get_attr(self.unlocked_asset, 'md5'))
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        assert resp.status_code == 304
+        assert resp['ETag'] == etag
+
+        # If-None-Match takes precedence over If-Modified-Since
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH='"other"', HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        assert resp.status_code == 200
+
+    def test_head_request(self):
+        """
+        Test that HEAD requests get the headers of the asset without reading its data.
+        """
+        with patch('xmodule.contentstore.content.StaticContentStream.stream_data') as mock_stream_data:
+            resp = self.client.head(self.url_large)
+        assert resp.status_code == 200
+        assert resp['Content-Length'] == str(len(self.large_data))
+        assert resp['Content-Type'] == 'application/octet-stream'
+        assert resp['ETag'] == f'"{self.large_digest}"'
+        assert resp.content == b''
+        assert not mock_stream_data.called
+
+    def test_head_request_small_asset(self):
+        """
+        Test that HEAD requests don't read small assets into the cache.
+        """
+        with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None):
+            with patch('xmodule.contentstore.content.StaticContentStream.copy_to_in_mem') as mock_copy_to_in_mem:
+                resp = self.client.head(self.url_unlocked)
+        assert resp.status_code == 200
+        assert resp.content == b''
+        assert not mock_copy_to_in_mem.called
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
@@ -296,6 +386,66 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert resp.status_code == 200
         assert 'Origin' == resp['Vary']
 
+    def enable_disk_cache(self):
+        """
+        Enables the disk cache of assets in a temporary directory, and returns the directory.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        override = override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        return cache_dir
+
+    def test_disk_cached_asset(self):
+        """
+        Test that large assets are written to the disk cache, and served from the cached file.
+        """
+        cache_dir = self.enable_disk_cache()
+        for _ in range(2):
+            resp = self.client.get(self.url_large)
+            assert resp.status_code == 200
+            assert resp['Content-Length'] == str(len(self.large_data))
+            assert resp['Content-Type'] == 'application/octet-stream'
+            assert 'Content-Disposition' not in resp
+            assert b''.join(resp.streaming_content) == self.large_data
+            resp.close()
+
+        with open(os.path.join(cache_dir, self.large_digest[:2], self.large_digest), 'rb') as cached_file:
+            assert cached_file.read() == self.large_data
+
+    def test_disk_cached_asset_range(self):
+        """
+        Test that byte ranges of large assets are read from the disk cache.
+        """
+        self.enable_disk_cache()
+        resp = self.client.get(self.url_large, HTTP_RANGE='bytes=1000-199999')
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 1000-199999/{len(self.large_data)}'
+        assert resp['Content-Length'] == '199000'
+        assert b''.join(resp.streaming_content) == self.large_data[1000:200000]
+
+    def test_disk_cached_asset_x_accel_redirect(self):
+        """
+        Test that large assets are sent by nginx when an X-Accel-Redirect location is configured.
+        """
+        self.enable_disk_cache()
+        with override_settings(COURSE_ASSETS_DISK_CACHE_X_ACCEL_REDIRECT_PREFIX='/cached-assets/'):
+            resp = self.client.get(self.url_large, HTTP_RANGE='bytes=0-99')
+        assert resp.status_code == 200
+        assert resp['X-Accel-Redirect'] == f'/cached-assets/{self.large_digest[:2]}/{self.large_digest}'
+        assert resp['Content-Type'] == 'application/octet-stream'
+        assert resp.content == b''
+
+    def test_small_asset_not_disk_cached(self):
+        """
+        Test that the assets cached by the django cache aren't written to the disk cache.
+        """
+        cache_dir = self.enable_disk_cache()
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        assert not os.listdir(cache_dir)
+
     @patch('openedx.core.djangoapps.contentserver.models.CourseAssetCacheTtlConfig.get_cache_ttl')
     def test_cache_headers_with_ttl_unlocked(self, mock_get_cache_ttl):
         """
@@ -449,3 +599,14 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegex(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+    @ddt.data(
+        ([(100, 199)], [(100, 199)]),
+        ([(200, 299), (100, 199)], [(100, 299)]),
+        ([(100, 199), (150, 249), (300, 399)], [(100, 249), (300, 399)]),
+        ([(9900, 9999), (9800, 9999)], [(9800, 9999)]),
+        ([(0, 9999), (100, 199)], [(0, 9999)]),
+    )
+    @ddt.unpack
+    def test_coalesce_ranges(self, ranges, expected_ranges):
+        assert coalesce_ranges(ranges) == expected_ranges
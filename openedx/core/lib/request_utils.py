@@ -14,6 +14,7 @@ from opaque_keys.edx.keys import CourseKey
 from rest_framework.views import exception_handler
 
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from xmodule.mongo_utils import get_request_query_stats
 
 # accommodates course api urls, excluding any course api routes that do not fall under v*/courses, such as v1/blocks.
 COURSE_REGEX = re.compile(fr'^(.*?/course(s)?/)(?!v[0-9]+/[^/]+){settings.COURSE_ID_PATTERN}')
@@ -336,3 +337,51 @@ def _log_and_monitor_ignored_errors(request, exception, caller):
             request_path,
             exc_info=exc_info,
         )
+
+
+class MongoQueryBudgetMiddleware:
+    """
+    Middleware to monitor the number and the total duration of the MongoDB queries of each
+    request, and to log the requests exceeding the configured query budgets, which usually
+    come from N+1 modulestore access patterns.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        query_count, query_time = get_request_query_stats()
+        if not query_count:
+            return response
+
+        # .. custom_attribute_name: mongo_query_count
+        # .. custom_attribute_description: The number of MongoDB commands run by the request.
+        set_custom_attribute('mongo_query_count', query_count)
+        # .. custom_attribute_name: mongo_query_time_ms
+        # .. custom_attribute_description: The total duration, in milliseconds, of the MongoDB commands
+        #   run by the request.
+        set_custom_attribute('mongo_query_time_ms', round(query_time))
+
+        # .. setting_name: MONGO_REQUEST_QUERY_COUNT_BUDGET
+        # .. setting_default: None
+        # .. setting_description: Number of MongoDB queries a request may run before it is logged as
+        #   exceeding its query budget. Use None to not log requests by their number of queries.
+        count_budget = getattr(settings, 'MONGO_REQUEST_QUERY_COUNT_BUDGET', None)
+        # .. setting_name: MONGO_REQUEST_QUERY_TIME_BUDGET_MS
+        # .. setting_default: None
+        # .. setting_description: Total duration, in milliseconds, of the MongoDB queries a request may
+        #   run before it is logged as exceeding its query budget. Use None to not log requests by the
+        #   duration of their queries.
+        time_budget = getattr(settings, 'MONGO_REQUEST_QUERY_TIME_BUDGET_MS', None)
+        if (
+            (count_budget is not None and query_count > count_budget) or
+            (time_budget is not None and query_time > time_budget)
+        ):
+            log.warning(
+                'Request to %s exceeded its MongoDB query budget: %d queries taking %d ms',
+                request.path,
+                query_count,
+                query_time,
+            )
+        return response
@@ -11,8 +11,11 @@ from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 
+from xmodule.mongo_utils import REQUEST_QUERY_STATS_NAMESPACE
+
 from openedx.core.lib.request_utils import (
     IgnoredErrorMiddleware,
+    MongoQueryBudgetMiddleware,
     _get_ignored_error_settings_dict,
     clear_cached_ignored_error_settings,
     course_id_from_url,
@@ -429,3 +432,64 @@ class TestIgnoredErrorExceptionHandler(unittest.TestCase):
             ],
             any_order=True
         )
+
+
+@ddt.ddt
+class TestMongoQueryBudgetMiddleware(unittest.TestCase):
+    """
+    Tests for MongoQueryBudgetMiddleware
+    """
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        self.mock_request = RequestFactory().get('/test')
+        self.expected_response = Mock()
+
+    def _run_queries(self, count, duration_micros):
+        """
+        Return a get_response function recording the given MongoDB queries.
+        """
+        def get_response(request):  # pylint: disable=unused-argument
+            RequestCache(REQUEST_QUERY_STATS_NAMESPACE).data.update(count=count, duration_micros=duration_micros)
+            return self.expected_response
+        return get_response
+
+    @patch('openedx.core.lib.request_utils.set_custom_attribute')
+    @patch('openedx.core.lib.request_utils.log')
+    def test_no_queries(self, mock_logger, mock_set_custom_attribute):
+        response = MongoQueryBudgetMiddleware(lambda _: self.expected_response)(self.mock_request)
+
+        assert response == self.expected_response
+        mock_set_custom_attribute.assert_not_called()
+        mock_logger.warning.assert_not_called()
+
+    @ddt.data(
+        (None, None, False),
+        (10, None, False),
+        (9, None, True),
+        (None, 30, False),
+        (None, 29, True),
+        (10, 29, True),
+    )
+    @ddt.unpack
+    @patch('openedx.core.lib.request_utils.set_custom_attribute')
+    @patch('openedx.core.lib.request_utils.log')
+    def test_query_budgets(self, count_budget, time_budget, exceeded, mock_logger, mock_set_custom_attribute):
+        with override_settings(
+            MONGO_REQUEST_QUERY_COUNT_BUDGET=count_budget,
+            MONGO_REQUEST_QUERY_TIME_BUDGET_MS=time_budget,
+        ):
+            response = MongoQueryBudgetMiddleware(self._run_queries(10, 29600))(self.mock_request)
+
+        assert response == self.expected_response
+        mock_set_custom_attribute.assert_has_calls([
+            call('mongo_query_count', 10),
+            call('mongo_query_time_ms', 30),
+        ])
+        if exceeded:
+            mock_logger.warning.assert_called_once_with(
+                'Request to %s exceeded its MongoDB query budget: %d queries taking %d ms', '/test', 10, 29.6,
+            )
+        else:
+            mock_logger.warning.assert_not_called()
@@ -32,8 +32,9 @@ class EffortEstimationTransformer(BlockStructureTransformer):
     This transformer requires data gathered during the collection phase (from a course publish), so it won't work
     on a course until the next publish.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     # Public xblock field names
     EFFORT_ACTIVITIES = 'effort_activities'
@@ -41,6 +42,7 @@ class EffortEstimationTransformer(BlockStructureTransformer):
 
     # Private transformer field names
     DISABLE_ESTIMATION = 'disable_estimation'
+    MISSING_DATA_BLOCKS = 'missing_data_blocks'
     HTML_WORD_COUNT = 'html_word_count'
     VIDEO_CLIP_DURATION = 'video_clip_duration'
     VIDEO_DURATION = 'video_duration'
@@ -74,18 +76,33 @@ class EffortEstimationTransformer(BlockStructureTransformer):
             'video': cls._collect_video_effort,
         }
 
-        try:
-            for block_key in block_structure.topological_traversal():
-                xblock = block_structure.get_xblock(block_key)
+        # In an incremental collect, the blocks that are not re-collected keep their previously collected data,
+        # so they are still missing data if they were before. Blocks removed from the course are only dropped
+        # from this set by a full collect, which errs on the side of not showing estimates.
+        missing_data_blocks = {
+            block_key
+            for block_key in block_structure.get_transformer_data(cls, cls.MISSING_DATA_BLOCKS, default=set())
+            if block_key not in block_structure
+        }
+
+        for block_key in block_structure.topological_traversal():
+            xblock = block_structure.get_xblock(block_key)
 
-                if xblock.category in collections:
+            if xblock.category in collections:
+                try:
                     collections[xblock.category](block_structure, block_key, xblock, collection_cache)
+                except cls.MissingEstimationData:
+                    missing_data_blocks.add(block_key)
 
-        except cls.MissingEstimationData:
+        block_structure.set_transformer_data(cls, cls.MISSING_DATA_BLOCKS, missing_data_blocks)
+        if missing_data_blocks:
             # Some bit of required data is missing. Likely some duration info is missing from the video pipeline.
             # Rather than attempt to work around it, just set a note for ourselves to not show durations for this
             # course at all. Better no estimate than a misleading estimate.
             block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, True)
+        elif block_structure.get_transformer_data(cls, cls.DISABLE_ESTIMATION, default=False):
+            # The data that was missing when the course was previously collected is no longer missing.
+            block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, False)
 
     @classmethod
     def _collect_html_effort(cls, block_structure, block_key, xblock, _cache):
@@ -1,5 +1,6 @@
 """Tests for effort_estimation transformers."""
 
+from copy import deepcopy
 from datetime import timedelta
 
 from crum import set_current_request
@@ -135,6 +136,35 @@ class TestEffortEstimationTransformer(ModuleStoreTestCase):
         assert self.block_structure.get_xblock_field(self.subsection_key, EFFORT_ACTIVITIES) is None
         assert self.block_structure.get_xblock_field(self.subsection_key, EFFORT_TIME) is None
 
+    def collect_incrementally(self, changed_block_key):
+        """Re-collect the given block and its ancestors, starting with the previously collected transformer data"""
+        ancestor_keys = [self.course_usage_key, self.section_key, self.subsection_key, self.vertical_key]
+        partial_block_structure, _ = BlockStructureFactory.create_partial_from_modulestore(
+            self.course_usage_key,
+            self.store,
+            {(changed_block_key.block_type, changed_block_key.block_id)},
+            {(block_key.block_type, block_key.block_id) for block_key in ancestor_keys},
+        )
+        partial_block_structure.transformer_data = deepcopy(self.block_structure.transformer_data)
+        self.block_structure = partial_block_structure
+        self.collect()
+
+    def test_incremental_collection(self):
+        """Ensure that blocks missing data still prevent estimates when other blocks are re-collected"""
+        remove_video_for_course(str(self.course_key), 'edxval3')
+        self.collect()
+
+        self.collect_incrementally(self.html_key)
+        assert self.get_collection_field(self.html_key, HTML_WORD_COUNT) == 2
+        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is True
+
+        video = self.store.get_item(self.video_web_key)
+        video.edx_video_id = 'edxval2'
+        self.store.update_item(video, self.user.id)
+        self.collect_incrementally(self.video_web_key)
+        assert self.get_collection_field(self.video_web_key, VIDEO_DURATION) == 30
+        assert not self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION)
+
     @override_waffle_flag(EFFORT_ESTIMATION_DISABLED_FLAG, True)
     def test_disabled(self):
         self.collect_and_transform()
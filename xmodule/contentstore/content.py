@@ -358,10 +358,14 @@ class ContentStore:
     def find(self, filename):
         raise NotImplementedError
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(
+        self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, cursor=None,
+    ):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
         By default all assets are returned, but start and maxresults can be provided to limit the query.
+        A cursor returned by get_next_content_cursor can be provided instead of start, for the stores
+        supporting it.
 
         The return format is a list of asset data dictionaries.
         The asset data dictionaries have the following keys:
@@ -373,6 +377,13 @@ class ContentStore:
         '''
         raise NotImplementedError
 
+    def get_next_content_cursor(self, assets, sort, start=0, filter_params=None):
+        """
+        Return the cursor of the assets following the given page of assets, starting at
+        the given index, or None if the store doesn't paginate assets with cursors.
+        """
+        return None
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
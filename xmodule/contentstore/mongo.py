@@ -3,12 +3,21 @@ MongoDB/GridFS-level code for the contentstore.
 """
 
 
+import base64
+import binascii
+import hashlib
+import io
 import json
 import os
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import gridfs
 import pymongo
+from bson import json_util
 from bson.son import SON
+from django.conf import settings
 from fs.osfs import OSFS
 from gridfs.errors import NoFile, FileExists
 from mongodb_proxy import autoretry_read
@@ -22,6 +31,21 @@ from xmodule.util.misc import escape_invalid_characters, get_library_or_course_a
 
 from .content import ContentStore, StaticContent, StaticContentStream
 
+# Number of threads fetching assets from GridFS while exporting them to a tarfile.
+EXPORT_ASSET_FETCH_WORKERS = 8
+
+# Assets larger than this are not fetched ahead by the export threads, but are
+# streamed from GridFS into the tarfile, so that the memory used by an export
+# stays bounded.
+EXPORT_PREFETCHED_ASSET_MAX_SIZE = 8 * 1024 * 1024
+
+# The fields of the asset metadata documents identifying the course and category of
+# the asset, which are not fields of the GridFS files.
+ASSET_METADATA_KEY_FIELDS = ('org', 'course', 'run', 'category', 'insensitive_displayname')
+
+# Number of asset metadata documents written by each query of backfill_asset_metadata.
+ASSET_METADATA_BACKFILL_BATCH_SIZE = 1000
+
 
 class MongoContentStore(ContentStore):
     """
@@ -50,6 +74,9 @@ class MongoContentStore(ContentStore):
 
         self.fs_files = mongo_db[bucket + ".files"]  # the underlying collection GridFS uses
         self.chunks = mongo_db[bucket + ".chunks"]
+        # A copy of the attributes of the assets in fs_files, along with the course and
+        # category of each asset, see use_asset_metadata_index.
+        self.asset_metadata = mongo_db[bucket + ".asset_metadata"]
 
     def close_connections(self):
         """
@@ -76,9 +103,11 @@ class MongoContentStore(ContentStore):
         elif collections:
             self.fs_files.drop()
             self.chunks.drop()
+            self.asset_metadata.drop()
         else:
             self.fs_files.remove({})
             self.chunks.remove({})
+            self.asset_metadata.remove({})
 
         if connections:
             self.close_connections()
@@ -114,6 +143,7 @@ class MongoContentStore(ContentStore):
                 else:
                     fp.write(content.data)
 
+        self._save_asset_metadata(fp._file)  # pylint: disable=protected-access
         return content
 
     def delete(self, location_or_id):
@@ -124,6 +154,7 @@ class MongoContentStore(ContentStore):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
+        self.asset_metadata.delete_one({'_id': location_or_id})
 
     @autoretry_read()
     def find(self, location, throw_on_not_found=True, as_stream=False):  # lint-amnesty, pylint: disable=arguments-differ
@@ -184,14 +215,19 @@ class MongoContentStore(ContentStore):
         if not os.path.exists(output_directory):
             os.makedirs(output_directory)
 
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
-
         disk_fs = OSFS(output_directory)
 
-        with disk_fs.open(export_name, 'wb') as asset_file:
+        with disk_fs.open(self._export_name(filename), 'wb') as asset_file:
             asset_file.write(content.data)
 
+    @staticmethod
+    def _export_name(filename):
+        """
+        Return the name of the file to which an asset with the given name is exported.
+        """
+        # Escape invalid char from filename.
+        return escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
@@ -203,7 +239,6 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
-        policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
@@ -216,21 +251,171 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(self._export_policy(assets), f, sort_keys=True, indent=4)
+
+    def export_all_for_course_to_tar(self, course_key, tar_file, static_dir):
+        """
+        Export all of this course's assets into a tarfile, as export_all_for_course
+        does into a directory, and return the assets' attributes to be written to
+        the policy file.
+
+        The assets are fetched from GridFS by a pool of threads, ahead of being
+        written to the tarfile in order. Assets larger than
+        EXPORT_PREFETCHED_ASSET_MAX_SIZE are streamed from GridFS instead.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            tar_file (tarfile.TarFile): the tarfile, opened for writing
+            static_dir (str): the path, in the tarfile, under which to put all the asset files
+        """
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        with ThreadPoolExecutor(max_workers=EXPORT_ASSET_FETCH_WORKERS) as executor:
+            # Keep a bounded number of assets fetched ahead of the one being written.
+            pending = deque()
+            asset_iterator = iter(assets)
+            for asset in asset_iterator:
+                pending.append((asset, self._fetch_for_export(executor, asset)))
+                if len(pending) >= 2 * EXPORT_ASSET_FETCH_WORKERS:
+                    break
+
+            while pending:
+                asset, future = pending.popleft()
+                next_asset = next(asset_iterator, None)
+                if next_asset is not None:
+                    pending.append((next_asset, self._fetch_for_export(executor, next_asset)))
+
+                if future is not None:
+                    content = future.result()
+                    asset_file = io.BytesIO(content.data)
+                    size = len(content.data)
+                else:
+                    content = self.find(asset['asset_key'], as_stream=True)
+                    asset_file = content._stream  # pylint: disable=protected-access
+                    size = content.length
+
+                directory = static_dir
+                if content.import_path is not None:
+                    directory = directory + '/' + os.path.dirname(content.import_path)
+                asset_info = tarfile.TarInfo(os.path.normpath(directory + '/' + self._export_name(content.name)))
+                asset_info.size = size
+                asset_info.mtime = content.last_modified_at.timestamp() if content.last_modified_at else 0
+                try:
+                    tar_file.addfile(asset_info, asset_file)
+                finally:
+                    asset_file.close()
+
+        return self._export_policy(assets)
+
+    def _fetch_for_export(self, executor, asset):
+        """
+        Submit the fetching of the given asset to the executor, unless it is too
+        large to be fetched ahead. Return the future of its StaticContent, or None.
+        """
+        if asset.get('length', 0) > EXPORT_PREFETCHED_ASSET_MAX_SIZE:
+            return None
+        return executor.submit(self.find, asset['asset_key'])
+
+    @staticmethod
+    def _export_policy(assets):
+        """
+        Return the exported attributes of the given assets, keyed on their names.
+        """
+        policy = {}
+        for asset in assets:
             for attr, value in asset.items():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
-
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(
+        self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, cursor=None,
+    ):
         return self._get_all_content_for_course(
-            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
+            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort,
+            filter_params=filter_params, cursor=cursor,
         )
 
+    def get_next_content_cursor(self, assets, sort, start=0, filter_params=None):
+        """
+        Return the cursor of the assets following the given page of assets, returned by
+        get_all_content_for_course with the given sort, start and filter_params, or None
+        if the assets can't be paginated with cursors.
+
+        The cursor only locates the page following the given page with the same sort and
+        filters; it is ignored by the queries of other pages, sorts or filters.
+        """
+        if not assets or not self.use_asset_metadata_index() or not sort or len(sort) != 1:
+            return None
+        sort_field = next(iter(dict(sort)))
+        last_asset = assets[-1]
+        if sort_field == 'displayname':
+            sort_value = _insensitive_displayname(last_asset)
+        else:
+            sort_value = last_asset.get(sort_field)
+        cursor = {
+            'start': start + len(assets),
+            'sort': [list(sort_item) for sort_item in sort],
+            'filter': _filter_digest(filter_params),
+            'after': [sort_value, last_asset['_id']],
+        }
+        return base64.urlsafe_b64encode(json_util.dumps(cursor).encode('utf-8')).decode()
+
+    @staticmethod
+    def use_asset_metadata_index():
+        """
+        Return whether the assets of courses are listed from the asset metadata collection.
+        """
+        # .. toggle_name: CONTENTSTORE_USE_ASSET_METADATA_INDEX
+        # .. toggle_implementation: DjangoSetting
+        # .. toggle_default: False
+        # .. toggle_description: List the assets of courses from the asset metadata collection, which is
+        #   indexed by course and sort key and supports cursor pagination, instead of querying the GridFS
+        #   files. The collection is kept up to date as assets are changed; the metadata of the existing
+        #   assets must be copied to it with the backfill_asset_metadata command before enabling this.
+        # .. toggle_use_cases: opt_in
+        # .. toggle_creation_date: 2026-10-17
+        return getattr(settings, 'CONTENTSTORE_USE_ASSET_METADATA_INDEX', False)
+
+    def backfill_asset_metadata(self, course_key=None):
+        """
+        Copy the attributes of the assets of the given course, or of all courses, to the
+        asset metadata collection. Returns the number of assets copied.
+        """
+        if course_key is None:
+            query = {'$or': [{f'{prefix}.tag': XASSET_LOCATION_TAG} for prefix in ('_id', 'content_son')]}
+        else:
+            query = query_for_course(course_key)
+
+        count = 0
+        requests = []
+        for fs_file in self.fs_files.find(query):
+            metadata = _asset_metadata(fs_file)
+            if metadata is None:
+                continue
+            requests.append(pymongo.ReplaceOne({'_id': metadata['_id']}, metadata, upsert=True))
+            if len(requests) >= ASSET_METADATA_BACKFILL_BATCH_SIZE:
+                self.asset_metadata.bulk_write(requests, ordered=False)
+                count += len(requests)
+                requests = []
+        if requests:
+            self.asset_metadata.bulk_write(requests, ordered=False)
+            count += len(requests)
+        return count
+
+    def _save_asset_metadata(self, fs_file):
+        """
+        Copy the attributes of the given GridFS file to the asset metadata collection.
+        """
+        metadata = _asset_metadata(fs_file)
+        if metadata is not None:
+            self.asset_metadata.replace_one({'_id': metadata['_id']}, metadata, upsert=True)
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
@@ -246,6 +431,7 @@ class MongoContentStore(ContentStore):
             items = self.fs_files.find(query)
             for asset in items:
                 self.fs.delete(asset[prefix])
+                self.asset_metadata.delete_one({'_id': asset['_id']})
                 assets_to_delete += 1
 
             self.fs_files.remove(query)
@@ -258,7 +444,8 @@ class MongoContentStore(ContentStore):
                                     start=0,
                                     maxresults=-1,
                                     sort=None,
-                                    filter_params=None):
+                                    filter_params=None,
+                                    cursor=None):
         '''
         Returns a list of all static assets for a course. The return format is a list of asset data dictionary elements.
 
@@ -269,6 +456,16 @@ class MongoContentStore(ContentStore):
             contentType: The mimetype string of the asset
             md5: An md5 hash of the asset content
         '''
+        if self.use_asset_metadata_index():
+            assets, count = self._get_content_from_asset_metadata(
+                course_key, 'asset' if not get_thumbnails else 'thumbnail', start, maxresults, sort, filter_params,
+                cursor,
+            )
+            for asset in assets:
+                asset_id = asset.get('content_son', asset['_id'])
+                asset['asset_key'] = course_key.make_asset_key(asset_id['category'], asset_id['name'])
+            return assets, count
+
         # TODO: Using an aggregate() instead of a find() here is a hack to get around the fact that Mongo 3.2 does not
         # support sorting case-insensitively.
         # If a sort on displayname is requested, the aggregation pipeline creates a new field:
@@ -339,6 +536,51 @@ class MongoContentStore(ContentStore):
             asset['asset_key'] = course_key.make_asset_key(asset_id['category'], asset_id['name'])
         return assets, count
 
+    def _get_content_from_asset_metadata(self, course_key, category, start, maxresults, sort, filter_params, cursor):
+        """
+        Return the page of the asset metadata of the given course and category, and the
+        total number of matching assets.
+
+        The page is the one following the given cursor, if it was returned for the page
+        preceding the given index with the given sort and filters, or the one starting at
+        the given index otherwise.
+        """
+        conditions = [SON([
+            ('org', course_key.org),
+            ('course', get_library_or_course_attribute(course_key)),
+            ('run', None if getattr(course_key, 'deprecated', False) else course_key.run),
+            ('category', category),
+        ])]
+        if filter_params:
+            conditions.append(filter_params)
+        query = {'$and': conditions} if len(conditions) > 1 else conditions[0]
+        count = self.asset_metadata.count_documents(query)
+
+        sort_spec = None
+        keyset_condition = None
+        if sort:
+            sort = list(dict(sort).items())
+            # Sort on the _id last, so that the order of the assets is stable and cursors
+            # point to a single asset.
+            sort_spec = [
+                ('insensitive_displayname' if sort_field == 'displayname' else sort_field, direction)
+                for sort_field, direction in sort
+            ]
+            sort_spec.append(('_id', sort_spec[-1][1]))
+            if cursor and len(sort) == 1:
+                keyset_condition = _keyset_condition(cursor, start, sort, filter_params, *sort_spec)
+
+        if keyset_condition is not None:
+            query = {'$and': conditions + [keyset_condition]}
+        results = self.asset_metadata.find(query, projection={field: 0 for field in ASSET_METADATA_KEY_FIELDS})
+        if sort_spec:
+            results = results.sort(sort_spec)
+        if keyset_condition is None and start:
+            results = results.skip(start)
+        if maxresults > 0:
+            results = results.limit(maxresults)
+        return list(results), count
+
     def set_attr(self, asset_key, attr, value=True):
         """
         Add/set the given attr on the asset at the given location. Does not allow overwriting gridFS built in
@@ -382,6 +624,10 @@ class MongoContentStore(ContentStore):
         result = self.fs_files.update_one({'_id': asset_db_key}, {"$set": attr_dict}, upsert=False)
         if result.matched_count == 0:
             raise NotFoundError(asset_db_key)
+        metadata_update = dict(attr_dict)
+        if 'displayname' in metadata_update:
+            metadata_update['insensitive_displayname'] = _insensitive_displayname(metadata_update)
+        self.asset_metadata.update_one({'_id': asset_db_key}, {"$set": metadata_update})
 
     @autoretry_read()
     def get_attrs(self, location):
@@ -456,6 +702,7 @@ class MongoContentStore(ContentStore):
             # getattr b/c caching may mean some pickled instances don't have attr
             locked=asset.get('locked', False)
         )
+        self._save_asset_metadata(self.fs_files.find_one({'_id': asset_id}))
 
     def delete_all_course_assets(self, course_key):
         """
@@ -468,6 +715,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+            self.asset_metadata.delete_one({'_id': asset_key})
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -601,6 +849,83 @@ class MongoContentStore(ContentStore):
             background=True
         )
 
+        # Indexes of the asset metadata, used by `_get_content_from_asset_metadata` for each sort of the
+        # Files & Uploads page, which also sorts on the _id to paginate with cursors.
+        for sort_field in ('uploadDate', 'insensitive_displayname'):
+            for direction in (pymongo.ASCENDING, pymongo.DESCENDING):
+                create_collection_index(
+                    self.asset_metadata,
+                    [
+                        ('org', pymongo.ASCENDING),
+                        ('course', pymongo.ASCENDING),
+                        ('run', pymongo.ASCENDING),
+                        ('category', pymongo.ASCENDING),
+                        (sort_field, direction),
+                        ('_id', direction),
+                    ],
+                    background=True
+                )
+
+
+def _asset_metadata(fs_file):
+    """
+    Return the asset metadata document of the given GridFS file, which adds the course
+    and category of the asset to the file's attributes, or None if the file isn't an
+    asset.
+    """
+    if fs_file is None:
+        return None
+    asset_id = fs_file.get('content_son', fs_file['_id'])
+    if not isinstance(asset_id, dict):
+        return None
+    metadata = dict(fs_file)
+    metadata.update(
+        org=asset_id.get('org'),
+        course=asset_id.get('course'),
+        run=asset_id.get('run'),
+        category=asset_id.get('category'),
+        insensitive_displayname=_insensitive_displayname(fs_file),
+    )
+    return metadata
+
+
+def _insensitive_displayname(asset):
+    """
+    Return the lowercase displayname of the given asset, on which assets are sorted by name.
+    """
+    return (asset.get('displayname') or '').lower()
+
+
+def _filter_digest(filter_params):
+    """
+    Return a digest of the given asset query filters, identifying them in cursors.
+    """
+    return hashlib.sha1(json_util.dumps(filter_params or {}, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _keyset_condition(cursor, start, sort, filter_params, sort_field, id_field):
+    """
+    Return the query condition matching the assets after the given cursor, in the order
+    of the given sort fields, or None if the cursor is not valid or wasn't returned for
+    the page preceding the given start index with the given sort and filters.
+    """
+    try:
+        cursor = json_util.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')))
+        sort_value, asset_id = cursor['after']
+        if (
+            cursor['start'] != start or
+            cursor['sort'] != [list(sort_item) for sort_item in sort] or
+            cursor['filter'] != _filter_digest(filter_params)
+        ):
+            return None
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        return None
+    operator = '$gt' if sort_field[1] == pymongo.ASCENDING else '$lt'
+    return {'$or': [
+        {sort_field[0]: {operator: sort_value}},
+        {sort_field[0]: sort_value, id_field[0]: {operator: asset_id}},
+    ]}
+
 
 def query_for_course(course_key, category=None):
     """
@@ -123,5 +123,48 @@
                 });
             });
         });
+
+        describe('Lazy units', function() {
+            beforeEach(function() {
+                var runtime = jasmine.createSpyObj('TestRuntime', ['handlerUrl']),
+                    $element = $('.xblock-student_view-sequential');
+                $element.attr('data-request-token', 'page-token');
+                $element.find('.sequence').attr('data-position', '1');
+                $element.find('#seq_content').after(
+                    '<div class="seq_contents">&lt;div class="xblock" data-request-token="page-token"&gt;' +
+                    '&lt;/div&gt;</div><div class="seq_contents" data-lazy="true"></div>'
+                );
+                spyOn($, 'postWithPrefix').and.returnValue($.Deferred().resolve({
+                    content: '<div class="xblock" data-request-token="handler-token"></div>',
+                    resources: []
+                }).promise());
+                this.sequence = new Sequence($element, runtime);
+            });
+
+            it('renders the unit on demand and initializes it without the page request token', function(done) {
+                var self = this;
+                this.sequence.render(2);
+                this.sequence.loadUnit(2).done(function() {
+                    expect($.postWithPrefix.calls.count()).toBe(1);
+                    expect(JSON.parse($.postWithPrefix.calls.mostRecent().args[1])).toEqual({position: 2});
+                    expect(self.sequence.position).toBe(2);
+                    expect(self.sequence.content_container.find('[data-request-token="handler-token"]').length)
+                        .toBe(1);
+                    expect(local.XBlock.initializeBlocks.calls.mostRecent().args)
+                        .toEqual([self.sequence.content_container]);
+
+                    self.sequence.render(1);
+                    expect(local.XBlock.initializeBlocks.calls.mostRecent().args)
+                        .toEqual([self.sequence.content_container, 'page-token']);
+
+                    // The unit is rendered only once.
+                    self.sequence.render(2);
+                    expect($.postWithPrefix.calls.count()).toBe(1);
+                    expect(local.XBlock.initializeBlocks.calls.mostRecent().args)
+                        .toEqual([self.sequence.content_container]);
+                    done();
+                });
+            });
+        });
     });
 }).call(this);
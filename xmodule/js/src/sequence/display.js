@@ -1,5 +1,5 @@
 /* eslint-disable no-underscore-dangle */
-/* globals Logger, interpolate */
+/* globals $script, Logger, interpolate, _ */
 
 (function() {
     'use strict';
@@ -56,6 +56,7 @@
             this.id = this.el.data('id');
             this.getCompletionUrl = runtime.handlerUrl(element, 'get_completion');
             this.gotoPositionUrl = runtime.handlerUrl(element, 'goto_position');
+            this.renderUnitUrl = runtime.handlerUrl(element, 'render_unit');
             this.nextUrl = this.el.data('next-url');
             this.prevUrl = this.el.data('prev-url');
             this.savePosition = this.el.data('save-position');
@@ -230,7 +231,22 @@
         Sequence.prototype.render = function(newPosition) {
             var bookmarked, currentTab, sequenceLinks,
                 self = this;
+            this.requestedPosition = newPosition;
             if (this.position !== newPosition) {
+                currentTab = this.contents.eq(newPosition - 1);
+                if (currentTab.data('lazy')) {
+                    // The units that weren't rendered with the sequence are rendered on demand.
+                    this.loadUnit(newPosition).done(function() {
+                        if (self.requestedPosition === newPosition) {
+                            self.render(newPosition);
+                        }
+                    }).fail(function() {
+                        if (self.requestedPosition === newPosition) {
+                            self.renderUnitError(newPosition);
+                        }
+                    });
+                    return;
+                }
                 if (this.position) {
                     this.mark_visited(this.position);
                     if (this.showCompletion) {
@@ -247,7 +263,6 @@
                 // Added for aborting video bufferization, see ../video/10_main.js
                 this.el.trigger('sequence:change');
                 this.mark_active(newPosition);
-                currentTab = this.contents.eq(newPosition - 1);
                 bookmarked = this.el.find('.active .bookmark-icon').hasClass('bookmarked');
 
                 // update the data-attributes with latest contents only for updated problems.
@@ -269,7 +284,12 @@
                             .data('attempts-used', latestResponse.attempts_used);
                     });
                 }
-                XBlock.initializeBlocks(this.content_container, this.requestToken);
+                if (currentTab.data('request')) {
+                    // The units rendered on demand carry the request token of the render_unit handler.
+                    XBlock.initializeBlocks(this.content_container);
+                } else {
+                    XBlock.initializeBlocks(this.content_container, this.requestToken);
+                }
 
                 // For embedded circuit simulator exercises in 6.002x
                 if (window.hasOwnProperty('update_schematics')) {
@@ -286,6 +306,101 @@
             }
         };
 
+        /**
+         * Displays an error in place of the unit at the given position, which couldn't be rendered.
+         * The unit stays lazy, so that it is requested again the next time the learner navigates to it.
+         */
+        Sequence.prototype.renderUnitError = function(newPosition) {
+            if (this.position) {
+                this.mark_visited(this.position);
+            }
+            this.el.trigger('sequence:change');
+            this.mark_active(newPosition);
+            this.content_container.empty().append(
+                $('<div class="unit-load-error" role="alert"></div>').text(
+                    gettext('This unit could not be loaded. Navigate to it again to retry.')
+                )
+            );
+            this.position = newPosition;
+            this.toggleArrows();
+            this.updatePageTitle();
+        };
+
+        /**
+         * Renders the unit at the given position, which wasn't rendered with the sequence, and loads
+         * the resources it depends upon. Returns a promise representing the rendering process.
+         */
+        Sequence.prototype.loadUnit = function(position) {
+            var self = this,
+                $unit = this.contents.eq(position - 1),
+                request;
+            if (!$unit.data('request')) {
+                request = $.postWithPrefix(this.renderUnitUrl, JSON.stringify({
+                    position: position
+                })).then(function(fragment) {
+                    return self.addFragmentResources(fragment.resources || []).then(function() {
+                        $unit.text(fragment.content);
+                    });
+                });
+                $unit.data('request', request);
+                request.done(function() {
+                    $unit.data('lazy', false);
+                }).fail(function() {
+                    $unit.removeData('request');
+                });
+            }
+            return $unit.data('request');
+        };
+
+        /**
+         * Loads the resources of a rendered unit into the page, one after the other, skipping the
+         * resources already loaded. Returns a promise representing the loading of the resources.
+         */
+        Sequence.prototype.addFragmentResources = function(resources) {
+            var self = this;
+            window.loadedXBlockResources = window.loadedXBlockResources || [];
+            return _.reduce(resources, function(loading, resource) {
+                return loading.then(function() {
+                    if (_.indexOf(window.loadedXBlockResources, resource.data) >= 0) {
+                        return null;
+                    }
+                    window.loadedXBlockResources.push(resource.data);
+                    return self.loadResource(resource);
+                });
+            }, $.Deferred().resolve().promise());
+        };
+
+        Sequence.prototype.loadResource = function(resource) {
+            // Units are given free-reign to add javascript and CSS to the page,
+            // so XSS escaping doesn't matter much in this context.
+            var loaded,
+                $head = $('head');
+            if (resource.mimetype === 'text/css') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<style type='text/css'>" + resource.data + '</style>');
+                } else if (resource.kind === 'url') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<link rel='stylesheet' href='" + resource.data + "' type='text/css'>");
+                }
+            } else if (resource.mimetype === 'application/javascript') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append('<script>' + resource.data + '</script>');
+                } else if (resource.kind === 'url') {
+                    loaded = $.Deferred();
+                    $script(resource.data, resource.data, function() {
+                        loaded.resolve();
+                    });
+                    return loaded.promise();
+                }
+            } else if (resource.mimetype === 'text/html' && resource.placement === 'head') {
+                // xss-lint: disable=javascript-jquery-append
+                $head.append(resource.data);
+            }
+            return $.Deferred().resolve().promise();
+        };
+
         Sequence.prototype.goto = function(event) {
             var alertTemplate, alertText, isBottomNav, newPosition, widgetPlacement;
             event.preventDefault();
@@ -616,6 +616,17 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    @strip_key
+    def get_changed_blocks(self, course_key, previous_version_guid, **kwargs):  # pylint: disable=unused-argument
+        """
+        Returns the usage keys of the blocks of the given course that changed since the
+        course's structure version previous_version_guid.
+
+        Raises NotImplementedError if the course's modulestore does not support versioned structures.
+        """
+        store = self._verify_modulestore_support(course_key, 'get_changed_blocks')
+        return store.get_changed_blocks(course_key, previous_version_guid)
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
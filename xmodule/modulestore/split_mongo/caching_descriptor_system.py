@@ -1,5 +1,6 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
+import copy
 import logging
 import sys
 import weakref
@@ -18,7 +19,7 @@ from xmodule.mako_block import MakoDescriptorSystem
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_data
+from xmodule.modulestore.inheritance import InheritanceMixin, InheritingFieldData, inheriting_field_data
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
@@ -304,7 +305,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
         )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
-            field_data = inheriting_field_data(kvs)
+            field_data = self._inheriting_field_data(block_key, kvs)
         else:
             field_data = KvsFieldData(kvs)
 
@@ -320,6 +321,29 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
         # runtime.service(block, "field-data") or block._field_data (deprecated) will load block._bound_field_data if
         # the block has been bound to a user, otherwise it returns the wrapped field data we just created above.
 
+    def _inheriting_field_data(self, block_key, kvs):
+        """
+        Return the field data of the block with the given key, inheriting the
+        inheritable settings of its ancestors.
+
+        The blocks of stored structures look up their inherited settings in
+        the memoized index of the structure, rather than by loading each of
+        their ancestors.
+        """
+        structure = self.course_entry.structure
+        if block_key in structure['blocks']:
+            get_structure_index = self.modulestore._get_structure_index  # pylint: disable=protected-access
+            structure_index = get_structure_index(self.course_entry)
+            if structure_index is not None:
+                return StructureInheritingFieldData(
+                    inheritable_names=InheritanceMixin.fields.keys(),  # pylint: disable=no-member
+                    kvs=kvs,
+                    block_key=block_key,
+                    structure=structure,
+                    structure_index=structure_index,
+                )
+        return inheriting_field_data(kvs)
+
     def get_edited_by(self, xblock):
         """
         See :meth: cms.lib.xblock.runtime.EditInfoRuntimeMixin.get_edited_by
@@ -425,3 +449,35 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
 
         block.add_aside(new_aside)
         return new_aside
+
+
+class StructureInheritingFieldData(InheritingFieldData):
+    """
+    An InheritingFieldData for the blocks of stored split structures, which
+    finds the ancestor setting an inheritable field in the StructureIndex of
+    the structure instead of loading each ancestor of the block in turn.
+    """
+
+    def __init__(self, block_key, structure, structure_index, **kwargs):
+        super().__init__(**kwargs)
+        self.block_key = block_key
+        self.structure = structure
+        self.structure_index = structure_index
+
+    def default(self, block, name):
+        """
+        The default for an inheritable name is the value set by the nearest
+        ancestor in the structure.
+        """
+        if name not in self.inheritable_names:
+            return super().default(block, name)
+
+        parents = self.structure_index.parents(self.structure).get(self.block_key)
+        if parents and parents[-1].type == 'library_content':
+            # Let InheritingFieldData decide whether to use the defaults copied from the library.
+            return super().default(block, name)
+
+        ancestor_key, value = self.structure_index.inherited_setting(self.structure, self.block_key, name)
+        if ancestor_key is None:
+            return KvsFieldData.default(self, block, name)
+        return copy.deepcopy(value)
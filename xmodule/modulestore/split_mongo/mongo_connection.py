@@ -6,20 +6,24 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 import datetime
 import logging
 import math
-import pickle
 import re
+import struct
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
+from threading import Lock
 from time import time
 
+import crum
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
 import pytz
 from mongodb_proxy import autoretry_read
 # Import this just to export it
-from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
+from pymongo.errors import BulkWriteError, DuplicateKeyError  # pylint: disable=unused-import
 from edx_django_utils import monitoring
 from edx_django_utils.cache import RequestCache
 
@@ -27,11 +31,30 @@ from common.djangoapps.split_modulestore_django.models import SplitModulestoreCo
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.shared_structure_cache import get_shared_structure_store
+from xmodule.modulestore.split_mongo.structure_codec import UnsupportedStructureFormat, get_structure_codec
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from openedx.core.lib.cache_utils import request_cached
 
 log = logging.getLogger(__name__)
 
+# memcached refuses items larger than 1MB by default, so larger structures are
+# cached in chunks of this size.
+STRUCTURE_CACHE_CHUNK_SIZE = 1000 * 1000
+
+# The data cached under the key of a chunked structure: a marker byte, which is
+# never the first byte of an encoded structure, the number of chunks, and the
+# CRC-32 of the encoded structure.
+CHUNK_MANIFEST = struct.Struct('<BII')
+CHUNK_MANIFEST_MARKER = 0xff
+
+# The code of the write errors of inserts of documents whose _id is already used.
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# The namespace of the request cache collecting the definitions the current request is
+# expected to get one at a time, see MongoPersistenceBackend.expect_definitions.
+DEFINITION_COLLECTOR_NAMESPACE = 'split_mongo_definition_collector'
+
 
 def get_cache(alias):
     """
@@ -193,10 +216,19 @@ def structure_to_mongo(structure, course_context=None):
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
-    The course structures are pickled and compressed when cached.
+    The course structures are encoded with the configured StructureCodec when cached.
 
-    If the 'course_structure_cache' doesn't exist, then don't do anything for
-    for set and get.
+    Encoded structures larger than STRUCTURE_CACHE_CHUNK_SIZE are split into
+    chunks, each cached under its own key, and a manifest of the chunks is
+    cached under the structure's key.
+
+    If COURSE_STRUCTURE_SHARED_CACHE is configured, the encoded structures
+    are also stored in a host-local tier shared by all worker processes,
+    which is checked before the django cache. Each process still decodes
+    the structures it gets from that tier.
+
+    If neither the 'course_structure_cache' nor the shared tier exist, then
+    don't do anything for set and get.
     """
     def __init__(self):
         self.cache = None
@@ -204,52 +236,86 @@ class CourseStructureCache:
             self.cache = get_cache('course_structure_cache')
         except InvalidCacheBackendError:
             pass
+        self.shared_store = get_shared_structure_store()
+        self.codec = get_structure_codec()
 
     def get(self, key, course_context=None):
-        """Pull the compressed, pickled struct data from cache and deserialize."""
-        if self.cache is None:
+        """Pull the encoded struct data from cache and decode it."""
+        if self.cache is None and self.shared_store is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.shared_store is not None:
+                try:
+                    structure = self.shared_store.get(key, lambda data: self._decode(data, tagger))
+                except Exception:  # lint-amnesty, pylint: disable=broad-except
+                    log.warning("CourseStructureCache: Bad data in shared cache for %s", course_context)
+                    self.shared_store.delete(key)
+                    structure = None
+
+                if structure is not None:
+                    tagger.tag(from_cache='true', cache_tier='shared')
+                    return structure
+
+            if self.cache is None:
+                tagger.tag(from_cache='false')
+                tagger.sample_rate = 1
+                return None
+
             try:
-                compressed_pickled_data = self.cache.get(key)
-                tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+                encoded_data = self._get_unchunked(key, self.cache.get(key), tagger)
+                tagger.tag(from_cache=str(encoded_data is not None).lower())
 
-                if compressed_pickled_data is None:
+                if encoded_data is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
                     return None
 
-                tagger.measure('compressed_size', len(compressed_pickled_data))
-
-                pickled_data = zlib.decompress(compressed_pickled_data)
-                tagger.measure('uncompressed_size', len(pickled_data))
-
-                return pickle.loads(pickled_data, encoding='latin-1')
+                tagger.tag(cache_tier='django')
+                structure = self._decode(encoded_data, tagger)
+            except UnsupportedStructureFormat:
+                # The structure was cached in a format this process doesn't know
+                # about yet, e.g. by a newer process during a deployment.
+                log.info("CourseStructureCache: Unsupported data format in cache for %s", course_context)
+                tagger.tag(unsupported_format='true')
+                tagger.sample_rate = 1
+                return None
             except Exception:  # lint-amnesty, pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
                 self.cache.delete(key)
                 return None
 
+            # Warm the shared tier so that the other processes on this host
+            # don't have to go to the django cache for this structure.
+            self._set_shared(key, encoded_data, tagger)
+            return structure
+
     def set(self, key, structure, course_context=None):
-        """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        """Given a structure, will encode and write it to cache."""
+        if self.cache is None and self.shared_store is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
-            pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
-            tagger.measure('uncompressed_size', len(pickled_data))
-
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
-            data_size = len(compressed_pickled_data)
+            encoded_data = self.codec.encode(structure, tagger)
+            data_size = len(encoded_data)
             tagger.measure('compressed_size', data_size)
 
+            self._set_shared(key, encoded_data, tagger)
+            if self.cache is None:
+                return None
+
             # Structures are immutable, so we set a timeout of "never"
             try:
-                self.cache.set(key, compressed_pickled_data, None)
+                if data_size > STRUCTURE_CACHE_CHUNK_SIZE:
+                    failed_keys = self._set_chunked(key, encoded_data, tagger)
+                else:
+                    failed_keys = []
+                    self.cache.set(key, encoded_data, None)
             except Exception:  # pylint: disable=broad-except
+                failed_keys = [key]
+
+            if failed_keys:
                 total_bytes_in_one_mb = 1024 * 1024
                 chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
 
@@ -259,6 +325,263 @@ class CourseStructureCache:
                 monitoring.set_custom_attribute('split_mongo_compressed_size', chunk_size_in_mbs)
                 log.info('Data caching (course structure) failed on chunk size: {} MB'.format(chunk_size_in_mbs))
 
+    def _decode(self, encoded_data, tagger):
+        """Decode the given cached struct data."""
+        tagger.measure('compressed_size', len(encoded_data))
+        return self.codec.decode(encoded_data, tagger)
+
+    def _set_chunked(self, key, encoded_data, tagger):
+        """
+        Write the encoded struct data to cache in chunks, followed by their
+        manifest. Returns the keys that failed to be written.
+        """
+        checksum = zlib.crc32(encoded_data)
+        chunk_count = math.ceil(len(encoded_data) / STRUCTURE_CACHE_CHUNK_SIZE)
+        tagger.measure('chunks', chunk_count)
+
+        chunks = {
+            chunk_key: encoded_data[index * STRUCTURE_CACHE_CHUNK_SIZE:(index + 1) * STRUCTURE_CACHE_CHUNK_SIZE]
+            for index, chunk_key in enumerate(self._chunk_keys(key, chunk_count, checksum))
+        }
+        failed_keys = self.cache.set_many(chunks, None)
+        if failed_keys:
+            return failed_keys
+
+        # The manifest is written last, so that it never refers to missing chunks.
+        self.cache.set(key, CHUNK_MANIFEST.pack(CHUNK_MANIFEST_MARKER, chunk_count, checksum), None)
+        return []
+
+    def _get_unchunked(self, key, cached_data, tagger):
+        """
+        Return the encoded struct data for the given data cached under the
+        structure's key, reading its chunks if it is a chunk manifest.
+        Return None if any of the chunks is missing.
+        """
+        if (
+            cached_data is None or
+            len(cached_data) != CHUNK_MANIFEST.size or
+            cached_data[0] != CHUNK_MANIFEST_MARKER
+        ):
+            return cached_data
+
+        _, chunk_count, checksum = CHUNK_MANIFEST.unpack(cached_data)
+        tagger.measure('chunks', chunk_count)
+        chunk_keys = self._chunk_keys(key, chunk_count, checksum)
+        chunks = self.cache.get_many(chunk_keys)
+        if len(chunks) != chunk_count:
+            # Chunks can be evicted independently of the manifest; treat
+            # the structure as missing so that it gets cached again.
+            return None
+
+        encoded_data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+        if zlib.crc32(encoded_data) != checksum:
+            raise ValueError('Checksum mismatch of the cached structure chunks')
+        return encoded_data
+
+    @staticmethod
+    def _chunk_keys(key, chunk_count, checksum):
+        """
+        Return the cache keys of the chunks of the given structure's data.
+        The keys include the data's checksum, so that chunks written in
+        different formats can never be mixed.
+        """
+        return [f'{key}.{checksum:08x}.{index}' for index in range(chunk_count)]
+
+    def _set_shared(self, key, encoded_data, tagger):
+        """Write the encoded struct data to the shared tier, if configured."""
+        if self.shared_store is None:
+            return
+
+        evicted = self.shared_store.set(key, encoded_data)
+        if evicted:
+            tagger.measure('shared_cache_evictions', evicted)
+
+
+def get_definition_batch_size():
+    """
+    Return the maximum number of expected definitions to fetch with a single query.
+    """
+    # .. setting_name: MODULESTORE_DEFINITION_BATCH_SIZE
+    # .. setting_default: 10
+    # .. setting_description: Maximum number of the definitions expected by a request that the split
+    #   modulestore fetches with a single query, when the request gets the first of them. Use 0 to
+    #   fetch each definition only when it is needed.
+    return getattr(settings, 'MODULESTORE_DEFINITION_BATCH_SIZE', 10)
+
+
+def get_local_definition_cache():
+    """
+    Return the process-wide LocalDefinitionCache, or None if it is disabled.
+    """
+    global _local_definition_cache  # pylint: disable=global-statement
+
+    # .. setting_name: COURSE_DEFINITION_LOCAL_CACHE_SIZE
+    # .. setting_default: 0
+    # .. setting_description: Maximum total size, in bytes of encoded data, of the split modulestore
+    #   definitions kept in each process' memory, in front of the django cache. Use 0 to disable it.
+    max_size = getattr(settings, 'COURSE_DEFINITION_LOCAL_CACHE_SIZE', 0)
+    if not max_size:
+        return None
+    if _local_definition_cache is None or _local_definition_cache.max_size != max_size:
+        _local_definition_cache = LocalDefinitionCache(max_size)
+    return _local_definition_cache
+
+
+class LocalDefinitionCache:
+    """
+    Thread-safe LRU cache of encoded definitions, bounded by the total size
+    of their encoded data.
+
+    The definitions are kept encoded, so that every read returns a new copy
+    that callers are free to mutate.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, keys):
+        """
+        Return a dict of the encoded data cached for the given keys, omitting
+        the keys that are not cached.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                encoded_data = self._entries.get(key)
+                if encoded_data is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = encoded_data
+        return found
+
+    def set_many(self, encoded_definitions):
+        """
+        Cache the given dict of encoded data, keyed on the definitions' ids.
+        """
+        with self._lock:
+            for key, encoded_data in encoded_definitions.items():
+                if len(encoded_data) > self.max_size:
+                    continue
+                previous_data = self._entries.pop(key, None)
+                if previous_data is not None:
+                    self.size -= len(previous_data)
+                self._entries[key] = encoded_data
+                self.size += len(encoded_data)
+            while self.size > self.max_size:
+                _, evicted_data = self._entries.popitem(last=False)
+                self.size -= len(evicted_data)
+
+    def clear(self):
+        """
+        Remove all the cached definitions.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_local_definition_cache = None
+
+
+class CourseDefinitionCache:
+    """
+    Wrapper around django cache object to cache definitions. Like structures,
+    definitions are never modified once inserted, so they are cached by id
+    without a timeout, encoded with the configured StructureCodec.
+
+    Reads go through the process-local LocalDefinitionCache first, if it is
+    enabled, and fetch all the missing definitions with a single multi-get.
+
+    Definitions share the 'course_structure_cache' with the structures. If
+    neither it nor the local cache exist, then don't do anything.
+    """
+    def __init__(self):
+        self.cache = None
+        try:
+            self.cache = get_cache('course_structure_cache')
+        except InvalidCacheBackendError:
+            pass
+        self.local_cache = get_local_definition_cache()
+        self.codec = get_structure_codec()
+
+    def get_many(self, keys, course_context=None):
+        """
+        Return a dict of the cached definitions with the given ids, omitting
+        the ids of the definitions that are not cached.
+        """
+        if (self.cache is None and self.local_cache is None) or not keys:
+            return {}
+
+        with TIMER.timer("CourseDefinitionCache.get_many", course_context) as tagger:
+            tagger.measure('definitions', len(keys))
+            encoded_definitions = self.local_cache.get_many(keys) if self.local_cache else {}
+            tagger.measure('local_hits', len(encoded_definitions))
+
+            missing_keys = [key for key in keys if key not in encoded_definitions]
+            if missing_keys and self.cache is not None:
+                cached_data = self.cache.get_many([self._cache_key(key) for key in missing_keys])
+                encoded_from_cache = {
+                    key: cached_data[self._cache_key(key)]
+                    for key in missing_keys if self._cache_key(key) in cached_data
+                }
+                tagger.measure('cache_hits', len(encoded_from_cache))
+                if self.local_cache and encoded_from_cache:
+                    self.local_cache.set_many(encoded_from_cache)
+                encoded_definitions.update(encoded_from_cache)
+
+            definitions = {}
+            for key, encoded_data in encoded_definitions.items():
+                try:
+                    definitions[key] = self.codec.decode(encoded_data)
+                except UnsupportedStructureFormat:
+                    # Cached by a process using a format this one doesn't know about yet.
+                    pass
+                except Exception:  # lint-amnesty, pylint: disable=broad-except
+                    log.warning("CourseDefinitionCache: Bad data in cache for %s", key)
+                    if self.cache is not None:
+                        self.cache.delete(self._cache_key(key))
+
+            if len(definitions) < len(keys):
+                # Always log cache misses, because they are unexpected
+                tagger.sample_rate = 1
+            return definitions
+
+    def set_many(self, definitions, course_context=None):
+        """
+        Encode and write the given definitions to the cache.
+        """
+        if (self.cache is None and self.local_cache is None) or not definitions:
+            return
+
+        with TIMER.timer("CourseDefinitionCache.set_many", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            encoded_definitions = {}
+            for definition in definitions:
+                encoded_data = self.codec.encode(definition)
+                # Definitions too large for the cache are rare; they are simply read from the db.
+                if len(encoded_data) <= STRUCTURE_CACHE_CHUNK_SIZE:
+                    encoded_definitions[definition['_id']] = encoded_data
+
+            if self.local_cache:
+                self.local_cache.set_many(encoded_definitions)
+            if self.cache is not None:
+                try:
+                    self.cache.set_many(
+                        {self._cache_key(key): encoded_data for key, encoded_data in encoded_definitions.items()},
+                        None,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    log.info("CourseDefinitionCache: Failed to cache %d definitions", len(encoded_definitions))
+
+    @staticmethod
+    def _cache_key(key):
+        """
+        Return the cache key of the given definition id, which is distinct
+        from the keys of the structures sharing the cache.
+        """
+        return f'definition.{key}'
+
 
 class MongoPersistenceBackend:
     """
@@ -508,24 +831,115 @@ class MongoPersistenceBackend:
             }
             return self.course_index.remove(query)
 
+    def expect_definitions(self, keys):
+        """
+        Note that the current request is expected to get the definitions with the given
+        keys one at a time, e.g. through the lazy definition loaders of the blocks it
+        loaded, so that get_definition fetches them in batches.
+
+        Only requests collect definitions, since the collector lives as long as the
+        request cache.
+        """
+        if not get_definition_batch_size() or crum.get_current_request() is None:
+            return
+        collector = RequestCache(DEFINITION_COLLECTOR_NAMESPACE).data
+        expected = collector.setdefault('expected', {})
+        for key in keys:
+            expected[key] = None
+
+    def _get_collected_definition(self, key, course_context=None):
+        """
+        Return the definition with the given key if the current request expected it,
+        fetching it along with the next expected definitions, or None otherwise.
+
+        The definitions fetched from the db are only added to the definition cache
+        once they are used, so that the ones the request never gets aren't cached.
+        """
+        collector = RequestCache(DEFINITION_COLLECTOR_NAMESPACE).data
+        fetched = collector.setdefault('fetched', {})
+        if key in fetched:
+            return self._use_collected_definition(fetched, key, course_context)
+
+        expected = collector.get('expected')
+        if not expected or key not in expected:
+            return None
+
+        del expected[key]
+        batch = [key]
+        batch_size = get_definition_batch_size()
+        while expected and len(batch) < batch_size:
+            next_key = next(iter(expected))
+            del expected[next_key]
+            batch.append(next_key)
+
+        cached_definitions = CourseDefinitionCache().get_many(batch, course_context)
+        for definition_id, definition in cached_definitions.items():
+            fetched[definition_id] = (definition, False)
+        missing_ids = [definition_id for definition_id in batch if definition_id not in cached_definitions]
+        if missing_ids:
+            with TIMER.timer("get_definition.batch", course_context) as tagger:
+                tagger.measure('definitions', len(missing_ids))
+                for definition in self.definitions.find({'_id': {'$in': missing_ids}}):
+                    fetched[definition['_id']] = (definition, True)
+        return self._use_collected_definition(fetched, key, course_context)
+
+    @staticmethod
+    def _use_collected_definition(fetched, key, course_context=None):
+        """
+        Remove the fetched definition with the given key from the collector and return
+        it, adding it to the definition cache if it was fetched from the db.
+        """
+        if key not in fetched:
+            return None
+        definition, from_db = fetched.pop(key)
+        if from_db:
+            CourseDefinitionCache().set_many([definition], course_context)
+        return definition
+
     def get_definition(self, key, course_context=None):
         """
         Get the definition from the persistence mechanism whose id is the given key
+
+        This method will use a cached version of the definition if it is available.
+        If the current request expected to get this definition, it is fetched in a
+        batch with the other definitions the request expects.
         """
+        definition = self._get_collected_definition(key, course_context)
+        if definition is not None:
+            return definition
+
+        cache = CourseDefinitionCache()
+        definition = cache.get_many([key], course_context).get(key)
+        if definition is not None:
+            return definition
+
         with TIMER.timer("get_definition", course_context) as tagger:
             definition = self.definitions.find_one({'_id': key})
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
-            return definition
+
+        cache.set_many([definition], course_context)
+        return definition
 
     def get_definitions(self, definitions, course_context=None):
         """
         Retrieve all definitions listed in `definitions`.
+
+        The cached definitions are returned without querying the db, and the
+        others are fetched with a single query and cached.
         """
+        cache = CourseDefinitionCache()
+        cached_definitions = cache.get_many(definitions, course_context)
+        missing_ids = [definition_id for definition_id in definitions if definition_id not in cached_definitions]
+        if not missing_ids:
+            return list(cached_definitions.values())
+
         with TIMER.timer("get_definitions", course_context) as tagger:
-            tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            tagger.measure('definitions', len(missing_ids))
+            defs_from_db = list(self.definitions.find({'_id': {'$in': missing_ids}}))
+
+        cache.set_many(defs_from_db, course_context)
+        return list(cached_definitions.values()) + defs_from_db
 
     def insert_definition(self, definition, course_context=None):
         """
@@ -536,6 +950,25 @@ class MongoPersistenceBackend:
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert_one(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Create the definitions in the db with a single batched insert.
+
+        The definitions already in the db are skipped: definitions are never
+        modified once inserted, so they already have the same contents.
+        """
+        with TIMER.timer("insert_definitions", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            try:
+                self.definitions.insert_many(definitions, ordered=False)
+            except BulkWriteError as err:
+                write_errors = err.details.get('writeErrors', [])
+                if err.details.get('writeConcernErrors') or any(
+                    write_error['code'] != DUPLICATE_KEY_ERROR_CODE for write_error in write_errors
+                ):
+                    raise
+                log.debug("Skipped inserting %d duplicate definitions", len(write_errors))
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
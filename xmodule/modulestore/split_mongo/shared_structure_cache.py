@@ -0,0 +1,169 @@
+"""
+Host-local, shared-memory tier for the split modulestore's structure cache.
+
+Structures are immutable for a given ``_id``, so their serialized form can be
+stored once per host in a directory backed by shared memory (for example under
+``/dev/shm``) and read by every worker process on the host, instead of each
+worker fetching the same bytes from memcached over the network. This makes it
+one fetch per host rather than one decode per host: decoded structures are
+Python objects, which cannot be shared between processes, so each process
+still decodes the structures it reads.
+
+Each structure is stored in its own file, named after a hash of its key, and is
+read through ``mmap`` so that it can be decoded without an intermediate copy.
+The total size of the directory is bounded; when it is exceeded, the least
+recently used files are evicted. Reads refresh a file's modification time,
+which is what the eviction order is based on.
+"""
+
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+# Suffix of the temporary files being written, which are skipped by readers
+# and eviction.
+TEMP_FILE_SUFFIX = '.tmp'
+
+
+def get_shared_structure_store():
+    """
+    Returns the SharedStructureStore configured for this host, or None if
+    the shared tier is not configured.
+    """
+    # .. setting_name: COURSE_STRUCTURE_SHARED_CACHE
+    # .. setting_default: {'DIRECTORY': None, 'MAX_SIZE': 512 * 1024 * 1024}
+    # .. setting_description: Configuration of the host-local tier of the split modulestore's
+    #   course structure cache, which is shared by all worker processes on a host. DIRECTORY is the
+    #   directory in which the serialized structures are stored, ideally on a shared-memory
+    #   filesystem such as /dev/shm; the tier is disabled when it is None. MAX_SIZE is the maximum
+    #   total size, in bytes, of the stored structures before the least recently used ones are evicted.
+    #   Only the encoded structures are shared, so this saves the fetches from the django cache, while
+    #   each process still decodes the structures it reads.
+    config = getattr(settings, 'COURSE_STRUCTURE_SHARED_CACHE', None) or {}
+    directory = config.get('DIRECTORY')
+    if not directory:
+        return None
+    return SharedStructureStore(directory, config.get('MAX_SIZE', 512 * 1024 * 1024))
+
+
+class SharedStructureStore:
+    """
+    A size-bounded store of serialized structures, with one file per
+    structure in a directory shared by all processes on a host.
+    """
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, key, decode):
+        """
+        Returns the result of calling ``decode`` on the stored data for the
+        given key, or None if the key is not stored.
+
+        The data is passed to ``decode`` as a buffer that is only valid for
+        the duration of the call.
+        """
+        path = self._path(key)
+        try:
+            stored_file = open(path, 'rb')  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return None
+
+        with stored_file:
+            try:
+                data = mmap.mmap(stored_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped; they are never written.
+                return None
+            with data:
+                result = decode(data)
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return result
+
+    def set(self, key, data):
+        """
+        Stores the given serialized data for the given key, evicting the
+        least recently used structures if the store grows too large.
+
+        Returns the number of evicted structures.
+        """
+        if not data or len(data) > self.max_size:
+            return 0
+
+        path = self._path(key)
+        if os.path.exists(path):
+            return 0
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=TEMP_FILE_SUFFIX)
+            try:
+                with os.fdopen(file_descriptor, 'wb') as temp_file:
+                    temp_file.write(data)
+                # Atomically publish the file, so readers never see partial data.
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            log.warning("SharedStructureStore: Failed to store structure in %s", self.directory, exc_info=True)
+            return 0
+
+        return self._evict()
+
+    def delete(self, key):
+        """
+        Removes the stored data for the given key, if any.
+        """
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """
+        Removes the least recently used structures until the total size of
+        the store is within its limit. Returns the number of evicted
+        structures.
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.name.endswith(TEMP_FILE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        return evicted
+
+    def _path(self, key):
+        """
+        Returns the path of the file storing the given key.
+        """
+        return os.path.join(self.directory, hashlib.sha1(str(key).encode('utf-8')).hexdigest())
@@ -101,6 +101,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, DjangoFlexPersistenceBackend
+from xmodule.modulestore.split_mongo.structure_index import get_structure_index
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.misc import get_library_or_course_attribute
@@ -267,16 +268,26 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                 # append only, so if it's already been written, we can just keep going.
                 log.debug("Attempted to insert duplicate structure %s", _id)
 
-        for _id in bulk_write_record.definitions.keys() - bulk_write_record.definitions_in_db:
+        new_definitions = [
+            definition for _id, definition in bulk_write_record.definitions.items()
+            if _id not in bulk_write_record.definitions_in_db
+        ]
+        if len(new_definitions) == 1:
             dirty = True
 
             try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
+                self.db_connection.insert_definition(new_definitions[0], bulk_write_record.course_key)
             except DuplicateKeyError:
                 # We may not have looked up this definition inside this bulk operation, and thus
                 # didn't realize that it was already in the database. That's OK, the store is
                 # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+                log.debug("Attempted to insert duplicate definition %s", new_definitions[0]['_id'])
+        elif new_definitions:
+            dirty = True
+
+            # Bulk operations such as course imports create thousands of definitions, which are
+            # inserted in batches rather than with a round trip each. Duplicates are skipped.
+            self.db_connection.insert_definitions(new_definitions, bulk_write_record.course_key)
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
@@ -753,6 +764,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+            elif depth is not None:
+                # The definitions of the blocks will likely be loaded one after the other,
+                # so let the db connection fetch them in batches. Whole subtrees are mostly
+                # loaded to walk their structure, which doesn't need their definitions.
+                self.db_connection.expect_definitions([
+                    block.definition
+                    for block in new_block_data.values()
+                    if block.definition is not None and not block.definition_loaded
+                ])
 
             system.module_data.update(new_block_data)
             return system.module_data
@@ -1265,21 +1285,38 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
+        # Only check the blocks that the structure's indexes can't rule out
+        blocks = course.structure['blocks']
+        structure_index = self._get_structure_index(course)
+        candidate_keys = None
+        if structure_index is not None:
+            candidate_keys = structure_index.candidates(course.structure, qualifiers.get('block_type'), settings)
+        if candidate_keys is None:
+            candidate_blocks = blocks.items()
+        else:
+            candidate_blocks = ((block_id, blocks[block_id]) for block_id in candidate_keys)
+
         # No need of these caches unless include_orphans is set to False
         path_cache = None
         parents_cache = None
+        reachable = None
 
         if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            if structure_index is not None:
+                reachable = structure_index.reachable(course.structure)
+            else:
+                path_cache = {}
+                parents_cache = self.build_block_key_to_parents_mapping(course.structure)
 
-        for block_id, value in course.structure['blocks'].items():
+        for block_id, value in candidate_blocks:
             if _block_matches_all(value):
                 if not include_orphans:
-                    if (
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
+                    if block_id.type in DETACHED_XBLOCK_TYPES:
+                        items.append(block_id)
+                    elif reachable is not None:
+                        if block_id in reachable:
+                            items.append(block_id)
+                    elif self.has_path_to_root(block_id, course, path_cache, parents_cache):
                         items.append(block_id)
                 else:
                     items.append(block_id)
@@ -1289,6 +1326,17 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_structure_index(self, course):
+        """
+        Return the StructureIndex of the given course envelope's structure, or None
+        if the structure is being edited in an active bulk operation or if the
+        indexes are disabled.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course.course_key)
+        if bulk_write_record.active and course.structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+        return get_structure_index(course.structure)
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1357,15 +1405,24 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        block_key = BlockKey.from_usage_key(locator)
+        structure_index = self._get_structure_index(course)
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
-        parent_ids = [
-            valid_parent
-            for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
-        ]
+        if structure_index is not None:
+            reachable = structure_index.reachable(course.structure)
+            parent_ids = [
+                valid_parent
+                for valid_parent in structure_index.parents(course.structure).get(block_key, [])
+                if valid_parent in reachable
+            ]
+        else:
+            parent_ids = [
+                valid_parent
+                for valid_parent in self._get_parents_from_structure(block_key, course.structure)
+                if self.has_path_to_root(valid_parent, course)
+            ]
 
         if len(parent_ids) == 0:
             return None
@@ -1447,6 +1504,35 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             'edited_on': course['edited_on']
         }
 
+    def get_changed_blocks(self, course_key, previous_version_guid):
+        """
+        Returns the usage keys of the blocks in the current version of the course
+        whose stored data differs from their data in the structure identified by
+        previous_version_guid, including blocks that did not exist in that structure.
+
+        Blocks that were removed are not returned, but their former parents are,
+        since their children changed.
+
+        :param course_key: any subclass of CourseLocator
+        :param previous_version_guid: the id of an earlier structure of the course
+        """
+        if not isinstance(course_key, CourseLocator) or course_key.deprecated:
+            # The supplied CourseKey is of the wrong type, so it can't possibly be stored in this modulestore.
+            raise ItemNotFoundError(course_key)
+
+        course = self._lookup_course(course_key)
+        # The stored version may be a string, which isn't cast to an ObjectId in bulk operations.
+        previous_structure = self.get_structure(course_key, course_key.as_object_id(previous_version_guid))
+        if previous_structure is None:
+            raise ItemNotFoundError(f'Structure: {previous_version_guid}')
+
+        previous_blocks = previous_structure['blocks']
+        return [
+            course_key.make_usage_key(block_type=block_key.type, block_id=block_key.id)
+            for block_key, block_data in course.structure['blocks'].items()
+            if previous_blocks.get(block_key) != block_data
+        ]
+
     def get_definition_history_info(self, definition_locator, course_context=None):
         """
         Because xblocks doesn't give a means to separate the definition's meta information from
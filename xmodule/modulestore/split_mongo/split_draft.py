@@ -513,6 +513,13 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
                     return self.get_course_index(course_locator)['versions']
         return versions
 
+    def get_changed_blocks(self, course_key, previous_version_guid):
+        """
+        See :py:meth `xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.get_changed_blocks`
+        """
+        course_key = self._map_revision_to_branch(course_key)
+        return super().get_changed_blocks(course_key, previous_version_guid)
+
     def get_course_history_info(self, course_locator):  # lint-amnesty, pylint: disable=arguments-differ
         """
         See :py:meth `xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.get_course_history_info`
@@ -0,0 +1,201 @@
+"""
+Versioned codec for the split modulestore's cached course structures.
+
+The first byte of the encoded data identifies its format, so that the format
+and compression of newly cached structures can be changed without flushing
+the cache: readers decode every format they know about, and report formats
+they don't know about (for example, written by newer code during a rolling
+deployment) as cache misses rather than as corrupt data.
+
+Supported formats:
+
+* Legacy: the structure pickled with protocol 4 and compressed with zlib,
+  without any header. zlib streams always start with 0x78, which is never
+  used as a version.
+* Version 1: a version byte, a compression byte, then the structure pickled
+  with protocol 5 and compressed with the given compression.
+
+0xff is reserved by CourseStructureCache to mark the manifests of structures
+cached in chunks.
+
+Decoding a structure allocates an object per block, field and edit info,
+which triggers many needless passes of the cyclic garbage collector; since
+the unpickled structure contains no reference cycles, the collector is
+paused while decoding.
+"""
+
+
+import gc
+import logging
+import pickle
+import zlib
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+log = logging.getLogger(__name__)
+
+# Value of the first byte of structures encoded in the legacy format.
+LEGACY_FORMAT = 0x78
+LEGACY_PICKLE_PROTOCOL = 4
+
+# Versions of the encoded format, stored in the first byte of the data.
+# 0 is used in settings to select the legacy format.
+LEGACY_VERSION = 0
+VERSION_1 = 1
+VERSION_1_PICKLE_PROTOCOL = 5
+LATEST_VERSION = VERSION_1
+
+# Compressions available in the versioned formats, identified by the byte
+# stored after the version byte. The ids must never change.
+COMPRESSION_IDS = {
+    'zlib': 1,
+    'zstd': 2,
+    'lz4': 3,
+}
+
+
+def _compressors():
+    """
+    Returns a dict of the (compress, decompress) functions of each compression
+    whose library is installed, keyed on the compression's name.
+    """
+    compressors = {
+        # 1 = Fastest (slightly larger results)
+        'zlib': (lambda data: zlib.compress(data, 1), zlib.decompress),
+    }
+    if zstandard is not None:
+        compressors['zstd'] = (
+            lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data),
+        )
+    if lz4 is not None:
+        compressors['lz4'] = (lz4.frame.compress, lz4.frame.decompress)
+    return compressors
+
+
+COMPRESSORS = _compressors()
+DECOMPRESSORS_BY_ID = {COMPRESSION_IDS[name]: decompress for name, (_, decompress) in COMPRESSORS.items()}
+
+
+class UnsupportedStructureFormat(Exception):
+    """
+    The encoded structure is in a format, or uses a compression, that this
+    process can't decode.
+    """
+
+
+def get_structure_codec():
+    """
+    Returns the StructureCodec to use for caching structures, as configured
+    in settings.
+    """
+    # .. setting_name: COURSE_STRUCTURE_CACHE_CODEC
+    # .. setting_default: {'VERSION': 0, 'COMPRESSION': 'zlib'}
+    # .. setting_description: Format in which the split modulestore caches course structures. VERSION is
+    #   the version of the encoded format, 0 being the legacy unversioned format, and COMPRESSION is one
+    #   of 'zlib', 'zstd' or 'lz4', and is only used by the versioned formats. Structures in any format
+    #   can be read regardless of this setting.
+    # .. setting_warnings: Only change the format once all the processes sharing the cache run code that
+    #   can read it; until then, the older processes treat the structures in the new format as misses.
+    #   'zstd' and 'lz4' require the zstandard and lz4 packages, and fall back to 'zlib' if missing.
+    config = getattr(settings, 'COURSE_STRUCTURE_CACHE_CODEC', None) or {}
+    return StructureCodec(config.get('VERSION', LEGACY_VERSION), config.get('COMPRESSION', 'zlib'))
+
+
+class StructureCodec:
+    """
+    Encodes structures in a given format, and decodes structures in any of the
+    supported formats.
+    """
+    def __init__(self, version=LATEST_VERSION, compression='zlib'):
+        if version not in (LEGACY_VERSION, VERSION_1):
+            raise ValueError(f'Unknown course structure format version: {version}')
+        if compression not in COMPRESSORS:
+            if compression not in COMPRESSION_IDS:
+                raise ValueError(f'Unknown course structure compression: {compression}')
+            log.warning("StructureCodec: %s is not installed, falling back to zlib", compression)
+            compression = 'zlib'
+
+        self.version = version
+        self.compression = compression
+
+    def encode(self, structure, tagger=None):
+        """
+        Returns the given structure encoded in this codec's format.
+
+        Arguments:
+            structure (dict): The structure to encode.
+            tagger (Tagger): If given, the uncompressed size is measured on it.
+        """
+        if self.version == LEGACY_VERSION:
+            pickled_data = pickle.dumps(structure, LEGACY_PICKLE_PROTOCOL)
+            header = b''
+            compress = COMPRESSORS['zlib'][0]
+        else:
+            pickled_data = pickle.dumps(structure, VERSION_1_PICKLE_PROTOCOL)
+            header = bytes((self.version, COMPRESSION_IDS[self.compression]))
+            compress = COMPRESSORS[self.compression][0]
+
+        if tagger:
+            tagger.measure('uncompressed_size', len(pickled_data))
+        return header + compress(pickled_data)
+
+    @staticmethod
+    def decode(data, tagger=None):
+        """
+        Returns the structure encoded in the given data, in any of the
+        supported formats.
+
+        Arguments:
+            data (bytes-like): The encoded structure. Any object supporting
+                the buffer protocol can be passed, and it is not copied.
+            tagger (Tagger): If given, the uncompressed size is measured on it.
+
+        Raises:
+            UnsupportedStructureFormat if the data's format or compression
+            is not supported by this process.
+        """
+        with memoryview(data) as view:
+            if not view:
+                raise UnsupportedStructureFormat('Empty data')
+
+            version = view[0]
+            if version == LEGACY_FORMAT:
+                pickled_data = zlib.decompress(view)
+            elif version == VERSION_1:
+                decompress = DECOMPRESSORS_BY_ID.get(view[1]) if len(view) > 1 else None
+                if decompress is None:
+                    raise UnsupportedStructureFormat(f'Unsupported compression: {view[1:2].tobytes()!r}')
+                pickled_data = decompress(view[2:])
+            else:
+                raise UnsupportedStructureFormat(f'Unsupported version: {version}')
+
+        if tagger:
+            tagger.measure('uncompressed_size', len(pickled_data))
+        with _gc_paused():
+            return pickle.loads(pickled_data, encoding='latin-1')
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector within the context.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
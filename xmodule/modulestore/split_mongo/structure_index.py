@@ -0,0 +1,267 @@
+"""
+Indexes over the blocks of split modulestore structures, used to answer
+get_items and get_parent_location queries without scanning every block.
+
+Structures are immutable once stored, so the indexes of a stored structure
+are memoized by the structure's ``_id`` in a bounded, per-process LRU cache.
+Each index is built lazily, the first time a query needs it:
+
+* the keys of the blocks of each block type;
+* the keys of the blocks having each value of a settings field, built for
+  the fields that are queried by value;
+* the parents of each block;
+* the set of blocks reachable from the root of the structure;
+* the inheritable settings set on each block, used to look up the values
+  the blocks inherit without loading their ancestors.
+
+The indexes only narrow down the blocks to check: the callers still match
+each candidate block against the full query.
+"""
+
+
+import re
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+from django.conf import settings
+
+from xmodule.modulestore.inheritance import InheritanceMixin
+
+# Block types of the roots of courselike structures.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+_structure_indexes = OrderedDict()
+_structure_indexes_lock = Lock()
+
+
+def get_structure_index(structure):
+    """
+    Return the StructureIndex of the given stored structure, building it if
+    it isn't memoized yet.
+
+    The structure must not be modified after it is indexed; callers must not
+    index the structures being edited in a bulk operation.
+    """
+    # .. setting_name: COURSE_STRUCTURE_INDEX_CACHE_SIZE
+    # .. setting_default: 16
+    # .. setting_description: Number of split modulestore structures whose get_items indexes are kept in
+    #   each process' memory. Use 0 to disable the indexes, and scan the structures' blocks instead.
+    max_size = getattr(settings, 'COURSE_STRUCTURE_INDEX_CACHE_SIZE', 16)
+    if not max_size:
+        return None
+
+    structure_id = structure['_id']
+    with _structure_indexes_lock:
+        structure_index = _structure_indexes.get(structure_id)
+        if structure_index is not None:
+            _structure_indexes.move_to_end(structure_id)
+            return structure_index
+
+    structure_index = StructureIndex(structure)
+    with _structure_indexes_lock:
+        _structure_indexes[structure_id] = structure_index
+        while len(_structure_indexes) > max_size:
+            _structure_indexes.popitem(last=False)
+    return structure_index
+
+
+def clear_structure_indexes():
+    """
+    Remove all the memoized structure indexes.
+    """
+    with _structure_indexes_lock:
+        _structure_indexes.clear()
+
+
+class StructureIndex:
+    """
+    Lazily built indexes over the blocks of a structure.
+
+    The index doesn't keep a reference to the structure itself; the methods
+    building an index take the structure as an argument.
+    """
+    def __init__(self, structure):
+        self.structure_id = structure['_id']
+        self._positions = None
+        self._blocks_by_type = None
+        self._parents = None
+        self._reachable = None
+        self._inheritable_settings = None
+        self._field_indexes = {}
+
+    def candidates(self, structure, block_types=None, field_criteria=None):
+        """
+        Return the keys of the blocks that may match the given criteria, in
+        the order of the structure's blocks, or None if none of the criteria
+        can use an index.
+
+        Arguments:
+            block_types (str or dict): The block_type criteria of get_items.
+            field_criteria (dict): The settings criteria of get_items, keyed
+                on field names.
+        """
+        candidate_sets = []
+        if block_types is not None:
+            block_keys = self._blocks_of_types(structure, block_types)
+            if block_keys is not None:
+                candidate_sets.append(block_keys)
+
+        for field_name, criteria in (field_criteria or {}).items():
+            if not _is_indexable(criteria):
+                continue
+            field_index, unindexed = self._field_index(structure, field_name)
+            candidate_sets.append(field_index.get(criteria, set()) | unindexed)
+
+        if not candidate_sets:
+            return None
+
+        candidate_sets.sort(key=len)
+        candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+        return sorted(candidates, key=self._block_positions(structure).__getitem__)
+
+    def parents(self, structure):
+        """
+        Return a dict of the keys of the parents of each block, keyed on the
+        block keys.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for parent_key, block_data in structure['blocks'].items():
+                for child_key in block_data.fields.get('children', []):
+                    parents[child_key].append(parent_key)
+            self._parents = dict(parents)
+        return self._parents
+
+    def reachable(self, structure):
+        """
+        Return the set of the keys of the blocks that have a path to a root
+        of the structure, i.e. a course or library block without parents.
+        """
+        if self._reachable is None:
+            blocks = structure['blocks']
+            parents = self.parents(structure)
+            reachable = {
+                block_key for block_key in blocks
+                if block_key.type in ROOT_BLOCK_TYPES and block_key not in parents
+            }
+            stack = list(reachable)
+            while stack:
+                block_data = blocks.get(stack.pop())
+                if block_data is None:
+                    continue
+                for child_key in block_data.fields.get('children', []):
+                    if child_key not in reachable:
+                        reachable.add(child_key)
+                        stack.append(child_key)
+            self._reachable = reachable
+        return self._reachable
+
+    def inherited_setting(self, structure, block_key, field_name):
+        """
+        Return the key of the nearest ancestor of the given block that sets
+        the given inheritable field, and the value it sets, or (None, None)
+        if no ancestor sets it.
+
+        As in the runtime, the parent of a block with several parents is the
+        last one in the order of the structure's blocks.
+        """
+        inheritable_settings = self._inheritable_settings_of_blocks(structure)
+        parents = self.parents(structure)
+        visited = {block_key}
+        while block_key in parents:
+            block_key = parents[block_key][-1]
+            if block_key in visited:
+                break
+            visited.add(block_key)
+            block_settings = inheritable_settings.get(block_key)
+            if block_settings is not None and field_name in block_settings:
+                return block_key, block_settings[field_name]
+        return None, None
+
+    def _inheritable_settings_of_blocks(self, structure):
+        """
+        Return a dict of the inheritable settings set on each block, keyed on
+        the block keys. Only the blocks setting inheritable settings are
+        included, since most blocks inherit all of them.
+        """
+        if self._inheritable_settings is None:
+            inheritable_names = set(InheritanceMixin.fields)  # pylint: disable=no-member
+            inheritable_settings = {}
+            for block_key, block_data in structure['blocks'].items():
+                block_settings = {
+                    field_name: value for field_name, value in block_data.fields.items()
+                    if field_name in inheritable_names
+                }
+                if block_settings:
+                    inheritable_settings[block_key] = block_settings
+            self._inheritable_settings = inheritable_settings
+        return self._inheritable_settings
+
+    def _block_positions(self, structure):
+        """
+        Return a dict of the position of each block in the structure.
+        """
+        if self._positions is None:
+            self._positions = {block_key: position for position, block_key in enumerate(structure['blocks'])}
+        return self._positions
+
+    def _blocks_of_types(self, structure, block_types):
+        """
+        Return the set of the keys of the blocks matching the given block_type
+        criteria, or None if the criteria can't use the index.
+        """
+        if isinstance(block_types, dict) and list(block_types) == ['$in']:
+            block_types = block_types['$in']
+        elif isinstance(block_types, str):
+            block_types = [block_types]
+        else:
+            return None
+        if not all(isinstance(block_type, str) for block_type in block_types):
+            return None
+
+        if self._blocks_by_type is None:
+            blocks_by_type = defaultdict(set)
+            for block_key, block_data in structure['blocks'].items():
+                blocks_by_type[block_data.block_type].add(block_key)
+            self._blocks_by_type = dict(blocks_by_type)
+
+        block_keys = set()
+        for block_type in block_types:
+            block_keys |= self._blocks_by_type.get(block_type, set())
+        return block_keys
+
+    def _field_index(self, structure, field_name):
+        """
+        Return a dict of the keys of the blocks having each value of the
+        given field, and the set of the keys of the blocks whose value can't
+        be indexed. The elements of list values are indexed individually,
+        since get_items matches any element of lists.
+        """
+        if field_name not in self._field_indexes:
+            field_index = defaultdict(set)
+            unindexed = set()
+            for block_key, block_data in structure['blocks'].items():
+                if field_name not in block_data.fields:
+                    continue
+                value = block_data.fields[field_name]
+                for element in value if isinstance(value, list) else [value]:
+                    try:
+                        field_index[element].add(block_key)
+                    except TypeError:
+                        unindexed.add(block_key)
+            self._field_indexes[field_name] = (dict(field_index), unindexed)
+        return self._field_indexes[field_name]
+
+
+def _is_indexable(criteria):
+    """
+    Return whether the given get_items criteria matches by equality, and can
+    thus be looked up in a field index.
+    """
+    if isinstance(criteria, (dict, list, re.Pattern)) or callable(criteria):
+        return False
+    try:
+        hash(criteria)
+    except TypeError:
+        return False
+    return True
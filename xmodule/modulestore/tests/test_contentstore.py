@@ -3,16 +3,22 @@
 """
 
 
+import io
+import itertools
 import logging
 import mimetypes
 import shutil
+import tarfile
 import unittest
 from tempfile import mkdtemp
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 import ddt
 import path
+import pymongo
+from django.test.utils import override_settings
 from opaque_keys.edx.keys import AssetKey
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
 
@@ -147,6 +153,27 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(*itertools.product([True, False], [0, 8 * 1024 * 1024]))
+    @ddt.unpack
+    def test_export_for_course_to_tar(self, deprecated, prefetched_asset_max_size):
+        """
+        Test export into a tarfile, with the assets fetched ahead or streamed
+        """
+        self.set_up_assets(deprecated)
+        tar_buffer = io.BytesIO()
+        with patch('xmodule.contentstore.mongo.EXPORT_PREFETCHED_ASSET_MAX_SIZE', prefetched_asset_max_size):
+            with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar_file:
+                policy = self.contentstore.export_all_for_course_to_tar(self.course1_key, tar_file, 'course/static')
+
+        tar_buffer.seek(0)
+        with tarfile.open(fileobj=tar_buffer, mode='r:gz') as tar_file:
+            assert sorted(tar_file.getnames()) == sorted('course/static/' + name for name in self.course1_files)
+            for filename in self.course1_files:
+                asset_key = self.course1_key.make_asset_key('asset', filename)
+                exported_data = tar_file.extractfile('course/static/' + filename).read()
+                assert exported_data == self.contentstore.find(asset_key).data
+        assert sorted(policy) == sorted(self.course1_files)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -167,6 +194,55 @@ class TestContentstore(unittest.TestCase):
         assert count == 0
         assert not course_assets
 
+    @ddt.data(True, False)
+    def test_get_all_content_from_asset_metadata(self, deprecated):
+        """
+        Test get_all_content_for_course with the asset metadata index, after a backfill
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.asset_metadata.drop()
+        assert self.contentstore.backfill_asset_metadata(self.course1_key) == len(self.course1_files)
+        assert self.contentstore.backfill_asset_metadata() == len(self.course1_files) + len(self.course2_files)
+
+        with override_settings(CONTENTSTORE_USE_ASSET_METADATA_INDEX=True):
+            course1_assets, count = self.contentstore.get_all_content_for_course(self.course1_key)
+            assert count == len(self.course1_files)
+            assert sorted(asset['asset_key'].block_id for asset in course1_assets) == sorted(self.course1_files)
+            assert 'insensitive_displayname' not in course1_assets[0]
+
+            sort = [('displayname', pymongo.DESCENDING)]
+            first_page, __ = self.contentstore.get_all_content_for_course(self.course1_key, 0, 2, sort=sort)
+            cursor = self.contentstore.get_next_content_cursor(first_page, sort)
+            second_page, count = self.contentstore.get_all_content_for_course(
+                self.course1_key, start=2, maxresults=2, sort=sort, cursor=cursor,
+            )
+            assert count == len(self.course1_files)
+            assert [asset['displayname'] for asset in first_page + second_page] == sorted(
+                self.course1_files, reverse=True,
+            )
+
+            # The cursor is ignored by the queries of other pages, sorts or filters.
+            other_sort = [('displayname', pymongo.ASCENDING)]
+            for query_options in (
+                {'start': 1, 'sort': sort},
+                {'start': 2, 'sort': other_sort},
+                {'start': 2, 'sort': sort, 'filter_params': {'contentType': 'image/jpeg'}},
+            ):
+                expected_page, __ = self.contentstore.get_all_content_for_course(
+                    self.course1_key, maxresults=2, **query_options,
+                )
+                page, __ = self.contentstore.get_all_content_for_course(
+                    self.course1_key, maxresults=2, cursor=cursor, **query_options,
+                )
+                assert page == expected_page
+
+            asset_key = self.course1_key.make_asset_key('asset', 'picture1.jpg')
+            self.contentstore.set_attr(asset_key, 'locked', True)
+            self.contentstore.delete(self.course1_key.make_asset_key('asset', 'contains.sh'))
+            course1_assets, count = self.contentstore.get_all_content_for_course(self.course1_key)
+            assert count == len(self.course1_files) - 1
+            assert [asset['locked'] for asset in course1_assets if asset['asset_key'] == asset_key] == [True]
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
@@ -15,6 +15,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from testfixtures import LogCapture
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -35,7 +36,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, get_local_definition_cache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -690,6 +691,18 @@ class SplitModuleCourseTests(SplitModuleTest):
         course = modulestore().get_course(locator)
         assert course.location.version_guid != published_version
 
+    def test_get_course_expected_definitions(self):
+        '''
+        Test that only the definitions of the blocks loaded to a bounded depth are expected to be loaded
+        '''
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        store = modulestore()
+        with patch.object(store.db_connection, 'expect_definitions') as mock_expect_definitions:
+            store.get_course(locator, depth=None)
+            assert not mock_expect_definitions.called
+            store.get_course(locator, depth=1)
+            assert mock_expect_definitions.called
+
     def test_get_course_negative(self):
         # Now negative testing
         with pytest.raises(InsufficientSpecificationError):
@@ -842,6 +855,95 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         # now make sure that you get the same structure
         assert cached_structure == not_cached_structure
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_shared_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+
+        with override_settings(COURSE_STRUCTURE_SHARED_CACHE={'DIRECTORY': tempdir.mkdtemp_clean()}):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # the structure is served from the shared tier, even if the django cache is emptied
+            enabled_cache.clear()
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+            assert cached_structure == not_cached_structure
+
+            # If the shared data is corrupted, it is discarded and the structure is read again.
+            cache_key = self.new_course.id.version_guid
+            shared_store = CourseStructureCache().shared_store
+            shared_store.delete(cache_key)
+            shared_store.set(cache_key, b"bad_data")
+            with check_mongo_calls(1):
+                not_corrupt_structure = self._get_structure(self.new_course)
+            assert not_corrupt_structure == not_cached_structure
+
+            # a django cache hit warms the shared tier
+            shared_store.delete(cache_key)
+            with check_mongo_calls(0):
+                self._get_structure(self.new_course)
+            assert shared_store.get(cache_key, bytes) is not None
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_shared_cache_without_django_cache(self, mock_get_cache):
+        mock_get_cache.side_effect = InvalidCacheBackendError
+
+        with override_settings(COURSE_STRUCTURE_SHARED_CACHE={'DIRECTORY': tempdir.mkdtemp_clean()}):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+        assert cached_structure == not_cached_structure
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.STRUCTURE_CACHE_CHUNK_SIZE', 100)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunks(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        assert cached_structure == not_cached_structure
+
+        # If a chunk is evicted, the structure is read from mongo and cached again.
+        cache_key = self.new_course.id.version_guid
+        cached_entries = enabled_cache._cache  # pylint: disable=protected-access
+        chunk_key = next(key for key in cached_entries if f'{cache_key}.' in key)
+        cached_entries.pop(chunk_key)
+        with check_mongo_calls(1):
+            self._get_structure(self.new_course)
+        with check_mongo_calls(0):
+            assert self._get_structure(self.new_course) == not_cached_structure
+
+    @override_settings(COURSE_STRUCTURE_CACHE_CODEC={'VERSION': 1, 'COMPRESSION': 'zlib'})
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_format_migration(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        cache_key = self.new_course.id.version_guid
+
+        with override_settings(COURSE_STRUCTURE_CACHE_CODEC={'VERSION': 0}):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+        # structures cached in the previous format are still read from the cache
+        with check_mongo_calls(0):
+            assert self._get_structure(self.new_course) == not_cached_structure
+
+        # structures cached in unknown formats are misses, but are not corrupt
+        enabled_cache.set(cache_key, b"\x09unknown_format")
+        with patch.object(enabled_cache, 'delete') as mock_delete:
+            with check_mongo_calls(1):
+                assert self._get_structure(self.new_course) == not_cached_structure
+        mock_delete.assert_not_called()
+        assert enabled_cache.get(cache_key)[0] == 1
+
     @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
     def test_course_structure_cache_with_data_chunk_greater_than_one_mb(self, mock_get_cache, mock_set_cache):
@@ -888,6 +990,80 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         )
 
 
+class TestCourseDefinitionCache(CacheIsolationMixin, SplitModuleTest):
+    """Tests for the CourseDefinitionCache"""
+
+    # We'll use the "default" cache as a valid cache, and the "course_structure_cache" as a dummy cache
+    ENABLED_CACHES = ["default"]
+
+    def setUp(self):
+        self.user = random.getrandbits(32)
+        self.new_course = modulestore().create_course(
+            'org', 'course', 'test_run', self.user, BRANCH_NAME_DRAFT,
+        )
+        self.definition_id = self.new_course.definition_locator.definition_id
+
+        super().setUp()
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_definition_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+
+        with check_mongo_calls(1):
+            not_cached_definition = self._get_definition()
+
+        with check_mongo_calls(0):
+            cached_definition = self._get_definition()
+            cached_definitions = self._get_definitions()
+        assert cached_definition == not_cached_definition
+        assert cached_definitions == [not_cached_definition]
+
+        # If data is corrupted, get it from mongo again.
+        enabled_cache.set(f'definition.{self.definition_id}', b"bad_data")
+        with check_mongo_calls(1):
+            assert self._get_definitions() == [not_cached_definition]
+
+    @override_settings(COURSE_DEFINITION_LOCAL_CACHE_SIZE=1000 * 1000)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_local_definition_cache(self, mock_get_cache):
+        mock_get_cache.side_effect = InvalidCacheBackendError
+        self.addCleanup(get_local_definition_cache().clear)
+
+        with check_mongo_calls(1):
+            not_cached_definition = self._get_definition()
+
+        with check_mongo_calls(0):
+            cached_definition = self._get_definition()
+        assert cached_definition == not_cached_definition
+
+        # every read returns a new copy of the definition
+        cached_definition['fields']['mutated'] = True
+        with check_mongo_calls(0):
+            assert self._get_definition() == not_cached_definition
+
+    def test_dummy_cache(self):
+        with check_mongo_calls(1):
+            not_cached_definition = self._get_definition()
+
+        with check_mongo_calls(1):
+            cached_definition = self._get_definition()
+        assert cached_definition == not_cached_definition
+
+    def _get_definition(self):
+        """
+        Helper function to get the definition of the new course's root block.
+        """
+        return modulestore().db_connection.get_definition(self.definition_id)
+
+    def _get_definitions(self):
+        """
+        Helper function to get the definitions of the new course's root block
+        with a single query.
+        """
+        return modulestore().db_connection.get_definitions([self.definition_id])
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -2,10 +2,13 @@
 
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+import ddt
 import pytest
-from pymongo.errors import ConnectionFailure
+from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
+from pymongo.errors import BulkWriteError, ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
@@ -24,3 +27,108 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with pytest.raises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+@ddt.ddt
+class TestInsertDefinitions(unittest.TestCase):
+    """ Test the batched inserts of definitions """
+
+    @patch('pymongo.MongoClient')
+    @patch('pymongo.database.Database')
+    def setUp(self, *calls):  # pylint: disable=arguments-differ
+        # pylint: disable=W0613
+        super().setUp()
+        with patch('mongodb_proxy.MongoProxy'):
+            self.conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        self.conn.definitions = Mock()
+        self.definitions = [{'_id': 1, 'fields': {}}, {'_id': 2, 'fields': {}}]
+
+    def test_insert_definitions(self):
+        self.conn.insert_definitions(self.definitions)
+        self.conn.definitions.insert_many.assert_called_once_with(self.definitions, ordered=False)
+
+    def test_duplicate_definitions(self):
+        self.conn.definitions.insert_many.side_effect = BulkWriteError(
+            {'writeErrors': [{'index': 0, 'code': 11000}], 'writeConcernErrors': []}
+        )
+        self.conn.insert_definitions(self.definitions)
+
+    @ddt.data(
+        {'writeErrors': [{'index': 0, 'code': 11000}, {'index': 1, 'code': 2}], 'writeConcernErrors': []},
+        {'writeErrors': [], 'writeConcernErrors': [{'code': 64}]},
+    )
+    def test_insert_errors(self, details):
+        self.conn.definitions.insert_many.side_effect = BulkWriteError(details)
+        with pytest.raises(BulkWriteError):
+            self.conn.insert_definitions(self.definitions)
+
+
+class TestDefinitionCollector(unittest.TestCase):
+    """ Test the batched fetches of the definitions expected by a request """
+
+    @patch('pymongo.MongoClient')
+    @patch('pymongo.database.Database')
+    def setUp(self, *calls):  # pylint: disable=arguments-differ
+        # pylint: disable=W0613
+        super().setUp()
+        with patch('mongodb_proxy.MongoProxy'):
+            self.conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        self.conn.definitions = Mock()
+        self.conn.definitions.find.side_effect = lambda query: [
+            {'_id': key, 'block_type': 'html', 'fields': {}} for key in query['_id']['$in']
+        ]
+        self.conn.definitions.find_one.side_effect = lambda query: {
+            '_id': query['_id'], 'block_type': 'html', 'fields': {}
+        }
+
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        request_patcher = patch('xmodule.modulestore.split_mongo.mongo_connection.crum.get_current_request')
+        request_patcher.start()
+        self.addCleanup(request_patcher.stop)
+        cache_patcher = patch('xmodule.modulestore.split_mongo.mongo_connection.CourseDefinitionCache')
+        self.cache = cache_patcher.start().return_value
+        self.cache.get_many.return_value = {}
+        self.addCleanup(cache_patcher.stop)
+
+    @override_settings(MODULESTORE_DEFINITION_BATCH_SIZE=3)
+    def test_expected_definitions(self):
+        self.conn.expect_definitions([1, 2, 3, 4])
+
+        assert self.conn.get_definition(2)['_id'] == 2
+        self.conn.definitions.find.assert_called_once_with({'_id': {'$in': [2, 1, 3]}})
+        assert self.conn.get_definition(1)['_id'] == 1
+        assert self.conn.get_definition(3)['_id'] == 3
+        assert self.conn.definitions.find.call_count == 1
+
+        assert self.conn.get_definition(4)['_id'] == 4
+        self.conn.definitions.find.assert_called_with({'_id': {'$in': [4]}})
+        self.conn.definitions.find_one.assert_not_called()
+
+    @override_settings(MODULESTORE_DEFINITION_BATCH_SIZE=3)
+    def test_only_used_definitions_cached(self):
+        self.cache.get_many.return_value = {3: {'_id': 3, 'block_type': 'html', 'fields': {}}}
+        self.conn.expect_definitions([1, 2, 3])
+
+        assert self.conn.get_definition(1)['_id'] == 1
+        self.conn.definitions.find.assert_called_once_with({'_id': {'$in': [1, 2]}})
+        self.cache.set_many.assert_called_once_with([{'_id': 1, 'block_type': 'html', 'fields': {}}], None)
+
+        # Definitions read from the cache aren't cached again.
+        assert self.conn.get_definition(3)['_id'] == 3
+        assert self.cache.set_many.call_count == 1
+
+    def test_unexpected_definition(self):
+        self.conn.expect_definitions([1])
+
+        assert self.conn.get_definition(2)['_id'] == 2
+        self.conn.definitions.find_one.assert_called_once_with({'_id': 2})
+        self.conn.definitions.find.assert_not_called()
+
+    @override_settings(MODULESTORE_DEFINITION_BATCH_SIZE=0)
+    def test_batches_disabled(self):
+        self.conn.expect_definitions([1, 2])
+
+        assert self.conn.get_definition(1)['_id'] == 1
+        self.conn.definitions.find_one.assert_called_once_with({'_id': 1})
+        self.conn.definitions.find.assert_not_called()
@@ -0,0 +1,44 @@
+""" Test the behavior of split_mongo/SharedStructureStore """
+
+
+import os
+import unittest
+
+from openedx.core.lib import tempdir
+from xmodule.modulestore.split_mongo.shared_structure_cache import SharedStructureStore
+
+
+class TestSharedStructureStore(unittest.TestCase):
+    """ Tests for the host-local shared structure store """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempdir.mkdtemp_clean()
+        self.store = SharedStructureStore(self.directory, max_size=100)
+
+    def test_get_set_delete(self):
+        assert self.store.get('structure', bytes) is None
+
+        assert self.store.set('structure', b'data') == 0
+        assert self.store.get('structure', bytes) == b'data'
+
+        self.store.delete('structure')
+        assert self.store.get('structure', bytes) is None
+
+    def test_too_large(self):
+        self.store.set('structure', b'x' * 101)
+        assert self.store.get('structure', bytes) is None
+
+    def test_eviction(self):
+        self.store.set('first', b'x' * 40)
+        self.store.set('second', b'x' * 40)
+        for name, mtime in (('first', 1), ('second', 2)):
+            os.utime(self.store._path(name), (mtime, mtime))  # pylint: disable=protected-access
+
+        # reading refreshes the least recently used structure
+        self.store.get('first', bytes)
+
+        assert self.store.set('third', b'x' * 40) == 1
+        assert self.store.get('first', bytes) is not None
+        assert self.store.get('second', bytes) is None
+        assert self.store.get('third', bytes) is not None
@@ -0,0 +1,67 @@
+""" Test the behavior of split_mongo/StructureCodec """
+
+
+import pickle
+import unittest
+import zlib
+from datetime import datetime
+
+import ddt
+import pytest
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_codec import (
+    COMPRESSORS,
+    LEGACY_VERSION,
+    VERSION_1,
+    StructureCodec,
+    UnsupportedStructureFormat,
+)
+
+
+@ddt.ddt
+class TestStructureCodec(unittest.TestCase):
+    """ Tests for encoding and decoding cached structures """
+
+    def setUp(self):
+        super().setUp()
+        root = BlockKey('course', 'course')
+        child = BlockKey('chapter', 'chapter')
+        edit_info = {'update_version': ObjectId(), 'edited_on': datetime(2020, 1, 1), 'edited_by': 3}
+        self.structure = {
+            '_id': ObjectId(),
+            'root': root,
+            'blocks': {
+                root: BlockData(block_type='course', fields={'children': [child]}, edit_info=edit_info),
+                child: BlockData(block_type='chapter', fields={'display_name': 'Chapter'}, edit_info=edit_info),
+            },
+        }
+
+    @ddt.data(*[(VERSION_1, compression) for compression in COMPRESSORS] + [(LEGACY_VERSION, 'zlib')])
+    @ddt.unpack
+    def test_round_trip(self, version, compression):
+        encoded_data = StructureCodec(version, compression).encode(self.structure)
+        assert StructureCodec.decode(encoded_data) == self.structure
+
+    def test_legacy_format(self):
+        legacy_data = zlib.compress(pickle.dumps(self.structure, 4), 1)
+        assert StructureCodec(LEGACY_VERSION).encode(self.structure) == legacy_data
+        # Structures cached in the legacy format can be read by any codec.
+        assert StructureCodec(VERSION_1).decode(legacy_data) == self.structure
+
+    def test_buffer(self):
+        encoded_data = StructureCodec(VERSION_1).encode(self.structure)
+        assert StructureCodec.decode(memoryview(bytearray(encoded_data))) == self.structure
+
+    @ddt.data(b'', b'\x09data', bytes((VERSION_1, 0xfe)) + b'data')
+    def test_unsupported_format(self, encoded_data):
+        with pytest.raises(UnsupportedStructureFormat):
+            StructureCodec.decode(encoded_data)
+
+    def test_unknown_settings(self):
+        with pytest.raises(ValueError):
+            StructureCodec(version=0xfe)
+        with pytest.raises(ValueError):
+            StructureCodec(compression='unknown')
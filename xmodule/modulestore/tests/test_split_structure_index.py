@@ -0,0 +1,114 @@
+""" Test the behavior of split_mongo/StructureIndex """
+
+
+import re
+import unittest
+
+import ddt
+from bson.objectid import ObjectId
+from django.test.utils import override_settings
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import (
+    StructureIndex,
+    clear_structure_indexes,
+    get_structure_index,
+)
+
+COURSE = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'chapter')
+VIDEO = BlockKey('video', 'video')
+HTML = BlockKey('html', 'html')
+ORPHAN = BlockKey('html', 'orphan')
+ORPHAN_CHILD = BlockKey('video', 'orphan_child')
+
+
+@ddt.ddt
+class TestStructureIndex(unittest.TestCase):
+    """ Tests for the indexes over structures """
+
+    def setUp(self):
+        super().setUp()
+        self.structure = {
+            '_id': ObjectId(),
+            'root': COURSE,
+            'blocks': {
+                COURSE: BlockData(block_type='course', fields={'children': [CHAPTER], 'graded': False}),
+                CHAPTER: BlockData(block_type='chapter', fields={'children': [VIDEO, HTML], 'graded': True}),
+                VIDEO: BlockData(
+                    block_type='video', fields={'display_name': 'Video', 'tags': ['a', {'b': 1}], 'xqa_key': 'key'},
+                ),
+                HTML: BlockData(block_type='html', fields={'display_name': 'Text', 'tags': ['a', 'c']}),
+                ORPHAN: BlockData(block_type='html', fields={'children': [ORPHAN_CHILD]}),
+                ORPHAN_CHILD: BlockData(block_type='video', fields={'display_name': 'Video'}),
+            },
+        }
+        self.index = StructureIndex(self.structure)
+
+    @ddt.data(
+        ('video', None, [VIDEO, ORPHAN_CHILD]),
+        ({'$in': ['video', 'html']}, None, [VIDEO, HTML, ORPHAN, ORPHAN_CHILD]),
+        ('problem', None, []),
+        ('video', {'display_name': 'Video'}, [VIDEO, ORPHAN_CHILD]),
+        (None, {'display_name': 'Text'}, [HTML]),
+        (None, {'tags': 'a'}, [VIDEO, HTML]),
+        # blocks with unhashable values are always candidates
+        (None, {'tags': 'c'}, [VIDEO, HTML]),
+        (None, {'children': CHAPTER}, [COURSE]),
+        ('html', {'display_name': re.compile('T'), 'children': ORPHAN_CHILD}, [ORPHAN]),
+    )
+    @ddt.unpack
+    def test_candidates(self, block_types, field_criteria, expected_candidates):
+        assert self.index.candidates(self.structure, block_types, field_criteria) == expected_candidates
+
+    @ddt.data(
+        (None, None),
+        (re.compile('vid'), None),
+        (None, {'display_name': re.compile('Vid')}),
+        (None, {'display_name': lambda value: True}),
+        (None, {'display_name': {'$exists': False}}),
+    )
+    @ddt.unpack
+    def test_no_candidates(self, block_types, field_criteria):
+        assert self.index.candidates(self.structure, block_types, field_criteria) is None
+
+    def test_parents(self):
+        parents = self.index.parents(self.structure)
+        assert parents[VIDEO] == [CHAPTER]
+        assert parents[ORPHAN_CHILD] == [ORPHAN]
+        assert COURSE not in parents
+
+    def test_reachable(self):
+        assert self.index.reachable(self.structure) == {COURSE, CHAPTER, VIDEO, HTML}
+
+    @ddt.data(
+        (VIDEO, 'graded', (CHAPTER, True)),
+        (CHAPTER, 'graded', (COURSE, False)),
+        (COURSE, 'graded', (None, None)),
+        # the settings set on the block itself aren't inherited
+        (VIDEO, 'xqa_key', (None, None)),
+        (HTML, 'due', (None, None)),
+        (ORPHAN_CHILD, 'graded', (None, None)),
+    )
+    @ddt.unpack
+    def test_inherited_setting(self, block_key, field_name, expected_setting):
+        assert self.index.inherited_setting(self.structure, block_key, field_name) == expected_setting
+
+    def test_inherited_setting_cycle(self):
+        self.structure['blocks'][VIDEO].fields['children'] = [CHAPTER]
+        assert self.index.inherited_setting(self.structure, HTML, 'due') == (None, None)
+
+    def test_get_structure_index(self):
+        self.addCleanup(clear_structure_indexes)
+        structure_index = get_structure_index(self.structure)
+        assert get_structure_index(self.structure) is structure_index
+
+        other_structure = dict(self.structure, _id=ObjectId())
+        with override_settings(COURSE_STRUCTURE_INDEX_CACHE_SIZE=1):
+            assert get_structure_index(other_structure) is not structure_index
+            # the least recently used index was evicted
+            assert get_structure_index(self.structure) is not structure_index
+
+        with override_settings(COURSE_STRUCTURE_INDEX_CACHE_SIZE=0):
+            assert get_structure_index(self.structure) is None
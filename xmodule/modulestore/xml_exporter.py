@@ -4,11 +4,13 @@ Methods for exporting course data to XML
 
 
 import logging
-import os
+import tarfile
+import time
 from abc import abstractmethod
 from json import dumps
 
 import lxml.etree
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict, Scope
@@ -105,21 +107,25 @@ class ExportManager:
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, tar_file=None):
         """
         Export all blocks from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
         `modulestore`: A `ModuleStore` object that is the source of the blocks to export
         `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
         `courselike_key`: The Locator of the block to export
-        `root_dir`: The directory to write the exported xml to
+        `root_dir`: The directory to write the exported xml to, ignored if `tar_file` is given
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `tar_file`: A `tarfile.TarFile` opened for writing. If given, the xml is written to it
+            under `target_dir` instead of to `root_dir`, and the static assets are streamed into
+            it from the contentstore, without writing anything to disk.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = str(target_dir)
+        self.tar_file = tar_file
 
     @abstractmethod
     def get_key(self):
@@ -149,13 +155,33 @@ class ExportManager:
         Get the target courselike object for this export.
         """
 
+    def export_static_assets(self, export_fs):
+        """
+        Export the static assets from the contentstore into the static directory, and their
+        attributes to policies/assets.json.
+        """
+        if self.tar_file is None:
+            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                root_courselike_dir + '/static/',
+                root_courselike_dir + '/policies/assets.json',
+            )
+        else:
+            policy = self.contentstore.export_all_for_course_to_tar(
+                self.courselike_key, self.tar_file, self.target_dir + '/static',
+            )
+            with export_fs.makedir('policies', recreate=True).open('assets.json', 'wb') as assets_policy:
+                assets_policy.write(dumps(policy, sort_keys=True, indent=4).encode('utf-8'))
+
     def export(self):
         """
         Perform the export given the parameters handed to this class at init.
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            # The xml is small enough to be staged in memory before being added to the tarfile.
+            fsm = OSFS(self.root_dir) if self.tar_file is None else MemoryFS()
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -173,12 +199,15 @@ class ExportManager:
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            root_courselike_dir = self.root_dir + '/' + self.target_dir if self.tar_file is None else None
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+            if self.tar_file is not None:
+                _add_fs_to_tar(fsm, self.tar_file)
+
 
 class CourseExportManager(ExportManager):
     """
@@ -203,26 +232,20 @@ class CourseExportManager(ExportManager):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makedir(AssetMetadata.EXPORTED_ASSET_DIR, recreate=True)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
         # export the static assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -237,10 +260,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makedirs('static/images', recreate=True)
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -317,11 +338,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makedir('policies', recreate=True)
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
     def post_process(self, root, export_fs):
         """
@@ -350,6 +367,35 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tarball(modulestore, contentstore, course_key, tar_file, course_dir):
+    """
+    Export the course into the directory `course_dir` of the given tarfile, opened for writing.
+    See ExportManager for details.
+    """
+    CourseExportManager(modulestore, contentstore, course_key, None, course_dir, tar_file=tar_file).export()
+
+
+def export_library_to_tarball(modulestore, contentstore, library_key, tar_file, library_dir):
+    """
+    Export the library into the directory `library_dir` of the given tarfile, opened for writing.
+    See ExportManager for details.
+    """
+    LibraryExportManager(modulestore, contentstore, library_key, None, library_dir, tar_file=tar_file).export()
+
+
+def _add_fs_to_tar(export_fs, tar_file):
+    """
+    Add all the files of the given filesystem to the tarfile, at the same paths.
+    """
+    mtime = time.time()
+    for file_path in export_fs.walk.files():
+        file_info = tarfile.TarInfo(file_path.lstrip('/'))
+        file_info.size = export_fs.getsize(file_path)
+        file_info.mtime = mtime
+        with export_fs.openbin(file_path) as exported_file:
+            tar_file.addfile(file_info, exported_file)
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
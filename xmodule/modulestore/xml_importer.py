@@ -26,7 +26,9 @@ import logging
 import mimetypes
 import os
 import re
+import time
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import xblock
 from django.core.exceptions import ObjectDoesNotExist
@@ -60,6 +62,9 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# Number of static files read and saved to the contentstore concurrently during imports.
+IMPORT_STATIC_CONTENT_WORKERS = 8
+
 
 class CourseImportException(Exception):
     """
@@ -137,6 +142,7 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        file_paths = []
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -150,8 +156,14 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
                 if verbose:
                     log.debug('importing static content %s...', file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+                file_paths.append(file_path)
 
+        # Saving each file is a round trip to the contentstore, so the files are
+        # uploaded concurrently. Each worker holds a single file in memory.
+        with ThreadPoolExecutor(max_workers=IMPORT_STATIC_CONTENT_WORKERS) as executor:
+            for imported_file_attrs in executor.map(
+                lambda file_path: self.import_static_file(file_path, base_dir=static_dir), file_paths
+            ):
                 if imported_file_attrs:
                     # store the remapping information which will be needed
                     # to subsitute in the module data
@@ -255,6 +267,11 @@ class ImportManager:
             create this file to implement custom logic in their course.
 
         default_class, load_error_blocks: are arguments for constructing the XMLModuleStore (see its doc)
+
+        timings: If given, a dict which is updated with the duration, in seconds, of each phase of the
+            import: 'parse' for loading the xml courselikes, 'assets' for importing the static content
+            and asset metadata, 'blocks' for building the blocks in the bulk operations, and 'write' for
+            writing the definitions and structures built in the bulk operations to the modulestore.
     """
     store_class = XMLModuleStore
 
@@ -267,6 +284,7 @@ class ImportManager:
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            timings=None,
     ):
         self.store = store
         self.user_id = user_id
@@ -282,6 +300,8 @@ class ImportManager:
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.timings = timings if timings is not None else {}
+        start = time.perf_counter()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -291,8 +311,15 @@ class ImportManager:
             xblock_select=store.xblock_select,
             target_course_id=target_id,
         )
+        self.add_timing('parse', start)
         self.logger, self.errors = make_error_tracker()
 
+    def add_timing(self, phase, start):
+        """
+        Add the time elapsed since start, a time.perf_counter() value, to the duration of the given phase.
+        """
+        self.timings[phase] = self.timings.get(phase, 0) + time.perf_counter() - start
+
     def preflight(self):
         """
         Perform any pre-import sanity checks.
@@ -552,18 +579,27 @@ class ImportManager:
                 continue
 
             # This bulk operation wraps all the operations to populate the published branch.
+            # The definitions and structures built in a bulk operation are written when it ends.
             with self.store.bulk_operations(dest_id):
+                start = time.perf_counter()
                 # Retrieve the course itself.
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                self.add_timing('blocks', start)
 
+                start = time.perf_counter()
                 # Import all static pieces.
                 self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
                 self.import_asset_metadata(data_path, dest_id)
+                self.add_timing('assets', start)
 
+                start = time.perf_counter()
                 # Import all children
                 self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                self.add_timing('blocks', start)
+                start = time.perf_counter()
+            self.add_timing('write', start)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -571,8 +607,12 @@ class ImportManager:
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
             with self.store.bulk_operations(dest_id):
+                start = time.perf_counter()
                 # Import all draft items into the courselike.
                 courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                self.add_timing('blocks', start)
+                start = time.perf_counter()
+            self.add_timing('write', start)
 
             yield courselike
 
@@ -6,7 +6,9 @@ Common MongoDB connection functions.
 import logging
 
 import pymongo
+from edx_django_utils.cache import RequestCache
 from mongodb_proxy import MongoProxy
+from pymongo import monitoring
 from pymongo.read_preferences import (  # lint-amnesty, pylint: disable=unused-import
     ReadPreference,
     _MONGOS_MODES,
@@ -19,6 +21,47 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 # This will yeld a map of all available Mongo modes and their name
 MONGO_READ_PREFERENCE_MAP = dict(zip(_MONGOS_MODES, _MODES))
 
+# The namespace of the request cache counting the MongoDB commands run by the current request.
+REQUEST_QUERY_STATS_NAMESPACE = 'mongo_request_query_stats'
+
+
+class RequestQueryStatsListener(monitoring.CommandListener):
+    """
+    Counts the MongoDB commands run by the current request, and adds up their duration.
+
+    pymongo publishes the command events in the thread running the command, so the
+    stats are kept in the request cache of that thread.
+    """
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        _record_request_query(event.duration_micros)
+
+    def failed(self, event):
+        _record_request_query(event.duration_micros)
+
+
+def _record_request_query(duration_micros):
+    """
+    Add a MongoDB command of the given duration to the stats of the current request.
+    """
+    stats = RequestCache(REQUEST_QUERY_STATS_NAMESPACE).data
+    stats['count'] = stats.get('count', 0) + 1
+    stats['duration_micros'] = stats.get('duration_micros', 0) + duration_micros
+
+
+def get_request_query_stats():
+    """
+    Return the number of MongoDB commands run by the current request, and their total
+    duration in milliseconds.
+    """
+    stats = RequestCache(REQUEST_QUERY_STATS_NAMESPACE).data
+    return stats.get('count', 0), stats.get('duration_micros', 0) / 1000
+
+
+REQUEST_QUERY_STATS_LISTENER = RequestQueryStatsListener()
+
 
 def connect_to_mongodb(
     db, host,
@@ -51,6 +94,9 @@ def connect_to_mongodb(
         if read_preference is not None:
             kwargs['read_preference'] = read_preference
 
+    # Count the commands of each request, see get_request_query_stats.
+    kwargs['event_listeners'] = list(kwargs.get('event_listeners', [])) + [REQUEST_QUERY_STATS_LISTENER]
+
     mongo_conn = pymongo.database.Database(
         pymongo.MongoClient(
             host=host,
@@ -18,11 +18,12 @@ from pytz import UTC
 from web_fragments.fragment import Fragment
 from xblock.completable import XBlockCompletionMode
 from xblock.core import XBlock
-from xblock.exceptions import NoSuchServiceError
+from xblock.exceptions import JsonHandlerError, NoSuchServiceError
 from xblock.fields import Boolean, Integer, List, Scope, String
 
 from edx_toggles.toggles import WaffleFlag, SettingDictToggle
 from xmodule.util.builtin_assets import add_webpack_js_to_fragment, add_sass_to_fragment
+from xmodule.util.misc import render_child_block
 from xmodule.x_module import (
     ResourceTemplates,
     shim_xmodule_js,
@@ -69,6 +70,16 @@ TIMED_EXAM_GATING_WAFFLE_FLAG = WaffleFlag(  # lint-amnesty, pylint: disable=tog
 # .. toggle_target_removal_date: None
 SHOW_PROGRESS_BAR = SettingDictToggle("FEATURES", "SHOW_PROGRESS_BAR", default=False, module_name=__name__)
 
+# .. toggle_name: xmodule.lazy_sequence_units
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Set to True to only render the active unit of sequences in the legacy courseware. The
+#   other units are rendered on demand, through the render_unit handler, when the learner navigates to them.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: None
+LAZY_SEQUENCE_UNITS_WAFFLE_FLAG = WaffleFlag('xmodule.lazy_sequence_units', __name__)
+
 
 class SequenceFields:  # lint-amnesty, pylint: disable=missing-class-docstring
     has_children = True
@@ -331,6 +342,37 @@ class SequenceBlock(
             self.position = 1
         return {'success': True}
 
+    @XBlock.json_handler
+    def render_unit(self, data, _suffix=''):
+        """
+        Returns the rendered student view of the unit at the 'position' value in the incoming dict, for the
+        units that weren't rendered with the sequence.
+        """
+        children = self.get_children()
+        position = data.get('position')
+        if not isinstance(position, int) or not 0 < position <= len(children):
+            raise JsonHandlerError(400, 'Invalid position')
+        context = self._get_render_unit_context()
+        if self.descendants_are_gated(context) or self._hidden_content_student_view(context):
+            raise JsonHandlerError(403, 'The units of this sequence are not available')
+
+        fragment = Fragment()
+        [block_info] = self._render_student_view_for_blocks(context, [children[position - 1]], fragment)
+        return dict(fragment.to_dict(), content=block_info['content'])
+
+    def _get_render_unit_context(self):
+        """
+        Returns the context the units are rendered with by the render_unit handler, rebuilt from the
+        current user as the student view of the sequence gets it from the courseware view.
+        """
+        from lms.djangoapps.courseware.masquerade import is_masquerading_as_specific_student
+
+        user = self.runtime.service(self, 'user')._django_user  # pylint: disable=protected-access
+        return {
+            'specific_masquerade': is_masquerading_as_specific_student(user, self.location.course_key),
+            'user_authenticated': bool(user and user.is_authenticated),
+        }
+
     # If you are reading this and it's past the 'Maple' Open edX release, you can delete this handle_ajax method, as
     # these are now individual xblock-style handler methods. We want to keep these around for a single release, simply
     # to handle learners that haven't refreshed their courseware page when the server gets updated and their old
@@ -550,7 +592,12 @@ class SequenceBlock(
                 'This section is a prerequisite. You must complete this section in order to unlock additional content.'
             )
 
-        blocks = self._render_student_view_for_blocks(context, children, fragment, view) if prereq_met else []
+        if prereq_met:
+            blocks = self._render_student_view_for_blocks(
+                context, children, fragment, view, render_lazily=LAZY_SEQUENCE_UNITS_WAFFLE_FLAG.is_enabled(),
+            )
+        else:
+            blocks = []
 
         params = {
             'items': blocks,
@@ -735,16 +782,21 @@ class SequenceBlock(
         elif self.position is None or self.position > number_of_children:
             self.position = 1
 
-    def _render_student_view_for_blocks(self, context, children, fragment, view=STUDENT_VIEW):
+    def _render_student_view_for_blocks(self, context, children, fragment, view=STUDENT_VIEW, render_lazily=False):
         """
         Updates the given fragment with rendered student views of the given
         children.  Returns a list of dict objects with information about
         the given children.
+
+        If render_lazily is True, only the student view of the child at the
+        current position is rendered; the other children are marked as lazy,
+        to be rendered on demand by the render_unit handler.
         """
         # Avoid circular imports.
         from openedx.core.lib.xblock_utils import get_icon
 
         render_blocks = not context.get('exclude_units', False)
+        render_lazily = render_lazily and render_blocks and view == STUDENT_VIEW
         is_user_authenticated = self.is_user_authenticated(context)
         completion_service = self.runtime.service(self, 'completion')
         try:
@@ -759,7 +811,7 @@ class SequenceBlock(
             self.display_name_with_default
         ]
         contents = []
-        for block in children:
+        for position, block in enumerate(children, 1):
             item_type = get_icon(block)
             usage_id = block.scope_ids.usage_id
 
@@ -774,8 +826,9 @@ class SequenceBlock(
             context['bookmarked'] = is_bookmarked
             context['format'] = getattr(self, 'format', '')
 
-            if render_blocks:
-                rendered_block = block.render(view, context)
+            render_block = render_blocks and (not render_lazily or position == self.position)
+            if render_block:
+                rendered_block = render_child_block(block, view, context)
                 fragment.add_fragment_resources(rendered_block)
                 content = rendered_block.content
             else:
@@ -797,6 +850,8 @@ class SequenceBlock(
                 'graded': block.graded,
                 'contains_content_type_gated_content': contains_content_type_gated_content,
             }
+            if render_lazily and not render_block:
+                block_info['lazy'] = True
             if not render_blocks:
                 # The item url format can be defined in the template context like so:
                 # context['item_url'] = '/my/item/path/{usage_key}/whatever'
@@ -7,9 +7,10 @@ from unittest import TestCase
 from uuid import uuid4
 
 import ddt
+from edx_django_utils.cache import RequestCache
 from pymongo import ReadPreference
 
-from xmodule.mongo_utils import connect_to_mongodb
+from xmodule.mongo_utils import connect_to_mongodb, get_request_query_stats
 
 
 @ddt.ddt
@@ -36,3 +37,20 @@ class MongoUtilsTests(TestCase):
         # Support for read_preference given as mongos name.
         connection = connect_to_mongodb(db, host, read_preference=mongos_name)
         assert connection.client.read_preference == expected_read_preference
+
+    def test_request_query_stats(self):
+        """
+        Test that the commands run by the current request are counted.
+        """
+        RequestCache.clear_all_namespaces()
+        connection = connect_to_mongodb('test_request_query_stats_%s' % uuid4().hex, 'localhost')
+        assert get_request_query_stats() == (0, 0)
+
+        connection.command('ping')
+        connection.command('ping')
+        query_count, query_time = get_request_query_stats()
+        assert query_count == 2
+        assert query_time > 0
+
+        RequestCache.clear_all_namespaces()
+        assert get_request_query_stats() == (0, 0)
@@ -18,7 +18,7 @@ from web_fragments.fragment import Fragment
 
 from edx_toggles.toggles.testutils import override_waffle_flag
 from openedx.features.content_type_gating.models import ContentTypeGatingConfig
-from xmodule.seq_block import TIMED_EXAM_GATING_WAFFLE_FLAG, SequenceBlock
+from xmodule.seq_block import LAZY_SEQUENCE_UNITS_WAFFLE_FLAG, TIMED_EXAM_GATING_WAFFLE_FLAG, SequenceBlock
 from xmodule.tests import get_test_system, prepare_block_runtime
 from xmodule.tests.helpers import StubUserService
 from xmodule.tests.xml import XModuleXmlImportTest
@@ -366,6 +366,74 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         # assert content shown as normal
         self._assert_ungated(html, self.sequence_1_2)
 
+    @override_waffle_flag(LAZY_SEQUENCE_UNITS_WAFFLE_FLAG, active=True)
+    def test_render_student_view_lazy_units(self):
+        html = self._get_rendered_view(self.sequence_3_1, extra_context={'position': 2})
+        self._assert_view_at_position(html, expected_position=2)
+        # only the unit at the current position is rendered
+        assert html.count("'lazy': True") == 2
+        assert html.count("'content': ''") == 2
+
+    @override_waffle_flag(LAZY_SEQUENCE_UNITS_WAFFLE_FLAG, active=True)
+    def test_render_public_view_lazy_units(self):
+        html = self._get_rendered_view(self.sequence_3_1, view=PUBLIC_VIEW)
+        assert "'lazy': True" not in html
+
+    def test_xblock_handler_render_unit(self):
+        """Test that a unit is rendered on demand through ajax call"""
+        request = RequestFactory().post(
+            '/',
+            data=json.dumps({'position': 2}),
+            content_type='application/json',
+        )
+        render_return = self.sequence_3_1.handle('render_unit', request)
+        assert render_return.status_code == 200
+        assert str(self.sequence_3_1.get_children()[1].location) in render_return.json['content']
+        assert 'resources' in render_return.json
+
+    @ddt.data(0, 4, '1', None)
+    def test_xblock_handler_render_unit_bad_position(self, position):
+        """Test that rendering a unit at an invalid position fails"""
+        request = RequestFactory().post(
+            '/',
+            data=json.dumps({'position': position}),
+            content_type='application/json',
+        )
+        render_return = self.sequence_3_1.handle('render_unit', request)
+        assert render_return.status_code == 400
+
+    @ddt.data(True, False)
+    def test_xblock_handler_render_unit_gated(self, masquerading):
+        """Test that the units of a gated sequence are rendered only to staff masquerading as a specific student"""
+        gating_mock = Mock()
+        gating_mock.return_value.required_prereq.return_value = True
+        gating_mock.return_value.compute_is_prereq_met.return_value = [False, {}]
+        self.sequence_3_1.runtime._services['gating'] = gating_mock  # pylint: disable=protected-access
+        request = RequestFactory().post(
+            '/',
+            data=json.dumps({'position': 2}),
+            content_type='application/json',
+        )
+        with patch(
+            'lms.djangoapps.courseware.masquerade.is_masquerading_as_specific_student',
+            return_value=masquerading,
+        ):
+            render_return = self.sequence_3_1.handle('render_unit', request)
+        assert render_return.status_code == (200 if masquerading else 403)
+
+    def test_xblock_handler_render_unit_anonymous_user(self):
+        """Test that the units rendered on demand for anonymous users have no bookmark button"""
+        self.sequence_3_1.runtime._services['user'] = StubUserService(user=None)  # pylint: disable=protected-access
+        bookmarks_service = self.sequence_3_1.runtime._services['bookmarks']  # pylint: disable=protected-access
+        request = RequestFactory().post(
+            '/',
+            data=json.dumps({'position': 2}),
+            content_type='application/json',
+        )
+        render_return = self.sequence_3_1.handle('render_unit', request)
+        assert render_return.status_code == 200
+        bookmarks_service.return_value.is_bookmarked.assert_not_called()
+
     def test_xblock_handler_get_completion_success(self):
         """Test that the completion data is returned successfully on targeted vertical through ajax call"""
         self.sequence_3_1.runtime._services['completion'] = Mock(  # pylint: disable=protected-access
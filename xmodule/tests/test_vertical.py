@@ -295,6 +295,23 @@ class VerticalBlockTestCase(BaseVerticalBlockTest):
             assert self.test_problem in html
             assert self.test_problem_nested in html
 
+    @patch('xmodule.util.misc.monitoring_utils')
+    def test_render_child_timings(self, mock_monitoring_utils):
+        """ Tests the render times of the children are reported to monitoring """
+        self.course.runtime._services['bookmarks'] = Mock()
+        self.course.runtime._services['user'] = StubUserService(user=Mock())
+
+        self.course.runtime.render(self.vertical, STUDENT_VIEW, self.default_context)
+
+        accumulated = {call.args[0] for call in mock_monitoring_utils.accumulate.call_args_list}
+        assert accumulated == {'xblock_render_ms.html', 'xblock_render_ms.problem', 'xblock_render_ms.vertical'}
+        incremented = [call.args[0] for call in mock_monitoring_utils.increment.call_args_list]
+        assert sorted(incremented) == [
+            'xblock_render_count.html', 'xblock_render_count.html',
+            'xblock_render_count.problem', 'xblock_render_count.problem',
+            'xblock_render_count.vertical',
+        ]
+
     @ddt.data(True, False)
     def test_block_has_access_error(self, has_access_error):
         """ Tests block_has_access_error gives the correct result for child node questions """
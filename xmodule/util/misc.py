@@ -4,7 +4,9 @@ Miscellaneous utility functions.
 
 
 import re
+import time
 
+from edx_django_utils import monitoring as monitoring_utils
 from opaque_keys.edx.locator import (
     CourseLocator,
     LibraryLocator,
@@ -124,3 +126,19 @@ def get_library_or_course_attribute(locator):
         return locator.course
     if isinstance(locator, LibraryLocator):
         return locator.library
+
+
+def render_child_block(block, view, context):
+    """
+    Render the given view of a child block, reporting the time it took to
+    monitoring: the render times of the children of each block type, including
+    their own descendants, are accumulated in the xblock_render_ms.<block type>
+    custom attributes, and their numbers in xblock_render_count.<block type>.
+    """
+    start_time = time.perf_counter()
+    try:
+        return block.render(view, context)
+    finally:
+        block_type = block.scope_ids.block_type
+        monitoring_utils.accumulate(f'xblock_render_ms.{block_type}', (time.perf_counter() - start_time) * 1000)
+        monitoring_utils.increment(f'xblock_render_count.{block_type}')
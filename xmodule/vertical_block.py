@@ -21,7 +21,7 @@ from xmodule.progress import Progress
 from xmodule.seq_block import SequenceFields
 from xmodule.studio_editable import StudioEditableBlock
 from xmodule.util.builtin_assets import add_webpack_js_to_fragment
-from xmodule.util.misc import is_xblock_an_assignment
+from xmodule.util.misc import is_xblock_an_assignment, render_child_block
 from xmodule.x_module import PUBLIC_VIEW, STUDENT_VIEW, XModuleFields
 from xmodule.xml_block import XmlMixin
 
@@ -140,7 +140,7 @@ class VerticalBlock(
                     log.info("Skipping %s from vertical block. Reason: %s", child, exc.message)
                     continue
 
-            rendered_child = child.render(view, child_block_context)
+            rendered_child = render_child_block(child, view, child_block_context)
             fragment.add_fragment_resources(rendered_child)
 
             contents.append({